@@ -3,5 +3,7 @@ from propeller_design_tools.settings import set_airfoil_database, set_propeller_
 from propeller_design_tools.airfoil import Airfoil
 from propeller_design_tools.radialstation import RadialStation
 from propeller_design_tools.propeller import Propeller
-from propeller_design_tools.optimizations import DutyCycleDesignOptimization
+from propeller_design_tools.optimizations import DutyCycleDesignOptimization, VehicleRangeOptimization, \
+    VehicleDurationOptimization, ParetoFront
+from propeller_design_tools.reports import render_design_report, render_design_reports
 from propeller_design_tools.user_interface import InterfaceMainWindow
\ No newline at end of file
@@ -3,15 +3,14 @@ import warnings
 from propeller_design_tools import funcs
 from propeller_design_tools.user_io import Error, Info, Warning
 from propeller_design_tools.settings import get_foil_db
-import matplotlib
-matplotlib.use('TKAgg')
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy.interpolate import griddata, interp1d
 
 
 class Airfoil(object):
-    def __init__(self, name: str, exact_namematch: bool = False, verbose: bool = True):
+    def __init__(self, name: str, exact_namematch: bool = False, verbose: bool = True, xfoil_n_pts: int = None,
+                 xfoil_tol: float = None):
         name_in = name
         if '.' in name_in:
             name, ext = os.path.splitext(name_in)
@@ -42,7 +41,7 @@ class Airfoil(object):
         self.xc_closed_te = xc_closed_te
         self.yc_closed_te = yc_closed_te
 
-        self.xfoil_coord_fpath = self.write_xfoil_coord_file()
+        self.xfoil_coord_fpath = self.write_xfoil_coord_file(n_interp=xfoil_n_pts, tol=xfoil_tol)
         self.polar_data = {}      # dictionary of dictionaries, keys are floats of Re
         self.rectified_polar_data = {}
 
@@ -60,7 +59,7 @@ class Airfoil(object):
         savepath = os.path.join('{}'.format(database_folder), '{}_polar_data.txt'.format(savename))
         return savepath
 
-    def write_xfoil_coord_file(self):
+    def write_xfoil_coord_file(self, n_interp: int = None, tol: float = None, spacing: str = 'cosine'):
         xfoil_folder = os.path.join(get_foil_db(), 'for_xfoil')
         if not os.path.exists(xfoil_folder):
             os.mkdir(xfoil_folder)
@@ -69,7 +68,7 @@ class Airfoil(object):
         savepath = os.path.join(xfoil_folder, '{}.txt'.format(savename))
         with open(savepath, 'w') as f:
             f.write('{}\n\n'.format(self.name))
-            for coord in zip(self.x_coords, self.y_coords):
+            for coord in zip(*self.get_coords(n_interp=n_interp, tol=tol, spacing=spacing)):
                 f.write('{x:.7f} {y:.7f}\n'.format(x=coord[0], y=coord[1]))
         return savepath
 
@@ -576,17 +575,24 @@ class Airfoil(object):
         else:
             raise Error('Could not find polar data file: {}'.format(savepath))
 
-    def get_coords(self, n_interp: int = None):
-        if n_interp is None:
+    def get_coords(self, n_interp: int = None, tol: float = None, spacing: str = 'cosine'):
+        """
+        :param n_interp: resample to this many points (on a parametric spline of the coordinates)
+        :param tol: or, resample to the fewest points that stay within tol (chord fractions) of the spline
+        :param spacing: "cosine" or "curvature", see funcs.resample_airfoil_coords()
+        """
+        if n_interp is None and tol is None:
             return np.vstack([self.x_coords, self.y_coords])
         else:
-            raise Error('Code to interpolate more profile points is incomplete...')
+            return funcs.resample_airfoil_coords(xc=self.x_coords, yc=self.y_coords, n_pts=n_interp, tol=tol,
+                                                 spacing=spacing)
 
-    def get_coords_closed_te(self, n_interp: int = None):
-        if n_interp is None:
+    def get_coords_closed_te(self, n_interp: int = None, tol: float = None, spacing: str = 'cosine'):
+        if n_interp is None and tol is None:
             return np.vstack([self.xc_closed_te, self.yc_closed_te])
         else:
-            raise Error('Code to interpolate more profile points is incomplete...')
+            return funcs.resample_airfoil_coords(xc=self.xc_closed_te, yc=self.yc_closed_te, n_pts=n_interp,
+                                                 tol=tol, spacing=spacing)
 
     def plot_2D_trimesh(self):
         fig = self.plot_geometry()
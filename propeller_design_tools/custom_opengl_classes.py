@@ -114,3 +114,66 @@ class Custom3DArrow(GLGraphicsItem):
     def rotate(self, angle, x, y, z, local=False):
         self.shaft.rotate(angle, x, y, z, local=local)
         self.tip_mesh.rotate(angle, x, y, z, local=local)
+
+
+class Batched3DArrows(object):
+    """
+    Draws any number of 3D arrows with just 2 GL items (one line item for all the shafts, one mesh item for all the
+    cone heads), use set_data() to swap in new arrows without recreating the items.
+    """
+    def __init__(self, view: gl.GLViewWidget, width: int = 3, n_sides: int = 12):
+        self.view = view
+        self.n_sides = n_sides
+        self.shafts = gl.GLLinePlotItem(pos=np.zeros((0, 3)), width=width, antialias=False, mode='lines',
+                                        glOptions='opaque')
+        self.heads = gl.GLMeshItem(meshdata=gl.MeshData(), smooth=False, shader='shaded', glOptions='opaque')
+        self.view.addItem(self.shafts)
+        self.view.addItem(self.heads)
+
+    @property
+    def items(self):
+        return [self.shafts, self.heads]
+
+    def set_data(self, roots: np.ndarray, tips: np.ndarray, colors: np.ndarray):
+        """
+        :param roots: (n, 3) arrow start points
+        :param tips: (n, 3) arrow end points
+        :param colors: (n, 4) rgba colors, or a single rgba color for all arrows
+        """
+        roots, tips = np.asarray(roots, dtype=float).reshape(-1, 3), np.asarray(tips, dtype=float).reshape(-1, 3)
+        n = len(roots)
+        colors = np.broadcast_to(np.asarray(colors, dtype=float), (n, 4))
+        if n == 0:
+            self.shafts.setData(pos=np.zeros((0, 3)))
+            self.heads.setMeshData(meshdata=gl.MeshData())
+            return
+
+        # same proportions as Custom3DArrow, shaft is the first 75%, head the last 25% and 8% of the length wide
+        vec = tips - roots
+        length = np.linalg.norm(vec, axis=1, keepdims=True)
+        unit = np.divide(vec, length, out=np.zeros_like(vec), where=length > 0)
+        head_base = roots + 0.75 * vec
+
+        shaft_pos = np.stack([roots, head_base], axis=1).reshape(-1, 3)
+        self.shafts.setData(pos=shaft_pos, color=np.repeat(colors, 2, axis=0))
+
+        # orthonormal (u, w) around each arrow direction, helper axis picked to not be parallel to it
+        helper = np.where(np.abs(unit[:, [2]]) < 0.9, [[0.0, 0.0, 1.0]], [[1.0, 0.0, 0.0]])
+        u = np.cross(unit, helper)
+        u /= np.linalg.norm(u, axis=1, keepdims=True)
+        w = np.cross(unit, u)
+        ang = np.linspace(0, 2 * np.pi, self.n_sides, endpoint=False)
+        ring = head_base[:, None, :] + 0.08 * length[:, None, :] * \
+            (np.cos(ang)[None, :, None] * u[:, None, :] + np.sin(ang)[None, :, None] * w[:, None, :])
+
+        # per arrow: n_sides ring vertices, then the tip, then the base center
+        verts = np.concatenate([ring, tips[:, None, :], head_base[:, None, :]], axis=1)
+        k = self.n_sides
+        i = np.arange(k)
+        j = (i + 1) % k
+        faces_one = np.vstack([np.column_stack([i, j, np.full(k, k)]),          # cone sides
+                               np.column_stack([j, i, np.full(k, k + 1)])])    # base cap
+        faces = (faces_one[None, :, :] + (k + 2) * np.arange(n)[:, None, None]).reshape(-1, 3)
+
+        self.heads.setMeshData(vertexes=verts.reshape(-1, 3), faces=faces,
+                               vertexColors=np.repeat(colors, k + 2, axis=0))
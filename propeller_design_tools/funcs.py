@@ -1,16 +1,25 @@
+import hashlib
+import json
 import os
 import subprocess
 import shutil
 import sys
+import tempfile
+import threading
+import time
 import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import matplotlib.pyplot as plt
 import numpy as np
+from scipy.interpolate import splprep, splev, griddata
 from propeller_design_tools.airfoil import Airfoil
 from propeller_design_tools.radialstation import RadialStation
 from propeller_design_tools.propeller import Propeller
 from propeller_design_tools.user_io import Info, Error, Warning
-from propeller_design_tools.settings import _get_user_settings, get_prop_db, get_foil_db
+from propeller_design_tools.settings import _get_user_settings, get_prop_db, get_foil_db, FAST_OPER_OUTPUTS, \
+    VORFORM_FIDELITY
 
 
 # =============== CONVENIENCE / UTILITY FUNCTIONS ===============
@@ -321,8 +330,94 @@ def read_airfoil_coordinate_file(fpath: str, verbose: bool = True, te_gap_set: f
     return name, np.array(x_coords), np.array(y_coords)
 
 
+# rolling record of how long successful solver runs took (per unit of work), used for adaptive timeouts
+_SOLVER_RUN_TIMES = {}
+XROTOR_FAIL_MARKERS = ['NOT CONVERGED', 'ITERATION LIMIT', 'CONVERGENCE FAILED']
+XROTOR_SOLUTION_MARKERS = ['FORMULATION SOLUTION']
+XROTOR_PROMPT_MARKERS = ['C>']
+XFOIL_FAIL_MARKERS = ['CONVERGENCE FAILED']
+XFOIL_POINT_MARKERS = ['POINT ADDED TO STORED POLAR']
+
+
+def get_adaptive_timeout(solver_key: str, default_tmout: float, n_units: int = 1, pctl: float = 95,
+                         factor: float = 3.0, min_samples: int = 5, floor_frac: float = 0.25):
+    """
+    Timeout for a solver run based on how long the previous successful runs of the same kind took: "factor" times
+    the "pctl" percentile of the recorded run times (per unit of work, e.g. per XFOIL operating point), never less
+    than "floor_frac" of the fixed "default_tmout" and never more than it.  Until "min_samples" runs have been
+    recorded the fixed default is used.  "solver_key" should include the problem size (e.g. the number of radial
+    stations) so that a few small fast runs don't time out bigger ones.
+    """
+    times = _SOLVER_RUN_TIMES.get(solver_key, [])
+    if len(times) < min_samples:
+        return default_tmout
+    return float(np.clip(factor * np.percentile(times, pctl) * n_units, floor_frac * default_tmout, default_tmout))
+
+
+def run_solver_process(exe_fpath: str, cmnd_fpath: str, cwd: str, tmout: float, solver_key: str, n_units: int = 1,
+                       fail_markers: list = None, max_fails: int = 1, reset_markers: list = None,
+                       final_markers: list = None, hide_windows: bool = True, echo: bool = False):
+    """
+    Runs XROTOR / XFOIL with the command file as stdin, streaming the program output line-by-line so that the process
+    can be killed as soon as "max_fails" lines containing one of the "fail_markers" are printed, instead of waiting
+    for it to run out the clock.  A line containing one of the "reset_markers" (e.g. a converged point) starts the
+    count over, so only consecutive failures stop the run.  With "final_markers" (e.g. the program's prompt) the
+    failures only stop the run once a later line has one of those, so a solver that recovers isn't cut off.  Raises
+    subprocess.TimeoutExpired if "tmout" seconds pass.
+
+    :return: None if the run completed, otherwise the output line on which it was stopped
+    """
+    sui = subprocess.STARTUPINFO()
+    if hide_windows:
+        sui.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    # gfortran buffers output to pipes until exit unless told otherwise
+    env = dict(os.environ, GFORTRAN_UNBUFFERED_PRECONNECTED='y')
+    fail_markers = [] if fail_markers is None else [m.upper() for m in fail_markers]
+    reset_markers = [] if reset_markers is None else [m.upper() for m in reset_markers]
+    final_markers = None if final_markers is None else [m.upper() for m in final_markers]
+
+    n_fails, fail_line, timed_out = 0, None, []
+    start = time.perf_counter()
+    with open(cmnd_fpath, 'r') as f:
+        proc = subprocess.Popen([exe_fpath], startupinfo=sui, stdin=f, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, cwd=cwd, env=env, universal_newlines=True, errors='replace')
+
+        def on_timeout():
+            timed_out.append(True)
+            proc.kill()
+
+        timer = threading.Timer(tmout, on_timeout)
+        timer.start()
+        try:
+            for line in proc.stdout:
+                if echo:
+                    print(line, end='')
+                if any([marker in line.upper() for marker in reset_markers]):
+                    n_fails, fail_line = 0, None
+                elif n_fails >= max_fails and any([marker in line.upper() for marker in final_markers]):
+                    proc.kill()
+                    break
+                elif any([marker in line.upper() for marker in fail_markers]):
+                    n_fails += 1
+                    if n_fails >= max_fails:
+                        fail_line = line.strip()
+                        if final_markers is None:
+                            proc.kill()
+                            break
+            proc.wait()
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+
+    if timed_out:
+        raise subprocess.TimeoutExpired(cmd=[exe_fpath], timeout=tmout)
+    if fail_line is None:
+        _SOLVER_RUN_TIMES.setdefault(solver_key, deque(maxlen=50)).append((time.perf_counter() - start) / n_units)
+    return fail_line
+
+
 def run_xfoil(foil_relpath: str, re: float, alpha: list = None, cl: list = None, iter_limit: int = 30, ncrit: int = 9,
-              mach: float = 0.0, output_fpath: str = None, keypress_iternum: int = 1, tmout: int = 25,
+              mach: float = 0.0, output_fpath: str = None, keypress_iternum: int = 1, tmout: int = None,
               hide_windows: bool = True, verbose: bool = False):
     if not output_fpath:
         output_fpath = 'polar_output.txt'
@@ -357,7 +452,7 @@ def run_xfoil(foil_relpath: str, re: float, alpha: list = None, cl: list = None,
         f.write('n {}\n\n'.format(ncrit))
         f.write('iter\n')
         f.write('{0:.0f}\n'.format(iter_limit))
-        f.write('pacc\n\n\n')
+        f.write('pacc\n{}\n\n'.format(output_fpath))  # points are saved as they converge
         if 'alpha' in swept_param:
             for a in vals:
                 f.write('a{}\n'.format(a))
@@ -365,23 +460,23 @@ def run_xfoil(foil_relpath: str, re: float, alpha: list = None, cl: list = None,
             for cl in vals:
                 f.write('cl{}\n'.format(cl))
         f.write('!\n{}'.format(' ' * 100) * keypress_iternum)
-        f.write('pwrt\n')
-        f.write('{}\n\n\n'.format(output_fpath))
+        f.write('pacc\n\n')
         f.write('quit\n')
 
-    # now open it again and send it as the xfoil commands
-    with open(xfoil_cmnd_file, 'r') as f:
-        sui = subprocess.STARTUPINFO()
-        if hide_windows:
-            sui.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-        if verbose:
-            out, err = None, None
-        else:
-            out, err = subprocess.DEVNULL, subprocess.DEVNULL
-
-        subprocess.run([xfoil_fpath], startupinfo=sui, stdin=f, stdout=out, stderr=err,
-                       timeout=tmout, cwd=xfoil_dir)
+    # remove any leftover output so a run that gets stopped early can't be mistaken for this one
+    if os.path.exists(os.path.join(xfoil_dir, output_fpath)):
+        os.remove(os.path.join(xfoil_dir, output_fpath))
+
+    # now send it as the xfoil commands, stopping early once as many attempts in a row have failed as the last point
+    # gets with its "!" retries, so a hard point always gets all of them (the points that did converge are already in
+    # the output file)
+    n_attempts = len(vals) + keypress_iternum
+    if tmout is None:
+        tmout = get_adaptive_timeout(solver_key='xfoil', default_tmout=25, n_units=n_attempts)
+    run_solver_process(exe_fpath=xfoil_fpath, cmnd_fpath=xfoil_cmnd_file, cwd=xfoil_dir, tmout=tmout,
+                       solver_key='xfoil', n_units=n_attempts, fail_markers=XFOIL_FAIL_MARKERS,
+                       max_fails=keypress_iternum + 1, reset_markers=XFOIL_POINT_MARKERS,
+                       hide_windows=hide_windows, echo=verbose)
 
     # delete the temp command file
     os.remove(xfoil_cmnd_file)
@@ -392,6 +487,10 @@ def read_xfoil_pacc_file(fpath: str = None, delete_after: bool = False):
     if not fpath:
         fpath = os.path.join(_get_user_settings()['airfoil_database'], 'polar_output.txt')
 
+    # no file (or a header with no points) when XFOIL was stopped before any point converged
+    if not os.path.exists(fpath):
+        return None
+
     # open fpath and read in all text
     with open(fpath, 'r') as f:
         txt = f.read()
@@ -582,6 +681,98 @@ def read_profile_xyz(fpath: str):
     return np.vstack([np.array(xpts), np.array(ypts), np.array(zpts)])
 
 
+# binary STL facet record layout (same as numpy-stl's mesh.Mesh.dtype)
+STL_RECORD_DTYPE = np.dtype([('normals', '<f4', (3,)), ('vectors', '<f4', (3, 3)), ('attr', '<u2', (1,))])
+
+
+def build_stl_records(vectors: np.ndarray):
+    """
+    Packs an (n_tri, 3, 3) array of triangle vertices into binary STL facet records, with unit normals from the
+    right hand rule.
+    """
+    vectors = np.asarray(vectors, dtype=float).reshape(-1, 3, 3)
+    normals = np.cross(vectors[:, 1] - vectors[:, 0], vectors[:, 2] - vectors[:, 0])
+    lens = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lens, out=normals, where=lens > 0)
+
+    records = np.zeros(len(vectors), dtype=STL_RECORD_DTYPE)
+    records['normals'] = normals
+    records['vectors'] = vectors
+    return records
+
+
+def write_binary_stl(fpath: str, records: np.ndarray, header: str = ''):
+    header = header.encode('ascii', errors='replace')[:80].ljust(80, b' ')
+    with open(fpath, 'wb') as f:
+        f.write(header)
+        f.write(np.uint32(len(records)).tobytes())
+        records.astype(STL_RECORD_DTYPE, copy=False).tofile(f)
+
+
+# binary PLY face record layout (vertex count + 3 vertex indices)
+PLY_FACE_DTYPE = np.dtype([('n', 'u1'), ('idx', '<i4', (3,))])
+
+
+def write_mesh_file(fpath: str, iter_parts, header: str = '', chunk_size: int = 200000):
+    """
+    Streams an indexed triangle mesh to disk one part (and at most chunk_size rows) at a time, so the whole mesh is
+    never held in memory.  The format is taken from the file extension: ".ply" (binary, shared vertices), ".obj"
+    (text, shared vertices) or ".stl" (binary, triangle soup).
+
+    :param iter_parts: callable returning a fresh iterator of (verts, faces) parts, with verts (n, 3) and faces
+        (m, 3) indexing into that part's own verts (it is called more than once for the formats that need counts first)
+    :return: (n_verts, n_faces) written
+    """
+    fmt = os.path.splitext(fpath)[1].lower().lstrip('.')
+    if fmt not in ('ply', 'obj', 'stl'):
+        raise Error('Unknown mesh file format "{}", must be one of "ply", "obj" or "stl"'.format(fmt))
+
+    n_verts, n_faces = 0, 0
+    for verts, faces in iter_parts():
+        n_verts += len(verts)
+        n_faces += len(faces)
+
+    def chunks(arr):
+        for i in range(0, len(arr), chunk_size):
+            yield arr[i:i + chunk_size]
+
+    with open(fpath, 'wb') as f:
+        if fmt == 'stl':
+            f.write(header.encode('ascii', errors='replace')[:80].ljust(80, b' '))
+            f.write(np.uint32(n_faces).tobytes())
+            for verts, faces in iter_parts():
+                for fc in chunks(faces):
+                    build_stl_records(verts[fc]).tofile(f)
+
+        elif fmt == 'obj':
+            f.write('# {}\n'.format(header).encode())
+            offset = 1  # obj indices are 1-based
+            for verts, faces in iter_parts():
+                for vc in chunks(verts):
+                    np.savetxt(f, vc, fmt='v %.7g %.7g %.7g')
+                for fc in chunks(faces):
+                    np.savetxt(f, fc + offset, fmt='f %d %d %d')
+                offset += len(verts)
+
+        else:   # ply, all vertices first, then all faces
+            f.write('ply\nformat binary_little_endian 1.0\ncomment {}\nelement vertex {}\nproperty float x\n'
+                    'property float y\nproperty float z\nelement face {}\nproperty list uchar int vertex_indices\n'
+                    'end_header\n'.format(header, n_verts, n_faces).encode())
+            for verts, faces in iter_parts():
+                for vc in chunks(verts):
+                    vc.astype('<f4').tofile(f)
+            offset = 0
+            for verts, faces in iter_parts():
+                for fc in chunks(faces):
+                    recs = np.empty(len(fc), dtype=PLY_FACE_DTYPE)
+                    recs['n'] = 3
+                    recs['idx'] = fc + offset
+                    recs.tofile(f)
+                offset += len(verts)
+
+    return n_verts, n_faces
+
+
 # =============== INTERFACING WITH 3RD PARTY PROGRAMS ===============
 def download_foil_coordinates(foil_str: str):
     foil_str = '{}.dat'.format(foil_str) if not foil_str.endswith('.dat') else foil_str
@@ -659,21 +850,32 @@ def create_radial_stations(prop: Propeller, plot_also: bool = True, verbose: boo
 
 def run_xrotor_oper(xrr_file: str, vorform: str, adva: float = None, rpm: float = None, thrust: float = None,
                     torque: float = None, power: float = None, velo: float = None, hide_windows: bool = True,
-                    verbose: bool = True, tmout: int = None, xrotor_verbose: bool = False):
+                    verbose: bool = True, tmout: int = None, xrotor_verbose: bool = False, workdir: str = None):
+    """
+    Runs XROTOR at an off-design operating point and saves the results into the propeller's "oper_data" and
+    "wvel_data" folders.
 
-    # increase the timeout for vrtx
-    if tmout is None and vorform.lower() == 'vrtx':
-        tmout = 25
-    elif tmout is None:
-        tmout = 10
+    :param workdir: folder to run XROTOR in, so that several runs can go at once.  Defaults to the propeller database.
+    :return: the parsed (oper, wvel) output dictionaries
+    """
 
     # vorform has to be one of these three things
     if vorform.lower() not in ['grad', 'pot', 'vrtx']:
         raise Error('Input "vorform" must be one of ["grad", "pot", "vrtx"]')
 
-    # filename stuff
+    # increase the timeout for vrtx, tightened based on previous run times of this same propeller
+    solver_key = 'xrotor_oper_{}_{}'.format(vorform.lower(), os.path.abspath(xrr_file))
+    if tmout is None:
+        tmout = get_adaptive_timeout(solver_key=solver_key, default_tmout=25 if vorform.lower() == 'vrtx' else 10)
+
+    # filename stuff, a separate workdir gets its own copy of the restart file (XROTOR's filename length is limited)
     dirname, fname = os.path.split(xrr_file)
-    relpath = os.path.join(os.path.split(dirname)[1], fname)
+    if workdir is None:
+        workdir = get_prop_db()
+        relpath = os.path.join(os.path.split(dirname)[1], fname)
+    else:
+        shutil.copyfile(xrr_file, os.path.join(workdir, fname))
+        relpath = fname
 
     # first we set the vorform
     cmnds = ['load {}\n'.format(relpath), 'oper', 'form', '{}\n'.format(vorform)]
@@ -702,8 +904,8 @@ def run_xrotor_oper(xrr_file: str, vorform: str, adva: float = None, rpm: float
         pass
 
     # remove the output files if they exist for some reason already
-    oper_out_file, oper_out_fullpath = 'oper_out.txt', os.path.join(get_prop_db(), 'oper_out.txt')
-    wvel_out_file, wvel_out_fullpath = 'wvel_out.txt', os.path.join(get_prop_db(), 'wvel_out.txt')
+    oper_out_file, oper_out_fullpath = 'oper_out.txt', os.path.join(workdir, 'oper_out.txt')
+    wvel_out_file, wvel_out_fullpath = 'wvel_out.txt', os.path.join(workdir, 'wvel_out.txt')
     if os.path.exists(oper_out_fullpath):
         os.remove(oper_out_fullpath)
     if os.path.exists(wvel_out_fullpath):
@@ -711,41 +913,36 @@ def run_xrotor_oper(xrr_file: str, vorform: str, adva: float = None, rpm: float
 
     # finalize the list of commands and write them to a file
     cmnds.extend(['writ {}'.format(oper_out_file), 'wvel {}'.format(wvel_out_file), '\n\nquit\n'])
-    xrotor_cmnd_file = os.path.join(get_prop_db(), 'oper_run_inputs.txt')
+    xrotor_cmnd_file = os.path.join(workdir, 'oper_run_inputs.txt')
     with open(xrotor_cmnd_file, 'w') as f:
         f.write('\n'.join(cmnds))
 
     # run the mutha
     xrotor_fpath = os.path.join(get_prop_db(), 'xrotor.exe')
-    with open(xrotor_cmnd_file, 'r') as f:
-        sui = subprocess.STARTUPINFO()
-        if hide_windows:
-            sui.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        if verbose:
-            Info('Running XROTOR for off-design operating point...', indent_level=1)
-        if xrotor_verbose:
-            out_err_kw = {}
-        else:
-            out_err_kw = {'stdout': subprocess.DEVNULL, 'stderr': subprocess.STDOUT}
-
-        subprocess.run([xrotor_fpath], startupinfo=sui, stdin=f, **out_err_kw,
-                       timeout=tmout, cwd=get_prop_db())
+    if verbose:
+        Info('Running XROTOR for off-design operating point...', indent_level=1)
+    fail_line = run_solver_process(exe_fpath=xrotor_fpath, cmnd_fpath=xrotor_cmnd_file, cwd=workdir,
+                                   tmout=tmout, solver_key=solver_key, fail_markers=XROTOR_FAIL_MARKERS,
+                                   reset_markers=XROTOR_SOLUTION_MARKERS, final_markers=XROTOR_PROMPT_MARKERS,
+                                   hide_windows=hide_windows, echo=xrotor_verbose)
+    if fail_line is not None:
+        os.remove(xrotor_cmnd_file)
+        raise Error('XROTOR operating point did not converge ("{}")'.format(fail_line))
 
     # get the returned velo and rpm for naming reasons
     oper_output = read_xrotor_op_file(oper_out_fullpath)
+    wvel_output = read_xrotor_wvel_file(wvel_out_fullpath)
     returned_velo = oper_output['speed(m/s)']
     returned_rpm = oper_output['rpm']
 
     # rename / move the output files into the database
-    oper_savedir = os.path.join(os.path.split(oper_out_fullpath)[0], dirname, 'oper_data')
-    if not os.path.exists(oper_savedir):
-        os.mkdir(oper_savedir)
+    oper_savedir = os.path.join(dirname, 'oper_data')
+    os.makedirs(oper_savedir, exist_ok=True)
     oper_copypath = os.path.join(oper_savedir, 'velo_{:.0f}_rpm_{:.0f}.oper'.format(100 * returned_velo, returned_rpm))
     shutil.copyfile(oper_out_fullpath, oper_copypath)
 
-    wvel_savedir = os.path.join(os.path.split(wvel_out_fullpath)[0], dirname, 'wvel_data')
-    if not os.path.exists(wvel_savedir):
-        os.mkdir(wvel_savedir)
+    wvel_savedir = os.path.join(dirname, 'wvel_data')
+    os.makedirs(wvel_savedir, exist_ok=True)
     wvel_copypath = os.path.join(wvel_savedir, 'velo_{:.0f}_rpm_{:.0f}.wvel'.format(100 * returned_velo, returned_rpm))
     shutil.copyfile(wvel_out_fullpath, wvel_copypath)
 
@@ -754,7 +951,41 @@ def run_xrotor_oper(xrr_file: str, vorform: str, adva: float = None, rpm: float
     os.remove(oper_out_fullpath)
     os.remove(wvel_out_fullpath)
 
-    return
+    return oper_output, wvel_output
+
+
+def xrotor_op_vorform(op_dict: dict):
+    """
+    :return: the vortex formulation ("pot", "grad" or "vrtx") an XROTOR output dict was solved with, from the header
+        of the output file, or None if it isn't there
+    """
+    for key in op_dict:
+        if isinstance(key, str) and key.endswith('Formulation Solution'):
+            if 'Vortex' in key:
+                return 'vrtx'
+            if 'Graded' in key:
+                return 'grad'
+            if 'Potential' in key:
+                return 'pot'
+    return None
+
+
+def validate_fidelity_cascade(cascade: list):
+    """
+    Checks a multi-fidelity evaluation policy, a list of (vorform, top_k) stages in increasing fidelity where each
+    stage re-evaluates the top_k best results of the stage before it (top_k = None for the first stage = everything).
+
+    :return: the cascade as a list of (lower case vorform, top_k) tuples
+    """
+    cascade = [(vorform.lower(), top_k) for vorform, top_k in cascade]
+    ranks = [VORFORM_FIDELITY.index(vorform) if vorform in VORFORM_FIDELITY else None for vorform, _ in cascade]
+    if len(cascade) == 0 or None in ranks:
+        raise Error('Fidelity cascade stages must be (vorform, top_k) with vorform one of {}'.format(VORFORM_FIDELITY))
+    if any([r2 <= r1 for r1, r2 in zip(ranks[:-1], ranks[1:])]):
+        raise Error('Fidelity cascade stages must go up in fidelity ({})'.format(' -> '.join(VORFORM_FIDELITY)))
+    if any([top_k is None or top_k < 1 for _, top_k in cascade[1:]]):
+        raise Error('Every fidelity cascade stage after the first needs a "top_k" of at least 1')
+    return cascade
 
 
 def read_xrotor_wvel_file(fpath:str):
@@ -796,17 +1027,164 @@ def read_xrotor_wvel_file(fpath:str):
     return data
 
 
+# file hashes keyed by (path, size, mtime), so unchanged files aren't re-read
+_FILE_HASHES = {}
+
+
+def hash_file(fpath: str):
+    """
+    sha1 of a file's contents (None if there's no such file), cached on the file's size and modification time so that
+    large files like xrotor.exe only get read once.
+    """
+    if not os.path.isfile(fpath):
+        return None
+    stat = os.stat(fpath)
+    key = (os.path.abspath(fpath), stat.st_size, stat.st_mtime_ns)
+    if key not in _FILE_HASHES:
+        sha = hashlib.sha1()
+        with open(fpath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha.update(chunk)
+        _FILE_HASHES[key] = sha.hexdigest()
+    return _FILE_HASHES[key]
+
+
+def design_fingerprint(nblades: int, radius: float, hub_radius: float, hub_wake_disp_br: float,
+                       design_speed_mps: float, design_cl: dict, design_atmo_props: dict, design_vorform: str,
+                       station_params: dict, design_adv: float = None, design_rpm: float = None,
+                       design_thrust: float = None, design_power: float = None, n_radial: int = 50,
+                       geo_params: dict = None):
+    """
+    Hash of everything that determines the outcome of create_propeller(): the design inputs, the airfoil polar data
+    each station is fit to, and the XROTOR executable itself.  Numbers are compared as floats (25 == 25.0).
+    """
+    def canon(val):
+        if isinstance(val, dict):
+            return {str(canon(k)): canon(v) for k, v in val.items()}
+        if isinstance(val, (int, float, np.number)) and not isinstance(val, bool):
+            return float(val)
+        return val
+
+    polar_db = os.path.join(get_foil_db(), 'polar_database')
+    geo_params = {'n_prof_pts': None, 'n_profs': 50, 'tot_skew': 0.0, **({} if geo_params is None else geo_params)}
+    inputs = {'nblades': nblades, 'radius': radius, 'hub_radius': hub_radius, 'hub_wake_disp_br': hub_wake_disp_br,
+              'design_speed_mps': design_speed_mps, 'design_cl': design_cl, 'design_atmo_props': design_atmo_props,
+              'design_vorform': design_vorform, 'station_params': station_params, 'design_adv': design_adv,
+              'design_rpm': design_rpm, 'design_thrust': design_thrust, 'design_power': design_power,
+              'n_radial': n_radial, 'geo_params': geo_params,
+              'station_polars': {xi: hash_file(os.path.join(polar_db, '{}_polar_data.txt'.format(foil)))
+                                 for xi, foil in ({} if station_params is None else station_params).items()},
+              'xrotor': hash_file(os.path.join(get_prop_db(), 'xrotor.exe'))}
+    if 'file' in design_cl:
+        # relative to the propeller database, same as create_propeller()
+        inputs['design_cl_file'] = hash_file(os.path.join(get_prop_db(), design_cl['file']))
+    return hashlib.sha1(json.dumps(canon(inputs), sort_keys=True).encode()).hexdigest()
+
+
+# design fingerprints read from meta-files keyed by (path, size, mtime), so that unchanged meta-files aren't re-read
+# ('' for a meta-file without one)
+_META_FINGERPRINTS = {}
+_META_FINGERPRINTS_LOCK = threading.Lock()
+
+
+def _read_meta_fingerprint(meta_fpath: str):
+    with open(meta_fpath, 'r') as f:
+        for line in f:
+            if line.startswith('blade_data_'):  # the fingerprint comes before all the blade data
+                break
+            if line.startswith('design_fingerprint:'):
+                return line.split(':', 1)[1].strip()
+    return ''
+
+
+def _folder_fingerprints(folder: str):
+    # {name: fingerprint} of the propellers in folder that have a meta-file
+    fingerprints = {}
+    for name in os.listdir(folder):
+        meta_fpath = os.path.join(folder, name, '{}.meta'.format(name))
+        try:
+            stat = os.stat(meta_fpath)
+        except OSError:
+            continue
+        key = (meta_fpath, stat.st_size, stat.st_mtime_ns)
+        with _META_FINGERPRINTS_LOCK:
+            fp = _META_FINGERPRINTS.get(key)
+        if fp is None:
+            fp = _read_meta_fingerprint(meta_fpath)
+            with _META_FINGERPRINTS_LOCK:
+                _META_FINGERPRINTS[key] = fp
+        fingerprints[name] = fp
+    return fingerprints
+
+
+def find_design_by_fingerprint(fingerprint: str, folders: list = None):
+    """
+    Looks through the meta-files of the propellers in "folders" (defaults to the propeller database and any
+    "optimization" folders inside of it) for one with the given design_fingerprint.  Each meta-file is only re-read
+    when it changes.
+
+    :return: the matching propeller's save folder, or None
+    """
+    if folders is None:
+        folders = [get_prop_db()] + [os.path.join(get_prop_db(), d, 'optimization') for d in get_all_propeller_dirs()]
+
+    for folder in [os.path.abspath(f) for f in folders if os.path.isdir(f)]:
+        for name, fp in _folder_fingerprints(folder).items():
+            if fp == fingerprint:
+                return os.path.join(folder, name)
+    return None
+
+
+def clone_propeller(src_folder: str, name: str, dest_dir: str = None):
+    """
+    Copies an existing propeller's design (XROTOR restart / operating point files, station polars, blade profiles and
+    meta-file) into a new save folder under a new name.  Everything is copied, not linked, so that rewriting either
+    design's files never changes the other's.
+
+    :return: the new Propeller
+    """
+    dest_dir = get_prop_db() if dest_dir is None else dest_dir
+    src_name = os.path.split(src_folder)[1]
+    dest_folder = os.path.join(dest_dir, name)
+    if os.path.normcase(os.path.abspath(src_folder)) == os.path.normcase(os.path.abspath(dest_folder)):
+        return Propeller(src_folder, verbose=False)
+
+    if os.path.exists(dest_folder):
+        shutil.rmtree(dest_folder)
+    os.mkdir(dest_folder)
+    for ext in ['.xrr', '.xrop']:
+        shutil.copy2(os.path.join(src_folder, src_name + ext), os.path.join(dest_folder, name + ext))
+    for subfolder in ['blade_profiles', 'station_polars']:
+        shutil.copytree(os.path.join(src_folder, subfolder), os.path.join(dest_folder, subfolder))
+
+    # the meta-file holds the name, so it gets rewritten
+    with open(os.path.join(src_folder, '{}.meta'.format(src_name)), 'r') as f:
+        lines = f.read().split('\n')
+    with open(os.path.join(dest_folder, '{}.meta'.format(name)), 'w') as f:
+        f.write('\n'.join(['name: {}'.format(name) if ln.startswith('name: ') else ln for ln in lines]))
+
+    return Propeller(dest_folder, verbose=False)
+
+
 def create_propeller(name: str, nblades: int, radius: float, hub_radius: float, hub_wake_disp_br: float,
                      design_speed_mps: float, design_cl: dict, design_atmo_props: dict, design_vorform: str,
                      station_params: dict = None, design_adv: float = None, design_rpm: float = None,
                      design_thrust: float = None, design_power: float = None, n_radial: int = 50,
                      verbose: bool = False, show_station_fit_plots: bool = True, plot_after: bool = True,
-                     tmout: int = None, hide_windows: bool = True, geo_params: dict = {}, xrotor_verbose: bool = False):
-    # adjust timeout for vrtx
-    if tmout is None and design_vorform == 'vrtx':
-        tmout = 100
-    elif tmout is None:
-        tmout = 30
+                     tmout: int = None, hide_windows: bool = True, geo_params: dict = None,
+                     xrotor_verbose: bool = False, workdir: str = None, reuse_existing: bool = True):
+    """
+    Designs a new propeller with XROTOR and saves it (and its blade profiles, station polars, etc) into the database.
+
+    :param workdir: folder to run XROTOR in and create the propeller's save folder in, so that several designs can be
+        created at once (see create_propellers()).  Defaults to the propeller database.
+    :param reuse_existing: if a design with the same design_fingerprint() already exists in the database, copy it
+        under the new name instead of re-running XROTOR
+    """
+    # adjust timeout for vrtx, tightened based on previous run times of designs with as many radial stations
+    solver_key = 'xrotor_design_{}_{}'.format(design_vorform, n_radial)
+    if tmout is None:
+        tmout = get_adaptive_timeout(solver_key=solver_key, default_tmout=100 if design_vorform == 'vrtx' else 30)
 
     # name must be less than 38? characters for XROTOR to be able to save it
     if len(name) > 38:
@@ -816,8 +1194,33 @@ def create_propeller(name: str, nblades: int, radius: float, hub_radius: float,
     if 'altitude_km' not in design_atmo_props:
         raise Error('You must include "altitude_km" as an input to create_propeller()')
 
+    # a CL(r/R) file is relative to the propeller database, where XROTOR used to always run
+    if 'file' in design_cl:
+        design_cl = {**design_cl, 'file': os.path.abspath(os.path.join(get_prop_db(), design_cl['file']))}
+
+    # fill in the default geometry params on a copy, the caller's dict may be shared between create_propellers() runs
+    geo_params = {'n_prof_pts': None, 'n_profs': 50, 'tot_skew': 0.0, **({} if geo_params is None else geo_params)}
+
+    # reuse an identical existing design if there is one
+    run_dir = get_prop_db() if workdir is None else workdir
+    fingerprint = design_fingerprint(nblades=nblades, radius=radius, hub_radius=hub_radius,
+                                     hub_wake_disp_br=hub_wake_disp_br, design_speed_mps=design_speed_mps,
+                                     design_cl=design_cl, design_atmo_props=design_atmo_props,
+                                     design_vorform=design_vorform, station_params=station_params,
+                                     design_adv=design_adv, design_rpm=design_rpm, design_thrust=design_thrust,
+                                     design_power=design_power, n_radial=n_radial, geo_params=geo_params)
+    if reuse_existing:
+        existing_folder = find_design_by_fingerprint(fingerprint=fingerprint)
+        if existing_folder is not None:
+            if verbose:
+                Info('"{}" is identical to existing design "{}", reusing it'.format(name, existing_folder))
+            prop = clone_propeller(src_folder=existing_folder, name=name, dest_dir=run_dir)
+            if plot_after:
+                prop.plot_design_point_panel()
+            return prop
+
     # delete if exists already, make save folder, point-cloud folder
-    save_folder = os.path.join(get_prop_db(), name)
+    save_folder = os.path.join(run_dir, name)
     if os.path.exists(save_folder):
         shutil.rmtree(save_folder)
     os.mkdir(save_folder)
@@ -827,7 +1230,7 @@ def create_propeller(name: str, nblades: int, radius: float, hub_radius: float,
     os.mkdir(prof_folder)
 
     # create the Propeller object, create the stations
-    prop = Propeller(name=name, nblades=nblades, radius=radius, hub_radius=hub_radius,
+    prop = Propeller(name=name if workdir is None else save_folder, nblades=nblades, radius=radius, hub_radius=hub_radius,
                      hub_wake_disp_br=hub_wake_disp_br, design_speed_mps=design_speed_mps, design_cl=design_cl,
                      design_atmo_props=design_atmo_props, design_vorform=design_vorform, design_adv=design_adv,
                      station_params=station_params, geo_params=geo_params, design_rpm=design_rpm,
@@ -836,7 +1239,7 @@ def create_propeller(name: str, nblades: int, radius: float, hub_radius: float,
 
     # prep XROTOR commands depending on what station_params were input
     aero_params_fname = '{}_temp_section_params.txt'.format(name)
-    aero_params_fpath = os.path.join(get_prop_db(), aero_params_fname)
+    aero_params_fpath = os.path.join(run_dir, aero_params_fname)
     with open(aero_params_fpath, 'w') as f:
         f.write(st_txt)
 
@@ -919,7 +1322,7 @@ def create_propeller(name: str, nblades: int, radius: float, hub_radius: float,
     save_txt = 'save {}\nquit\n'.format(savename)
 
     # write XROTOR commands to a file and run in a subprocess
-    xrotor_cmnd_file = os.path.join(get_prop_db(), 'xrotor_inputs_temp.txt')
+    xrotor_cmnd_file = os.path.join(run_dir, 'xrotor_inputs_temp.txt')
     cmnds = ['aero', 'read', '{}\n'.format(aero_params_fname),
              'desi', 'atmo', '{}'.format(atmo_txt), 'form', '{}'.format(vorform_txt), 'N', '{}'.format(n_radial),
              'inpu', '{}'.format(nblades),
@@ -931,23 +1334,23 @@ def create_propeller(name: str, nblades: int, radius: float, hub_radius: float,
         f.write('\n'.join(cmnds))
 
     xrotor_fpath = os.path.join(get_prop_db(), 'xrotor.exe')
-    with open(xrotor_cmnd_file, 'r') as f:
-        sui = subprocess.STARTUPINFO()
-        if hide_windows:
-            sui.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        if verbose:
-            Info('Running XROTOR to create new geometry...')
-        if xrotor_verbose:
-            subprocess.run([xrotor_fpath], startupinfo=sui, stdin=f, timeout=tmout, cwd=get_prop_db())
-        else:
-            subprocess.run([xrotor_fpath], startupinfo=sui, stdin=f, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT,
-                           timeout=tmout, cwd=get_prop_db())
+    if verbose:
+        Info('Running XROTOR to create new geometry...')
+    fail_line = run_solver_process(exe_fpath=xrotor_fpath, cmnd_fpath=xrotor_cmnd_file, cwd=run_dir,
+                                   tmout=tmout, solver_key=solver_key, fail_markers=XROTOR_FAIL_MARKERS,
+                                   reset_markers=XROTOR_SOLUTION_MARKERS, final_markers=XROTOR_PROMPT_MARKERS,
+                                   hide_windows=hide_windows, echo=xrotor_verbose)
+    if fail_line is not None:
+        os.remove(xrotor_cmnd_file)
+        os.remove(aero_params_fpath)
+        shutil.rmtree(save_folder)
+        raise Error('XROTOR "{}" design did not converge ("{}")'.format(name, fail_line))
     os.remove(xrotor_cmnd_file)
     os.remove(aero_params_fpath)
 
     # set the prop's blade-data that we just saved in creation
     for key in blade_data.copy():
-        fp = os.path.join(get_prop_db(), '{}_out.txt'.format(key.replace('/', '_over_')))
+        fp = os.path.join(run_dir, '{}_out.txt'.format(key.replace('/', '_over_')))
         roR, array = read_2col_file(fpath=fp)
         if 'r/R' not in blade_data:
             blade_data['r/R'] = roR
@@ -955,22 +1358,16 @@ def create_propeller(name: str, nblades: int, radius: float, hub_radius: float,
     prop.set_blade_data(blade_dict=blade_data)
 
     # interpolate the profiles as part of geometry creation
-    if 'n_prof_pts' not in geo_params:
-        geo_params['n_prof_pts'] = None
-    if 'n_profs' not in geo_params:
-        geo_params['n_profs'] = 50
-    if 'tot_skew' not in geo_params:
-        geo_params['tot_skew'] = 0.0
-
     prop.interp_foil_profiles(**geo_params)  # also saves the profiles
 
     # save the PDT propeller meta-file, and then read in the operating point dictionary by calling load_from_savefile()
     prop.xrotor_op_dict = read_xrotor_op_file(prop.xrop_file)
+    prop.design_fingerprint = fingerprint
     prop.save_station_polars()
     prop.save_meta_file()
-    prop.load_from_savefile(verbose=verbose)   # reads meta, xrr, xrop, and point clouds
+    prop.load_from_savefile(verbose=verbose)   # reads meta, everything else is re-read from file when needed
 
-    if not verbose:
+    if verbose:
         Info('"{}" Geometry Created!'.format(prop.name))
     if plot_after:
         prop.plot_design_point_panel()
@@ -978,6 +1375,77 @@ def create_propeller(name: str, nblades: int, radius: float, hub_radius: float,
     return prop
 
 
+def iter_create_propellers(specs, workers: int = 4, save_dir: str = None):
+    """
+    Generator that creates propellers several at a time, yielding (name, prop, err_str) as each design finishes
+    (err_str is None on success, prop is None on failure).  Each design runs in its own scratch folder and the
+    finished save folder is then moved into "save_dir" in one rename, so a failed or interrupted design never leaves
+    a partial propeller behind.  "specs" may be any iterable (e.g. a generator), it is only consumed as workers free up.
+
+    :param specs: create_propeller() kwarg dictionaries, each must include a unique "name"
+    :param save_dir: folder the finished propellers are moved into, defaults to the propeller database
+    """
+    save_dir = get_prop_db() if save_dir is None else save_dir
+
+    def create_one(spec):
+        workdir = tempfile.mkdtemp(dir=get_prop_db())
+        try:
+            kwargs = {**{'verbose': False, 'show_station_fit_plots': False, 'plot_after': False}, **spec}
+            prop = create_propeller(workdir=workdir, **kwargs)
+            dest = os.path.join(save_dir, prop.name)
+            if os.path.exists(dest):
+                shutil.rmtree(dest)
+            os.replace(prop.save_folder, dest)
+            return Propeller(dest, verbose=False)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    specs = iter(specs)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = {}
+    try:
+        while True:
+            while len(pending) < 2 * workers:
+                spec = next(specs, None)
+                if spec is None:
+                    break
+                pending[executor.submit(create_one, spec)] = spec['name']
+            if len(pending) == 0:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = pending.pop(fut)
+                try:
+                    yield name, fut.result(), None
+                except Exception as e:  # report the failure and keep going with the rest of the batch
+                    yield name, None, str(e) if isinstance(e, Error) else '{}: {}'.format(type(e).__name__, e)
+    finally:
+        for fut in pending:
+            fut.cancel()
+        executor.shutdown(wait=True)
+
+
+def create_propellers(specs: list, workers: int = 4, save_dir: str = None, verbose: bool = True):
+    """
+    Creates a batch of propellers in parallel, see iter_create_propellers().
+
+    :return: (props, failures) dictionaries keyed by propeller name, failures holds the error of each failed design
+    """
+    props, failures = {}, {}
+    for cnt, (name, prop, err_str) in enumerate(iter_create_propellers(specs=specs, workers=workers,
+                                                                       save_dir=save_dir), start=1):
+        if err_str is None:
+            props[name] = prop
+            if verbose:
+                Info('Created propeller # {} / {} ("{}")'.format(cnt, len(specs), name))
+        else:
+            failures[name] = err_str
+            if verbose:
+                Warning('Failed to create propeller # {} / {} ("{}")\n{}'.format(cnt, len(specs), name, err_str))
+    return props, failures
+
+
 def write_blade_cl_file(r_pts: list, cl_pts: list, savepath: str = None):
     if savepath is None:
         savepath = 'blade_design_cl.txt'
@@ -1082,6 +1550,464 @@ def xrotor_drag_model(CL: np.ndarray, CDmin: float, CLCDmin: float, dCDdCL2: flo
     return CD
 
 
+def xrotor_section_cl_cd(alpha: np.ndarray, re: np.ndarray, mach: np.ndarray, sect: dict):
+    """
+    Vectorized version of the XROTOR section aerodynamic model (same parameters as the restart-file "Xisection"
+    blocks, alpha in radians, dCLdA and dCLdAstall per radian).  All inputs broadcast against each other.
+
+    :return cl, cd: np.arrays of the section lift and drag coefficients
+    """
+    msq = np.minimum(mach ** 2, 0.9)
+    pg = 1 / np.sqrt(1 - msq)
+
+    # lift, with the smooth XROTOR stall limiter on both ends of the linear range
+    cla = sect['dCLdA'] * pg * (alpha - np.deg2rad(sect['A0deg']))
+    ecmax = np.exp(np.minimum(200.0, (cla - sect['CLmax']) / sect['dCLstall']))
+    ecmin = np.exp(np.minimum(200.0, (sect['CLmin'] - cla) / sect['dCLstall']))
+    cllim = sect['dCLstall'] * np.log((1 + ecmax) / (1 + ecmin))
+    fstall = sect['dCLdAstall'] / sect['dCLdA']
+    cl = cla - (1 - fstall) * cllim
+
+    # profile drag with Re scaling, post-stall drag, and compressibility drag rise
+    rcorr = np.where(re > 0, (np.maximum(re, 1.0) / sect['REref']) ** sect['REexp'], 1.0)
+    cd = (sect['CDmin'] + sect['dCDdCL^2'] * (cl - sect['CLCDmin']) ** 2) * rcorr
+    dcdx = (1 - fstall) * cllim / (pg * sect['dCLdA'])
+    cd = cd + 2 * dcdx ** 2
+    crit_mach = sect['Mcrit'] - 0.25 * np.abs(cl) - (0.002 / 10.0) ** (1 / 3)
+    cd = cd + np.where(mach > crit_mach, 10.0 * np.maximum(mach - crit_mach, 0.0) ** 3, 0.0)
+
+    return cl, cd
+
+
+def solve_bemt_oper(velo: np.ndarray, rpm: np.ndarray, r_R: np.ndarray, c_R: np.ndarray, beta: np.ndarray,
+                    dr_R: np.ndarray, radius: np.ndarray, nblades: np.ndarray, sect: dict, rho: np.ndarray,
+                    vsound: np.ndarray, mu: np.ndarray, n_scan: int = 16, tol: float = 1e-9, max_iter: int = 60):
+    """
+    Broadcasted blade-element / momentum solution of propeller operating points, used as a fast stand-in for
+    XROTOR oper runs.  The radial stations lie along the last axis of r_R, c_R, beta (radians) and dr_R (the
+    nondimensional width of each station), everything else broadcasts against them, and the inflow angle at
+    each station is found by a coarse scan (n_scan angles) followed by a bracketed bisection so that all stations of
+    all points converge together.  Deeply stalled stations (e.g. the root of a high pitch blade at low speed, with a
+    post-stall lift slope fit that drops the lift off steeply) can have no root at all, those take the inflow angle
+    that minimizes the residual instead, and their points are flagged as not converged.
+
+    :return: dict of np.arrays (radial axis integrated out) keyed by the XROTOR oper output names, with NaNs
+        wherever the totals aren't finite, plus the boolean "converged" (False where any station has no real solution
+        or the totals aren't finite)
+    """
+    omega = rpm / 60 * 2 * np.pi
+    r = r_R * radius
+    c = c_R * radius
+    ut = omega * r
+    sigma = nblades * c / (2 * np.pi * r)
+
+    def blade_element(phi):
+        sphi, cphi = np.sin(phi), np.cos(phi)
+        f = nblades / 2 * (1 - r_R) / (r_R * np.maximum(sphi, 1e-9))
+        tip_loss = 2 / np.pi * np.arccos(np.clip(np.exp(-f), 0.0, 1.0))
+        tip_loss = np.maximum(tip_loss, 1e-4)
+        kp_denom = 4 * tip_loss * sphi * cphi
+        # relative velocity comes from the tangential triangle, so the residual stays finite as velo -> 0
+        cl, cd = None, None
+        w = ut / np.maximum(cphi, 1e-9)
+        for _ in range(2):
+            re = rho * w * c / mu
+            cl, cd = xrotor_section_cl_cd(alpha=beta - phi, re=re, mach=w / vsound, sect=sect)
+            cn = cl * cphi - cd * sphi
+            ct = cl * sphi + cd * cphi
+            kp = sigma * ct / np.where(kp_denom == 0, 1e-12, kp_denom)
+            w = ut / (1 + kp) / np.maximum(cphi, 1e-9)
+        k = sigma * cn / (4 * tip_loss * sphi ** 2)
+        resid = sphi * ut * (1 - k) - cphi * velo * (1 + kp)
+        return resid, w, cn, ct
+
+    # coarse scan for a sign change, the one at the largest inflow angle is the attached-flow solution (the
+    # post-stall lift model can produce additional roots at low inflow angles)
+    shape = np.broadcast(velo, omega, r_R, beta, sect['dCLdA']).shape
+    scan = np.linspace(1e-6, np.pi / 2, n_scan)
+    lo, hi = np.full(shape, scan[0]), np.full(shape, scan[1])
+    res_lo = np.zeros(shape)
+    bracketed = np.zeros(shape, dtype=bool)
+    res_prev = blade_element(np.full(shape, scan[0]))[0]
+    # scan index of the smallest |residual|, for the stations that never change sign
+    best_idx, best_res = np.zeros(shape, dtype=int), np.nan_to_num(np.abs(res_prev), nan=np.inf)
+    for i, (phi_prev, phi_next) in enumerate(zip(scan[:-1], scan[1:]), start=1):
+        res_next = blade_element(np.full(shape, phi_next))[0]
+        change = np.sign(res_prev) != np.sign(res_next)
+        lo = np.where(change, phi_prev, lo)
+        hi = np.where(change, phi_next, hi)
+        res_lo = np.where(change, res_prev, res_lo)
+        bracketed |= change
+        abs_next = np.nan_to_num(np.abs(res_next), nan=np.inf)
+        best_idx = np.where(abs_next < best_res, i, best_idx)
+        best_res = np.minimum(abs_next, best_res)
+        res_prev = res_next
+
+    for _ in range(max_iter):
+        mid = 0.5 * (lo + hi)
+        res_mid = blade_element(mid)[0]
+        same = np.sign(res_mid) == np.sign(res_lo)
+        lo = np.where(same, mid, lo)
+        res_lo = np.where(same, res_mid, res_lo)
+        hi = np.where(same, hi, mid)
+        if np.max(hi - lo) < tol:
+            break
+
+    phi = 0.5 * (lo + hi)
+
+    # stalled / post-stall stations without a root: golden section search of |residual| around the best scan angle
+    if not np.all(bracketed | (dr_R == 0)):
+        a, b = scan[np.maximum(best_idx - 1, 0)], scan[np.minimum(best_idx + 1, n_scan - 1)]
+        g = (np.sqrt(5) - 1) / 2
+        for _ in range(max_iter):
+            c1, c2 = b - g * (b - a), a + g * (b - a)
+            lower = np.nan_to_num(np.abs(blade_element(c1)[0]), nan=np.inf) < \
+                np.nan_to_num(np.abs(blade_element(c2)[0]), nan=np.inf)
+            a, b = np.where(lower, a, c1), np.where(lower, c2, b)
+            if np.max(b - a) < tol:
+                break
+        phi = np.where(bracketed, phi, 0.5 * (a + b))
+
+    resid, w, cn, ct = blade_element(phi)
+    # a station converged if it has a root, or its residual got to ~0 anyway (a root the scan stepped over)
+    station_ok = bracketed | (dr_R == 0) | (np.abs(resid) <= 1e-6 * (np.abs(ut) + np.abs(velo)))
+    converged = np.all(station_ok, axis=-1)
+    dr = dr_R * radius
+    thrust = np.sum(0.5 * rho * w ** 2 * nblades * c * cn * dr, axis=-1)
+    torque = np.sum(0.5 * rho * w ** 2 * nblades * c * ct * r * dr, axis=-1)
+    valid = np.isfinite(thrust) & np.isfinite(torque)
+    thrust = np.where(valid, thrust, np.nan)
+    torque = np.where(valid, torque, np.nan)
+
+    # integrated quantities + XROTOR-style coefficient definitions (non-radial inputs carry a trailing 1-axis)
+    velo, omega, radius, rho = [np.broadcast_to(np.asarray(a, dtype=float)[..., 0], thrust.shape)
+                                for a in [velo, omega, radius, rho]]
+    n = omega / 2 / np.pi
+    diam = 2 * radius
+    power = torque * omega
+    with np.errstate(divide='ignore', invalid='ignore'):
+        adv = velo / (omega * radius)
+        out = {'speed(m/s)': velo.copy(), 'rpm': n * 60, 'adv. ratio': adv, 'J': np.pi * adv,
+               'thrust(N)': thrust, 'power(W)': power, 'torque(N-m)': torque,
+               'Efficiency': np.where(power > 0, thrust * velo / power, np.nan),
+               'Ct': thrust / (rho * n ** 2 * diam ** 4), 'Cp': power / (rho * n ** 3 * diam ** 5),
+               'Tc': thrust / (0.5 * rho * velo ** 2 * np.pi * radius ** 2),
+               'Pc': power / (0.5 * rho * velo ** 3 * np.pi * radius ** 2)}
+    out['converged'] = converged & valid
+    return out
+
+
+def stack_bemt_inputs(props: list, n_stations: int = None):
+    """
+    Gathers the blade geometry (from each Propeller's blade_data) and XROTOR section models (from each Propeller's
+    restart-file "Xisection" blocks) into padded arrays of shape (n_props, 1, n_stations) for solve_bemt_oper().
+    Propellers with fewer radial stations are padded with zero-width stations.
+
+    :param n_stations: if given, the blade geometry is interpolated onto this many stations (clustered towards the tip)
+        instead of the XROTOR ones, fewer stations solve proportionally faster
+    """
+    n_st = max([len(prop.blade_data['r/R']) for prop in props]) if n_stations is None else n_stations
+    sect_keys = ['A0deg', 'dCLdA', 'CLmax', 'CLmin', 'dCLdAstall', 'dCLstall', 'Mcrit', 'CDmin', 'CLCDmin',
+                 'dCDdCL^2', 'REref', 'REexp']
+    geo = {k: np.zeros((len(props), 1, n_st)) for k in ['r/R', 'CH', 'BE', 'dr/R']}
+    sect = {k: np.zeros((len(props), 1, n_st)) for k in sect_keys}
+    scalars = {k: np.zeros((len(props), 1, 1)) for k in ['radius', 'nblades', 'rho', 'vsound', 'mu']}
+
+    for p, prop in enumerate(props):
+        xrd = prop.xrotor_d
+        roR = np.asarray(prop.blade_data['r/R'], dtype=float)
+        ch, be = np.asarray(prop.blade_data['CH'], dtype=float), np.asarray(prop.blade_data['BE'], dtype=float)
+        if n_stations is None:
+            edges = np.concatenate([[xrd['XI0']], (roR[1:] + roR[:-1]) / 2, [1.0]])
+        else:
+            edges = xrd['XI0'] + (1 - xrd['XI0']) * np.sin(np.linspace(0, np.pi / 2, n_stations + 1))
+            roR_new = (edges[1:] + edges[:-1]) / 2
+            ch, be = np.interp(roR_new, roR, ch), np.interp(roR_new, roR, be)
+            roR = roR_new
+        npts = len(roR)
+        for key, vals in zip(['r/R', 'CH', 'BE', 'dr/R'], [roR, ch, be, np.diff(edges)]):
+            geo[key][p, 0, :npts] = vals
+            geo[key][p, 0, npts:] = vals[-1] if key != 'dr/R' else 0.0
+
+        # interpolate the section models between their Xi locations (constant outside of them)
+        xi_sects = [xrd['Xisection_{}'.format(i)] for i in range(int(xrd['Naero']))]
+        xis = [s['Xisection'] for s in xi_sects]
+        for key in sect_keys:
+            sect[key][p, 0, :] = np.interp(geo['r/R'][p, 0, :], xis, [s[key] for s in xi_sects])
+
+        scalars['radius'][p] = prop.radius
+        scalars['nblades'][p] = xrd['Nblds']
+        scalars['rho'][p] = xrd['Rho']
+        scalars['vsound'][p] = xrd['Vso']
+        scalars['mu'][p] = xrd['Rmu']
+
+    return geo, sect, scalars
+
+
+def analyze_operating_map(props: list, velo_vals, rpm_vals, outputs: list = None):
+    """
+    Solves every (velocity, rpm) pair for every Propeller in a single broadcasted blade-element / momentum
+    computation.  Much faster than XROTOR oper runs, and meant for screening / comparing many propellers at the
+    same operating conditions.
+
+    :param props: list of Propeller objects
+    :param velo_vals: velocities (m/s), one per operating point
+    :param rpm_vals: rpms, one per operating point
+    :param outputs: which outputs to return (and in what order), defaults to settings.FAST_OPER_OUTPUTS.  Can also
+        include "converged", 1.0 where every station had a real solution and 0.0 where some are deeply stalled (the
+        other outputs are still given there, from the inflow angles closest to a solution)
+    :return: np.array of shape (n_props, n_points, n_outputs), NaN where a point could not be solved
+    """
+    outputs = FAST_OPER_OUTPUTS if outputs is None else outputs
+    velo_vals = np.atleast_1d(np.asarray(velo_vals, dtype=float))
+    rpm_vals = np.atleast_1d(np.asarray(rpm_vals, dtype=float))
+    if velo_vals.shape != rpm_vals.shape:
+        raise Error('"velo_vals" and "rpm_vals" must be the same length (one rpm per velocity)')
+    for output in outputs:
+        if output not in FAST_OPER_OUTPUTS + ['converged']:
+            raise Error('Unknown output "{}", must be one of {}'.format(output, FAST_OPER_OUTPUTS + ['converged']))
+
+    geo, sect, scalars = stack_bemt_inputs(props=props)
+    res = solve_bemt_oper(velo=velo_vals[None, :, None], rpm=rpm_vals[None, :, None], r_R=geo['r/R'],
+                          c_R=geo['CH'], beta=geo['BE'], dr_R=geo['dr/R'], sect=sect, **scalars)
+    return np.stack([res[output].astype(float) for output in outputs], axis=-1)
+
+
+def _solve_bemt_rpm_scan(geo: dict, sect: dict, scalars: dict, velo_vals: np.ndarray, scan_rpms: np.ndarray,
+                         tol: float = 1e-9):
+    # solve_bemt_oper() of stack_bemt_inputs() at every velocity x every rpm of scan_rpms (n_props, 1, n_rpm) -> arrays
+    # of shape (n_props, n_velos, n_rpm) (inputs get an extra rpm axis ahead of the radial one)
+    return solve_bemt_oper(velo=velo_vals[None, :, None, None], rpm=scan_rpms[..., None],
+                           r_R=geo['r/R'][:, :, None], c_R=geo['CH'][:, :, None], beta=geo['BE'][:, :, None],
+                           dr_R=geo['dr/R'][:, :, None], sect={k: v[:, :, None] for k, v in sect.items()},
+                           tol=tol, **{k: v[:, :, None] for k, v in scalars.items()})
+
+
+def trim_operating_points(props: list, velo_vals, thrust_vals, outputs: list = None, rpm_factors=None,
+                          n_iter: int = 5):
+    """
+    Finds, for every Propeller and every (velocity, thrust) pair, the rpm that produces the required thrust and
+    evaluates the propeller there, all in a few broadcasted blade-element / momentum computations: a coarse-tolerance
+    scan of rpm_factors * each propeller's design point rpm brackets the first thrust crossing, n_iter regula falsi
+    (Illinois) steps narrow the bracket, and a final evaluation is made at the interpolated rpms.
+
+    :param props: list of Propeller objects
+    :param velo_vals: velocities (m/s), one per operating point
+    :param thrust_vals: required thrusts (N), one per operating point
+    :param outputs: which outputs to return (and in what order), defaults to settings.FAST_OPER_OUTPUTS
+    :param rpm_factors: the rpm scan as multiples of the design rpms, defaults to 8 values from 0.1 to 4
+    :return: np.array of shape (n_props, n_points, n_outputs), NaN where the thrust could not be reached or the
+        trimmed point didn't converge (see solve_bemt_oper())
+    """
+    outputs = FAST_OPER_OUTPUTS if outputs is None else outputs
+    velo_vals = np.atleast_1d(np.asarray(velo_vals, dtype=float))
+    thrust_vals = np.atleast_1d(np.asarray(thrust_vals, dtype=float))
+    if velo_vals.shape != thrust_vals.shape:
+        raise Error('"velo_vals" and "thrust_vals" must be the same length (one thrust per velocity)')
+    for output in outputs:
+        if output not in FAST_OPER_OUTPUTS:
+            raise Error('Unknown output "{}", must be one of {}'.format(output, FAST_OPER_OUTPUTS))
+    rpm_factors = np.geomspace(0.1, 4.0, 8) if rpm_factors is None else np.sort(np.asarray(rpm_factors, dtype=float))
+
+    geo, sect, scalars = stack_bemt_inputs(props=props)
+    design_rpms = np.array([prop.xrotor_op_dict['rpm'] for prop in props], dtype=float)
+
+    scan_rpms = design_rpms[:, None, None] * rpm_factors[None, None, :]
+    res = _solve_bemt_rpm_scan(geo=geo, sect=sect, scalars=scalars, velo_vals=velo_vals, scan_rpms=scan_rpms, tol=1e-3)
+    resid = res['thrust(N)'] - thrust_vals[None, :, None]
+
+    # bracket of the first rpm at which the thrust reaches the requirement
+    reached = np.nan_to_num(resid, nan=-np.inf) >= 0
+    idx = np.argmax(reached, axis=-1)
+    ok = np.any(reached, axis=-1) & (idx > 0)
+    idx = np.maximum(idx, 1)
+    f_lo = np.take_along_axis(resid, (idx - 1)[..., None], axis=-1)[..., 0]
+    f_hi = np.take_along_axis(resid, idx[..., None], axis=-1)[..., 0]
+    r_lo = np.take_along_axis(scan_rpms, (idx - 1)[..., None], axis=-1)[..., 0]
+    r_hi = np.take_along_axis(scan_rpms, idx[..., None], axis=-1)[..., 0]
+    ok &= np.isfinite(f_lo)
+    f_lo, f_hi = np.where(ok, f_lo, -1.0), np.where(ok, f_hi, 1.0)
+
+    def interp_rpm():
+        return r_lo - f_lo * (r_hi - r_lo) / (f_hi - f_lo)
+
+    kwargs = dict(velo=velo_vals[None, :, None], r_R=geo['r/R'], c_R=geo['CH'], beta=geo['BE'], dr_R=geo['dr/R'],
+                  sect=sect, **scalars)
+    side = np.zeros(f_lo.shape)
+    for _ in range(n_iter):
+        r_new = interp_rpm()
+        f_new = solve_bemt_oper(rpm=r_new[..., None], tol=1e-7, **kwargs)['thrust(N)'] - thrust_vals[None, :]
+        below = np.nan_to_num(f_new, nan=-np.inf) < 0
+        # Illinois: halve the residual of an end point that was kept twice in a row
+        f_hi = np.where(below & (side == -1), 0.5 * f_hi, f_hi)
+        f_lo = np.where(~below & (side == 1), 0.5 * f_lo, f_lo)
+        r_lo, f_lo = np.where(below, r_new, r_lo), np.where(below, np.nan_to_num(f_new, nan=f_lo), f_lo)
+        r_hi, f_hi = np.where(below, r_hi, r_new), np.where(below, f_hi, f_new)
+        side = np.where(below, -1, 1)
+
+    res = solve_bemt_oper(rpm=interp_rpm()[..., None], **kwargs)
+    ok &= res['converged']
+    return np.where(ok[..., None], np.stack([res[output] for output in outputs], axis=-1), np.nan)
+
+
+def compute_operating_maps(props: list, velo_vals, rpm_factors=None, n_stations: int = 20, chunk_size: int = 64):
+    """
+    Operating maps (thrust and power over a velocity x rpm grid) of many propellers from the broadcasted blade-element
+    / momentum solver, the rpm axis of each being rpm_factors * its design point rpm.
+
+    :param velo_vals: velocities (m/s) of the map
+    :param rpm_factors: rpms of the map as multiples of the design rpms, defaults to 16 values from 0.1 to 4
+    :param n_stations: radial stations the blades are interpolated onto, see stack_bemt_inputs()
+    :param chunk_size: number of propellers solved together, bounds the memory used
+    :return: dict of np.arrays of shape (n_props, n_velos, n_rpm) with keys "rpm", "thrust(N)" and "power(W)", NaN
+        where a point didn't converge (see solve_bemt_oper())
+    """
+    velo_vals = np.atleast_1d(np.asarray(velo_vals, dtype=float))
+    rpm_factors = np.geomspace(0.1, 4.0, 16) if rpm_factors is None else np.sort(np.asarray(rpm_factors, dtype=float))
+    maps = {'rpm': [], 'thrust(N)': [], 'power(W)': []}
+    for start in range(0, len(props), chunk_size):
+        chunk = props[start:start + chunk_size]
+        geo, sect, scalars = stack_bemt_inputs(props=chunk, n_stations=n_stations)
+        design_rpms = np.array([prop.xrotor_op_dict['rpm'] for prop in chunk], dtype=float)
+        scan_rpms = design_rpms[:, None, None] * rpm_factors[None, None, :]
+        res = _solve_bemt_rpm_scan(geo=geo, sect=sect, scalars=scalars, velo_vals=velo_vals, scan_rpms=scan_rpms,
+                                   tol=1e-5)
+        maps['rpm'].append(np.broadcast_to(scan_rpms, res['thrust(N)'].shape))
+        maps['thrust(N)'].append(np.where(res['converged'], res['thrust(N)'], np.nan))
+        maps['power(W)'].append(np.where(res['converged'], res['power(W)'], np.nan))
+    return {key: np.concatenate(vals, axis=0) for key, vals in maps.items()}
+
+
+def map_power_at_thrust(op_map: dict, map_velos, velo_vals, thrust_vals):
+    """
+    Shaft power each propeller of compute_operating_maps() needs to produce thrust_vals at velo_vals: along the rpm axis
+    the power is interpolated at the first crossing of the required thrust, then linearly between the map velocities.
+
+    :param thrust_vals: np.array of required thrusts (N), either one per velocity or of shape (n_props, n_velos)
+    :return: np.array of shape (n_props, n_velos), NaN where a propeller can't reach the thrust or the velocity is
+        outside of the map
+    """
+    map_velos = np.asarray(map_velos, dtype=float)
+    velo_vals = np.atleast_1d(np.asarray(velo_vals, dtype=float))
+    thrust_vals = np.broadcast_to(np.asarray(thrust_vals, dtype=float), (op_map['thrust(N)'].shape[0],
+                                                                          len(velo_vals)))
+    j = np.clip(np.searchsorted(map_velos, velo_vals) - 1, 0, len(map_velos) - 2)
+    w = (velo_vals - map_velos[j]) / (map_velos[j + 1] - map_velos[j])
+    inside = (velo_vals >= map_velos[0]) & (velo_vals <= map_velos[-1])
+
+    def power_at(jj):
+        thrust, power = op_map['thrust(N)'][:, jj, :], op_map['power(W)'][:, jj, :]  # (n_props, n_velos, n_rpm)
+        reached = np.nan_to_num(thrust, nan=-np.inf) >= thrust_vals[..., None]
+        idx = np.argmax(reached, axis=-1)
+        ok = np.any(reached, axis=-1) & (idx > 0)
+        idx = np.maximum(idx, 1)[..., None]
+        t_lo, t_hi = [np.take_along_axis(thrust, i, axis=-1)[..., 0] for i in [idx - 1, idx]]
+        p_lo, p_hi = [np.take_along_axis(power, i, axis=-1)[..., 0] for i in [idx - 1, idx]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frac = (thrust_vals - t_lo) / (t_hi - t_lo)
+        return np.where(ok, p_lo + frac * (p_hi - p_lo), np.nan)
+
+    power = (1 - w) * power_at(j) + w * power_at(j + 1)
+    return np.where(inside[None, :], power, np.nan)
+
+
+def oper_data_power_at_thrust(oper_data, velo_vals, thrust_vals):
+    """
+    Shaft power a propeller needs to produce thrust_vals at velo_vals, linearly interpolated from the scattered (speed,
+    thrust) -> power points of its XROTOR sweep results (a PropellerOperData).
+
+    :return: np.array of the powers, NaN outside of the swept (speed, thrust) region
+    """
+    pts = np.array([[dp['speed(m/s)'], dp['thrust(N)'], dp['power(W)']] for dp in oper_data.datapoints.values()],
+                   dtype=float)
+    if len(pts) < 4:
+        raise Error('Need at least 4 sweep datapoints to interpolate a power map, run more oper sweeps first')
+    scale = np.ptp(pts[:, :2], axis=0)
+    scale[scale == 0] = 1.0
+    query = np.stack(np.broadcast_arrays(np.asarray(velo_vals, dtype=float), np.asarray(thrust_vals, dtype=float)),
+                     axis=-1)
+    return griddata(points=pts[:, :2] / scale, values=pts[:, 2], xi=query / scale, method='linear')
+
+
+def sweep_refinement_points(results: dict, params: list, tol: float, min_spacing: tuple,
+                            peak_param: str = 'Efficiency'):
+    """
+    Picks where an operating point sweep needs more points: along every line of constant speed (and of constant sweep
+    value), each interior point whose outputs are further than tol from the straight line between its neighbours, or
+    that is a peak of peak_param, gets both of its intervals bisected (down to min_spacing).
+
+    :param results: {(velo_val, sweep_val): oper output dict, None for the points that failed}
+    :param params: oper outputs checked, deviations are relative to each one's range over all of the results
+    :param min_spacing: (velo, sweep_val) spacings that intervals aren't split below
+    :return: list of the new (velo_val, sweep_val) points, most needed first
+    """
+    ok = {pt: res for pt, res in results.items() if res is not None}
+    if len(ok) < 3:
+        return []
+    scale = {p: max(np.ptp([res[p] for res in ok.values()]), 1e-12) for p in params}
+
+    scores = {}
+    for axis in [0, 1]:
+        lines = {}
+        for pt in results:
+            lines.setdefault(pt[1 - axis], []).append(pt)
+        for line in lines.values():
+            line = sorted(line, key=lambda pt: pt[axis])
+            for p0, p1, p2 in zip(line[:-2], line[1:-1], line[2:]):
+                if any([pt not in ok for pt in [p0, p1, p2]]):
+                    continue
+                w = (p1[axis] - p0[axis]) / (p2[axis] - p0[axis])
+                err = max([abs(ok[p1][p] - (1 - w) * ok[p0][p] - w * ok[p2][p]) / scale[p] for p in params])
+                peak = peak_param is not None and ok[p1][peak_param] > max(ok[p0][peak_param], ok[p2][peak_param])
+                if err <= tol and not peak:
+                    continue
+                for pa, pb in [(p0, p1), (p1, p2)]:
+                    if (pb[axis] - pa[axis]) / 2 < min_spacing[axis]:
+                        continue
+                    mid = list(pa)
+                    mid[axis] = (pa[axis] + pb[axis]) / 2
+                    mid = tuple(mid)
+                    if mid not in results:  # peaks that are already smooth rank after the curved intervals
+                        scores[mid] = max(scores.get(mid, 0), max(err, tol))
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def level_flight_thrust(velo_vals, mass: float, cd0: float, k_induced: float, s_ref: float, rho: float,
+                        g: float = 9.80665):
+    """
+    Drag (= total thrust required) of a vehicle in steady level flight with the parabolic drag polar
+    CD = cd0 + k_induced * CL^2.
+
+    :param mass: vehicle mass (kg)
+    :param s_ref: reference area of the drag polar (m^2)
+    """
+    q = 0.5 * rho * np.asarray(velo_vals, dtype=float) ** 2
+    with np.errstate(divide='ignore'):
+        cl = mass * g / (q * s_ref)
+    return q * s_ref * (cd0 + k_induced * cl ** 2)
+
+
+def integrate_mission(power, velo_vals, energy: float, energy_fractions=None):
+    """
+    Range and endurance of a speed schedule flown on a fixed energy budget, for many propellers / configurations at
+    once: segment i is flown at velo_vals[i] until it has used energy_fractions[i] of the energy.
+
+    :param power: np.array of the total (electrical) power at each schedule velocity, shape (..., n_segments)
+    :param energy: usable energy (J)
+    :param energy_fractions: fraction of the energy used by each segment, defaults to an even split
+    :return: dict of np.arrays of shape (...) with keys "range(m)" and "endurance(s)", NaN if any segment can't be
+        flown
+    """
+    power = np.asarray(power, dtype=float)
+    velo_vals = np.asarray(velo_vals, dtype=float)
+    if energy_fractions is None:
+        energy_fractions = np.full(power.shape[-1], 1 / power.shape[-1])
+    energy_fractions = np.asarray(energy_fractions, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        seg_times = np.where(power > 0, energy_fractions * energy / power, np.nan)
+    return {'range(m)': np.sum(seg_times * velo_vals, axis=-1), 'endurance(s)': np.sum(seg_times, axis=-1)}
+
+
 def get_xrotor_re_scaling_exp(re: int):     # THIS NEEDS WORK
     # re_pts = [0, 1e5, 2e5, 8e5, 2e6, 3e6]
     # f_pts = [-0.3, -0.5, -0.5, -1.5, -0.2, -0.1]
@@ -1102,36 +2028,223 @@ def calc_ideal_eff(thrust: float, rho: float, a_disk: float, u_o: float):
     return 100 * 2 / (1 + (T / (A_disk * 1 / 2 * rho * u_o ** 2) + 1) ** (1 / 2))
 
 
+def calc_tip_mach(rpm: float, radius: float, velo: float, vsound: float):
+    """
+    :return: helical tip Mach number, from the rotational and axial (freestream) speed of the blade tip
+    """
+    omega = np.asarray(rpm, dtype=float) * 2 * np.pi / 60
+    return np.sqrt((omega * radius) ** 2 + np.asarray(velo, dtype=float) ** 2) / vsound
+
+
+def calc_blade_mass_proxy(r_R: np.ndarray, c_R: np.ndarray, radius: float, nblades: int):
+    """
+    Proxy for the mass of the blades, nblades * integral(chord^2 dr), i.e. the blade volume if the section thickness
+    scales with the chord (m^3 per unit thickness / chord ratio).
+
+    :param r_R: radial stations, r / R
+    :param c_R: chords at the stations, c / R
+    """
+    r = np.asarray(r_R, dtype=float) * radius
+    c_sq = (np.asarray(c_R, dtype=float) * radius) ** 2
+    return nblades * np.sum(0.5 * (c_sq[1:] + c_sq[:-1]) * np.diff(r))
+
+
 # ===== GEOMETRY MANIPULATION =====
+# parametric splines of airfoil coordinate sets (and the resampled coordinates already computed from them), keyed by
+# a hash of the coordinates
+_AIRFOIL_SPLINES = {}
+
+
+def _get_airfoil_spline(xc: np.ndarray, yc: np.ndarray):
+    # cubic interpolating spline through the coordinates, parameterized by normalized chord-length, plus the parameter
+    # of the L.E. (min x point), and a dict of the resamples already done
+    xc, yc = np.asarray(xc, dtype=float), np.asarray(yc, dtype=float)
+    key = hashlib.sha1(np.vstack([xc, yc]).tobytes()).hexdigest()
+    if key not in _AIRFOIL_SPLINES:
+        seg = np.hypot(np.diff(xc), np.diff(yc))
+        keep = np.append(True, seg > 0)  # splprep can't handle repeated consecutive points
+        xc, yc = xc[keep], yc[keep]
+        u = np.append(0.0, np.cumsum(seg[seg > 0]))
+        u /= u[-1]
+        tck, _ = splprep([xc, yc], u=u, s=0, k=3)
+        _AIRFOIL_SPLINES[key] = (tck, u[np.argmin(xc)], {})
+    return _AIRFOIL_SPLINES[key]
+
+
+def _airfoil_spline_params(tck, u_le: float, n_pts: int, spacing: str):
+    if spacing == 'cosine':  # clustered at the L.E. and the T.E. of each surface
+        n_up = max(2, int(round(n_pts * u_le)) + 1)
+        n_lo = max(2, n_pts - n_up + 1)
+        t_up = (1 - np.cos(np.pi * np.linspace(0, 1, n_up))) / 2
+        t_lo = (1 - np.cos(np.pi * np.linspace(0, 1, n_lo))) / 2
+        return np.concatenate([u_le * t_up, u_le + (1 - u_le) * t_lo[1:]])
+
+    elif spacing == 'curvature':  # equidistribute sqrt(curvature) + a baseline along the arc-length
+        u_fine = np.linspace(0, 1, 2001)
+        dx, dy = splev(u_fine, tck, der=1)
+        ddx, ddy = splev(u_fine, tck, der=2)
+        ds = np.hypot(dx, dy)
+        kappa = np.abs(dx * ddy - dy * ddx) / np.maximum(ds, 1e-12) ** 3
+        dens = (np.sqrt(kappa) + np.sqrt(np.mean(kappa))) * ds
+        cum = np.append(0.0, np.cumsum((dens[1:] + dens[:-1]) / 2 * np.diff(u_fine)))
+        return np.interp(np.linspace(0, cum[-1], n_pts), cum, u_fine)
+
+    else:
+        raise Error('Unknown airfoil point spacing "{}", must be either "cosine" or "curvature"'.format(spacing))
+
+
+def _airfoil_resample_error(tck, u: np.ndarray):
+    # max distance between the spline and the straight segments joining the resampled points (checked at midpoints)
+    xs, ys = splev(u, tck)
+    xm, ym = splev((u[1:] + u[:-1]) / 2, tck)
+    return np.max(np.hypot(xm - (xs[1:] + xs[:-1]) / 2, ym - (ys[1:] + ys[:-1]) / 2))
+
+
+def resample_airfoil_coords(xc: np.ndarray, yc: np.ndarray, n_pts: int = None, tol: float = None,
+                            spacing: str = 'cosine', max_pts: int = 1000):
+    """
+    Resamples a set of airfoil coordinates (T.E. -> upper -> L.E. -> lower -> T.E.) on a cached parametric cubic
+    spline, keeping the T.E. end points exactly.
+
+    :param n_pts: target number of points
+    :param tol: if n_pts is not given, the fewest points for which the resampled profile is within tol (chord
+        fractions) of the spline
+    :param spacing: "cosine" (clustered at the L.E. and T.E.) or "curvature" (clustered where the surface bends)
+    :return: np.vstack([x, y])
+    """
+    if n_pts is None and tol is None:
+        raise Error('Must give either n_pts or tol to resample airfoil coordinates')
+    tck, u_le, resampled = _get_airfoil_spline(xc, yc)
+    resample_key = (n_pts, tol if n_pts is None else None, spacing)
+    if resample_key in resampled:
+        return resampled[resample_key].copy()
+
+    if n_pts is None:
+        # double until within tolerance, then bisect back down to the fewest points that are
+        lo, hi = 8, 16
+        while _airfoil_resample_error(tck, _airfoil_spline_params(tck, u_le, hi, spacing)) > tol:
+            if hi >= max_pts:
+                Warning('Could not resample airfoil to within tol={} using {} points'.format(tol, max_pts))
+                break
+            lo, hi = hi, min(2 * hi, max_pts)
+        else:
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if _airfoil_resample_error(tck, _airfoil_spline_params(tck, u_le, mid, spacing)) > tol:
+                    lo = mid
+                else:
+                    hi = mid
+        n_pts = hi
+
+    xs, ys = splev(_airfoil_spline_params(tck, u_le, n_pts, spacing), tck)
+    xs[[0, -1]], ys[[0, -1]] = np.asarray(xc)[[0, -1]], np.asarray(yc)[[0, -1]]    # exact T.E. points
+    resampled[resample_key] = np.vstack([xs, ys])
+    return resampled[resample_key].copy()
+
+
+def place_radial_sections(roR: np.ndarray, ch: np.ndarray, be: np.ndarray, tol: float, max_sections: int = 50):
+    """
+    Picks blade section locations adaptively (greedy point insertion), such that linearly interpolating the chord and
+    twist between neighbouring sections stays within tol of the given distributions.  The error at each given
+    station is the chord error plus the twist error times 0.75 chord (the largest lever arm about the quarter-chord
+    axis), all as fractions of the tip radius.
+
+    :param roR: r/R of the given distribution stations
+    :param ch: chord / R at roR
+    :param be: twist (radians) at roR
+    :param tol: max allowed geometric error (fraction of tip radius)
+    :param max_sections: stop inserting sections once there are this many
+    :return: array of r/R section locations, root and tip included
+    """
+    roR, ch, be = [np.asarray(arr, dtype=float) for arr in [roR, ch, be]]
+    chosen = np.zeros(len(roR), dtype=bool)
+    chosen[[0, -1]] = True
+
+    while chosen.sum() < max_sections:
+        idx = np.flatnonzero(chosen)
+        err = np.abs(np.interp(roR, roR[idx], ch[idx]) - ch) + \
+            0.75 * ch * np.abs(np.interp(roR, roR[idx], be[idx]) - be)
+        worst = np.argmax(err)
+        if err[worst] <= tol:
+            break
+        chosen[worst] = True
+
+    return roR[chosen]
+
+
 def generate_3D_profile_points(nondim_xy_coords: np.ndarray, radius: float, axis_shift: float = 0.5,
                                chord_len: float = 1.0, beta_deg: float = 0.0, skew_deg: float = 0.0):
-    xpts, ypts = nondim_xy_coords.copy()
-
-    # mirror over y and shift (0, 0) to align to the blade axis
-    xpts = -xpts + axis_shift
+    return generate_3D_profile_points_batch(nondim_xy_coords=nondim_xy_coords, radii=radius, axis_shift=axis_shift,
+                                            chord_lens=chord_len, beta_degs=beta_deg, skew_degs=skew_deg)[0, 0]
 
-    # scale the profile by the chord length
-    xpts *= chord_len
-    ypts *= chord_len
 
-    # rotate profile by beta
-    b = np.deg2rad(beta_deg)
+def generate_3D_profile_points_batch(nondim_xy_coords: np.ndarray, radii, axis_shift: float = 0.5, chord_lens=1.0,
+                                     beta_degs=0.0, skew_degs=0.0, rotate_degs=0.0):
+    """
+    Broadcast version of generate_3D_profile_points, wraps every section of every rotated copy in one pass.
+
+    :param nondim_xy_coords: (2, n_pts) coordinates shared by all sections, or (n_sect, 2, n_pts) per-section
+    :param radii: scalar or (n_sect,) section radii
+    :param chord_lens: scalar or (n_sect,) section chord lengths
+    :param beta_degs: scalar or (n_sect,) section twist angles
+    :param skew_degs: scalar or (n_sect,) section skew angles
+    :param rotate_degs: scalar or (n_rot,) angles of the rotated copies (e.g. one per blade)
+    :return: array of shape (n_rot, n_sect, 3, n_pts) holding the (x, y, z) rows of every section
+    """
+    coords = np.asarray(nondim_xy_coords, dtype=float)
+    if coords.ndim == 2:
+        coords = coords[np.newaxis]
+    radii = np.atleast_1d(np.asarray(radii, dtype=float))
+    n_sect = max(len(radii), coords.shape[0])
+
+    def _per_sect(vals):  # -> (n_sect, 1) so it broadcasts against the points axis
+        return np.broadcast_to(np.asarray(vals, dtype=float), (n_sect,))[:, np.newaxis]
+
+    r = _per_sect(radii)
+    c = _per_sect(chord_lens)
+    b = np.deg2rad(_per_sect(beta_degs))
+    sk = np.deg2rad(_per_sect(skew_degs))
+    rot = np.deg2rad(np.atleast_1d(np.asarray(rotate_degs, dtype=float)))
+
+    # mirror over y, shift (0, 0) to the blade axis and scale by the chord length
+    xpts = (-coords[:, 0, :] + axis_shift) * c
+    ypts = coords[:, 1, :] * c
+
+    # rotate profiles by beta
     xp = xpts * np.cos(-b) + ypts * np.sin(-b)
     yp = ypts * np.cos(-b) - xpts * np.sin(-b)
 
-    # create array of radii points, create array of theta points
-    rp = np.ones(len(xp)) * radius
-    thetas = xp / (2 * np.pi * radius) * 2 * np.pi    #map each xpos to a theta in radians
+    # map each xpos to a theta, apply skew and the copy rotations -> (n_rot, n_sect, n_pts)
+    thetas = xp / r - sk - rot[:, np.newaxis, np.newaxis]
+
+    # wrap the coords around the axis
+    xyz = np.empty((len(rot), n_sect, 3, xp.shape[-1]))
+    xyz[:, :, 0, :] = r * np.cos(thetas)
+    xyz[:, :, 1, :] = r * np.sin(thetas)
+    xyz[:, :, 2, :] = yp
+    return xyz
 
-    # apply skew
-    thetas += np.deg2rad(-skew_deg)
 
-    # wrap the ycoords
-    ys = rp * np.sin(thetas)
-    xs = rp * np.cos(thetas)
-    zs = yp
+def join_polylines(polylines: list):
+    """
+    Stacks a list of (n_pts, 3) polylines into a single array with a row of NaNs between them, so they can be drawn
+    as one line (e.g. one matplotlib artist) without connecting segments.
+    """
+    if len(polylines) == 0:
+        return np.zeros((0, 3))
+    gap = np.full((1, 3), np.nan)
+    return np.concatenate([part for line in polylines for part in (np.asarray(line, dtype=float), gap)][:-1])
+
 
-    return np.vstack([xs, ys, zs])
+def polylines_to_segments(polylines: list):
+    """
+    Converts a list of (n_pts, 3) polylines into the (n_segments * 2, 3) segment end points of a single line item
+    drawn with mode='lines' (pyqtgraph GLLinePlotItem).
+    """
+    if len(polylines) == 0:
+        return np.zeros((0, 3))
+    return np.concatenate([np.stack([line[:-1], line[1:]], axis=1).reshape(-1, 3)
+                           for line in (np.asarray(line, dtype=float) for line in polylines)])
 
 
 def unit_vector(vector):
@@ -1174,6 +2287,14 @@ def compute_polygon_angles(exterior_coords: list):
 
 
 def compute_profile_trimesh(profile_coords, reverse_order: bool = False):
+    """
+    Triangulates a closed profile (e.g. a blade root / tip cap) by merging its upper and lower surface chains from the
+    L.E. to the T.E., which is O(n) for the usual airfoil shapes.  Profiles that are not two monotone chains (or give
+    inverted triangles) fall back to ear-clipping.
+
+    :return: array of shape (n_tri, 3, 3) of triangle vertices, wound in the same direction as the profile points
+        (reversed if reverse_order)
+    """
     if len(profile_coords) == 3:
         xc, yc, zc = profile_coords
     elif len(profile_coords) == 2:
@@ -1181,8 +2302,130 @@ def compute_profile_trimesh(profile_coords, reverse_order: bool = False):
         zc = np.zeros(len(xc))
     else:
         raise ValueError('len of profile_coords must be either 2 or 3')
-    points = list(zip(xc, yc, zc))
+    points = np.column_stack([xc, yc, zc]).astype(float)
+    if len(points) > 1 and np.array_equal(points[0], points[-1]):
+        points = points[:-1]
+
+    tri_idx = _monotone_chain_triangles(points=points)
+    if tri_idx is None:
+        return _ear_clip_trimesh(points=[tuple(pt) for pt in points], reverse_order=reverse_order)
+
+    if reverse_order:
+        tri_idx = tri_idx[:, ::-1]
+    return points[tri_idx]
+
+
+def compute_blade_trimesh(profiles: np.ndarray):
+    """
+    Triangulates a blade from its stacked profiles, root cap and tip cap first, then the surfaces between neighbouring
+    profiles (2 triangles per quad), all with outwards normals.
+
+    :param profiles: array of shape (n_profs, 3, n_pts), root to tip
+    :return: array of shape (n_tri, 3, 3)
+    """
+    profiles = np.asarray(profiles, dtype=float)
+    root = compute_profile_trimesh(profile_coords=profiles[0])
+    tip = compute_profile_trimesh(profile_coords=profiles[-1], reverse_order=True)
+
+    # quad corners (a = this profile pt i, b = next profile pt i, c = next profile pt i+1, f = this profile pt i+1)
+    pts = profiles.transpose(0, 2, 1)
+    a, b, c, f = pts[:-1, :-1], pts[1:, :-1], pts[1:, 1:], pts[:-1, 1:]
+    sides = np.stack([np.stack([a, b, c], axis=2), np.stack([a, c, f], axis=2)], axis=2)
+
+    return np.concatenate([root, tip, sides.reshape(-1, 3, 3)])
+
+
+def dedupe_mesh_vertices(vectors: np.ndarray, decimals: int = 9):
+    """
+    Converts a triangle soup (n_tri, 3, 3) to an indexed mesh with shared vertices, vertices that coincide after
+    rounding to decimals are merged and triangles that collapse are dropped.
+
+    :return: (verts (n_verts, 3), faces (n_faces, 3))
+    """
+    pts = np.asarray(vectors, dtype=float).reshape(-1, 3)
+    _, first_idx, inverse = np.unique(np.round(pts, decimals), axis=0, return_index=True, return_inverse=True)
+    faces = inverse.reshape(-1, 3)
+    faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])]
+    return pts[first_idx], faces
+
+
+def compute_hub_mesh(hub_radius: float, thickness: float, n_seg: int = 64):
+    """
+    Closed cylinder about the z-axis, centered on z=0, with outwards normals.
+
+    :return: (verts (2 * n_seg + 2, 3), faces (4 * n_seg, 3))
+    """
+    theta = np.linspace(0, 2 * np.pi, n_seg, endpoint=False)
+    ring = np.column_stack([np.cos(theta), np.sin(theta)]) * hub_radius
+    verts = np.vstack([np.column_stack([ring, np.full(n_seg, -thickness / 2)]),
+                       np.column_stack([ring, np.full(n_seg, thickness / 2)]),
+                       [[0, 0, -thickness / 2], [0, 0, thickness / 2]]])
+
+    i = np.arange(n_seg)
+    j = (i + 1) % n_seg
+    bot_c, top_c = 2 * n_seg, 2 * n_seg + 1
+    faces = np.vstack([np.column_stack([i, j, j + n_seg]),
+                       np.column_stack([i, j + n_seg, i + n_seg]),
+                       np.column_stack([np.full(n_seg, bot_c), j, i]),
+                       np.column_stack([np.full(n_seg, top_c), i + n_seg, j + n_seg])])
+    return verts, faces
+
+
+def iter_rotor_mesh_parts(blade_verts: np.ndarray, blade_faces: np.ndarray, nblades: int, hub_verts=None,
+                          hub_faces=None):
+    """
+    Yields the (verts, faces) parts of a full rotor, one rotated copy of the blade mesh at a time (same rotation
+    direction as the blade_geometry / plotting functions), then the hub if given.
+    """
+    for ang in np.deg2rad(360 / nblades * np.arange(nblades)):
+        rot = np.array([[np.cos(ang), -np.sin(ang), 0], [np.sin(ang), np.cos(ang), 0], [0, 0, 1]])
+        yield blade_verts @ rot, blade_faces
+    if hub_verts is not None:
+        yield hub_verts, hub_faces
+
+
+def _monotone_chain_triangles(points: np.ndarray):
+    # profile points run T.E. -> upper surface -> L.E. -> lower surface (-> T.E.), returns (n_tri, 3) vertex indices
+    # in polygon order, or None if the two surfaces are not monotone along the chord
+    n = len(points)
+    if n < 3:
+        return np.zeros((0, 3), dtype=int)
+
+    # chordwise coordinate, measured from the L.E. (the point farthest from the T.E.) towards the T.E.
+    le_idx = int(np.argmax(np.linalg.norm(points - points[0], axis=1)))
+    chord_vec = points[0] - points[le_idx]
+    if le_idx == 0 or le_idx == n - 1 or not np.any(chord_vec):
+        return None
+    s = (points - points[le_idx]) @ chord_vec / np.dot(chord_vec, chord_vec)
+
+    upper = np.arange(le_idx, -1, -1)     # L.E. -> T.E.
+    lower = np.arange(le_idx + 1, n)      # just aft of L.E. -> T.E.
+    if np.any(np.diff(s[upper]) < 0) or np.any(np.diff(s[lower]) < 0):
+        return None
+
+    # merge the two chains by chordwise position, every step advances one chain and emits one triangle
+    adv_s = np.concatenate([s[upper[1:]], s[lower[1:]]])
+    from_upper = np.concatenate([np.ones(len(upper) - 1, dtype=bool), np.zeros(len(lower) - 1, dtype=bool)])
+    from_upper = from_upper[np.argsort(adv_s, kind='stable')]
+    n_up = np.cumsum(from_upper)
+    n_lo = np.cumsum(~from_upper)
+    u_prev = upper[n_up - from_upper]
+    l_prev = lower[n_lo - ~from_upper]
+    tri_idx = np.where(from_upper[:, np.newaxis],
+                       np.column_stack([upper[n_up], u_prev, l_prev]),
+                       np.column_stack([u_prev, l_prev, lower[n_lo]]))
+
+    # every triangle must be wound the same way as the polygon itself (Newell normal), otherwise it overlaps
+    poly_norm = np.cross(points, np.roll(points, -1, axis=0)).sum(axis=0)
+    tris = points[tri_idx]
+    tri_norms = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    tol = -1e-12 * np.linalg.norm(poly_norm) ** 2
+    if np.any(tri_norms @ poly_norm < tol):
+        return None
+    return tri_idx
+
 
+def _ear_clip_trimesh(points: list, reverse_order: bool = False):
     # 1) For each vertex in the polygon, compute the angle between the two linked edges
     # 2) Sort vertices by decreasing angle relative to the interior of the polygon
     # 3) If there is less than 3 vertices in the set, we're done
@@ -1208,7 +2451,7 @@ def compute_profile_trimesh(profile_coords, reverse_order: bool = False):
         vectors.append(vector)
         _ = points.pop(min_idx)
 
-    return vectors
+    return np.array(vectors, dtype=float).reshape(-1, 3, 3)
 
 
 # ===== USER INTERFACE STUFF =====
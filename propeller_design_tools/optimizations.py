@@ -1,38 +1,167 @@
+import json
 import shutil
 import os
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
 import numpy as np
 import matplotlib.pyplot as plt
 import pyqtgraph as pg
+from scipy.linalg import cho_factor, cho_solve
+from scipy.stats import norm, qmc
 from pyqtgraph import opengl as gl
 from propeller_design_tools import Propeller
 from propeller_design_tools.user_io import Error
-from propeller_design_tools.funcs import create_propeller, get_prop_db
+from propeller_design_tools.settings import VORFORM_FIDELITY
+from propeller_design_tools.funcs import iter_create_propellers, get_prop_db, trim_operating_points, \
+    compute_operating_maps, map_power_at_thrust, oper_data_power_at_thrust, level_flight_thrust, integrate_mission, \
+    calc_tip_mach, calc_blade_mass_proxy, validate_fidelity_cascade
 from propeller_design_tools.user_io import Info, Warning
 from propeller_design_tools.custom_opengl_classes import Custom3DAxis
 
 
-class VehicleRangeOptimization:
-    def __init__(self):
-        pass
+# XROTOR design point outputs recorded for each candidate in the optimization journal
+JOURNAL_METRICS = ['thrust(N)', 'power(W)', 'Efficiency', 'rpm', 'adv. ratio']
 
+# multi-objective metrics of the candidates -> default sense, any other scalar XROTOR design point output can be used
+# as an objective too (its sense has to be given)
+PARETO_METRICS = {'Efficiency': 'max', 'tip_mach': 'min', 'thrust_margin': 'max', 'blade_mass_proxy': 'min',
+                  'energy': 'min'}
 
-class VehicleDurationOptimization:
-    def __init__(self):
-        pass
+
+class VehicleMissionOptimization:
+    """Compares candidate propellers on a vehicle mission: a vehicle (parabolic drag polar, mass, battery energy) flies
+    a speed schedule in level flight, each candidate's shaft power comes from its operating map (either the fast
+    solver, evaluated for all candidates together, or its XROTOR sweep results), and the mission is integrated for all
+    candidates at once.  Subclasses set the objective that's maximized."""
+    objective = None
+
+    def __init__(self, props: list, mass: float, battery_wh: float, cd0: float, k_induced: float, s_ref: float,
+                 n_props: int = 1, drivetrain_eff: float = 1.0, rho: float = None):
+        """
+        :param props: candidate Propeller objects or names / folder paths
+        :param mass: vehicle mass (kg)
+        :param battery_wh: usable battery energy (W-h)
+        :param cd0: zero-lift drag coefficient, CD = cd0 + k_induced * CL^2
+        :param k_induced: induced drag factor
+        :param s_ref: reference area of the drag polar (m^2)
+        :param n_props: number of propellers sharing the thrust
+        :param drivetrain_eff: motor / controller efficiency between battery and shaft power
+        :param rho: air density (kg/m^3), defaults to the first candidate's XROTOR design density
+        """
+        self.props = [p if isinstance(p, Propeller) else Propeller(p, verbose=False) for p in props]
+        if len(self.props) == 0:
+            raise Error('Need at least 1 candidate propeller')
+        self.mass, self.battery_wh, self.cd0, self.k_induced, self.s_ref = mass, battery_wh, cd0, k_induced, s_ref
+        self.n_props, self.drivetrain_eff = n_props, drivetrain_eff
+        self.rho = self.props[0].xrotor_d['Rho'] if rho is None else rho
+        self._op_maps = {}  # tuple(map velocities) -> compute_operating_maps() of all the candidates
+
+    def thrust_required(self, speeds):
+        """
+        :return: np.array of the thrust each propeller has to produce at each speed (N)
+        """
+        return level_flight_thrust(velo_vals=speeds, mass=self.mass, cd0=self.cd0, k_induced=self.k_induced,
+                                   s_ref=self.s_ref, rho=self.rho) / self.n_props
+
+    def shaft_power(self, speeds, source: str = 'fast', map_speeds=None):
+        """
+        :param source: "fast" (blade-element / momentum operating maps of all candidates in one computation) or
+            "oper_data" (each candidate's XROTOR sweep results)
+        :param map_speeds: velocities of the fast operating maps, defaults to 12 values spanning the speeds
+        :return: np.array of shape (n_candidates, n_speeds) of the shaft power per propeller (W), NaN where a
+            candidate can't produce the thrust
+        """
+        speeds = np.atleast_1d(np.asarray(speeds, dtype=float))
+        thrusts = self.thrust_required(speeds)
+        if source == 'oper_data':
+            return np.array([oper_data_power_at_thrust(oper_data=prop.oper_data, velo_vals=speeds,
+                                                       thrust_vals=thrusts) for prop in self.props])
+        if source != 'fast':
+            raise Error('"source" must be either "fast" or "oper_data"')
+
+        if map_speeds is None:
+            map_speeds = np.linspace(np.min(speeds), np.max(speeds), 12) if np.ptp(speeds) > 0 else \
+                np.array([0.95, 1.05]) * speeds[0]
+        map_speeds = tuple(np.sort(np.asarray(map_speeds, dtype=float)))
+        if map_speeds not in self._op_maps:
+            self._op_maps[map_speeds] = compute_operating_maps(props=self.props, velo_vals=map_speeds)
+        return map_power_at_thrust(op_map=self._op_maps[map_speeds], map_velos=map_speeds, velo_vals=speeds,
+                                   thrust_vals=thrusts)
+
+    def evaluate(self, speeds, energy_fractions=None, source: str = 'fast', map_speeds=None):
+        """
+        Integrates the mission of a speed schedule for every candidate, see funcs.integrate_mission().
+
+        :param speeds: velocity of each schedule segment (m/s)
+        :param energy_fractions: fraction of the battery energy used by each segment, defaults to an even split
+        :return: dict of np.arrays (one value per candidate) with keys "range(m)" and "endurance(s)"
+        """
+        power = self.n_props * self.shaft_power(speeds=speeds, source=source, map_speeds=map_speeds) / \
+            self.drivetrain_eff
+        return integrate_mission(power=power, velo_vals=speeds, energy=self.battery_wh * 3600,
+                                 energy_fractions=energy_fractions)
+
+    def optimize(self, speeds=None, source: str = 'fast', verbose: bool = True):
+        """
+        Flies every candidate at every (constant) speed and picks the combination that maximizes the objective.
+
+        :param speeds: cruise speeds to consider, defaults to 25 values over 0.5 - 1.5x the candidates' mean design
+            speed
+        :return: (Propeller, speed, objective value) of the best combination
+        """
+        if speeds is None:
+            speeds = np.linspace(0.5, 1.5, 25) * np.mean([prop.design_speed_mps for prop in self.props])
+        speeds = np.atleast_1d(np.asarray(speeds, dtype=float))
+        power = self.n_props * self.shaft_power(speeds=speeds, source=source) / self.drivetrain_eff
+        res = integrate_mission(power=power[..., None], velo_vals=speeds[:, None], energy=self.battery_wh * 3600,
+                                energy_fractions=[1.0])
+        vals = res[self.objective]
+        if not np.any(np.isfinite(vals)):
+            raise Error('None of the {} candidate propellers can fly any of the speeds'.format(len(self.props)))
+        p, s = np.unravel_index(np.nanargmax(vals), vals.shape)
+        if verbose:
+            Info('Best of {} candidates: "{}" at {:.4g} m/s ({} = {:.5g})'
+                 .format(len(self.props), self.props[p].name, speeds[s], self.objective, vals[p, s]))
+        return self.props[p], speeds[s], vals[p, s]
+
+
+class VehicleRangeOptimization(VehicleMissionOptimization):
+    """Picks the candidate propeller and cruise speed that give a vehicle the longest range, see
+    VehicleMissionOptimization"""
+    objective = 'range(m)'
+
+
+class VehicleDurationOptimization(VehicleMissionOptimization):
+    """Picks the candidate propeller and loiter speed that give a vehicle the longest endurance, see
+    VehicleMissionOptimization"""
+    objective = 'endurance(s)'
 
 
 class DutyCycleDesignOptimization:
     """Optimizes a given Propeller() design by making adjustments to design parameters (CL and either rpm or adv)
     and finding a configuration that minimizes energy used across the input duty cycle"""
-    def __init__(self, base_prop: Propeller, verbose: bool = True):
+    def __init__(self, base_prop: Propeller, verbose: bool = True, max_loaded_props: int = 32):
         self.base_prop = base_prop
         self.save_dir = os.path.join(self.base_prop.save_folder, 'optimization')
-        self.propellers = {}
+        self.propellers = CandidatePropellers(max_loaded=max_loaded_props)
+        self.failed = {}  # key -> error of the candidates XROTOR could not design
+        self.failed_promotions = {}  # (key, vorform) -> error of the candidates that failed a higher fidelity design
         self.duty_cycle_points = []
         self.var2 = None
+        self.base_vorform = (self.base_prop.design_vorform or 'pot').lower()
+        # (design fingerprint, duty cycle) -> evaluated duty cycle results, so each candidate is only solved once
+        self._duty_cycle_cache = {}
+        self.pareto = None  # ParetoFront of the candidates once pareto_front() is called, updated as designs finish
+        self.journal = OptimizationJournal(fpath=os.path.join(self.save_dir, 'journal.jsonl'))
+        # journal entries of results found by scanning the folders of an optimization without a journal, only written
+        # once designs get created, so that just loading an optimization doesn't write anything
+        self._journal_backfill = []
 
-        # need to attempt to load any existing results here
-        if os.path.exists(self.save_dir):
+        # need to attempt to load any existing results here, from the journal if there is one
+        if os.path.exists(self.journal.fpath):
+            self._load_journal(verbose=verbose)
+        elif os.path.exists(self.save_dir):
             prop_fpaths = [os.path.join(self.save_dir, f) for f in os.listdir(self.save_dir) if
                            os.path.isdir(os.path.join(self.save_dir, f))]
             if verbose:
@@ -41,16 +170,62 @@ class DutyCycleDesignOptimization:
             for fpath in prop_fpaths:
                 prop = Propeller(fpath, verbose=False)
                 name = os.path.split(fpath)[1]
-                vel, cl, val2 = name.split('_', 2)
+                vel, cl, val2 = name.split('_')[:3]
                 vel = float(vel.replace('vel-', ''))
                 cl = float(cl.replace('cl-', ''))
                 var2, val2 = val2.split('-')
                 val2 = float(val2)
                 self.var2 = 'design_{}'.format(var2)
-                self.propellers[(vel, cl, val2)] = prop
+                key = (vel, cl, val2)
+                if key not in self.propellers or self._fidelity_rank(prop.design_vorform) >= \
+                        self._fidelity_rank(self.propellers.vorform(key)):
+                    self.propellers[key] = prop
+                self._journal_backfill.append(self._journal_entry(key=(vel, cl, val2), name=name, prop=prop))
             if verbose:
                 Info('Done!', indent_level=1)
 
+    def _load_journal(self, verbose: bool = True):
+        entries = self.journal.load()
+        # lowest fidelity first, so each candidate ends up with its highest fidelity design
+        failures = []
+        for (key, vorform), entry in sorted(entries.items(), key=lambda item: self._fidelity_rank(item[0][1])):
+            self.var2 = entry['var2']
+            vorform = self.base_vorform if vorform is None else vorform
+            if entry['status'] == 'done':
+                self.propellers.add_folder(key, os.path.join(self.save_dir, entry['name']),
+                                           fingerprint=entry['fingerprint'], metrics=entry['metrics'], vorform=vorform)
+            else:
+                failures.append((key, vorform, entry['error']))
+        for key, vorform, err_str in failures:
+            if key in self.propellers:
+                self.failed_promotions[key, vorform] = err_str
+            else:
+                self.failed[key] = err_str
+        if verbose:
+            Info('Loaded the optimization journal of "{}" ({} designs, {} failed)'
+                 .format(self.base_prop.name, len(self.propellers), len(self.failed)))
+
+    def _journal_entry(self, key: tuple, name: str, prop: Propeller = None, err_str: str = None,
+                       time_s: float = None):
+        entry = {'key': list(key), 'name': name, 'var2': self.var2, 'vorform': self._name_vorform(name),
+                 'status': 'done' if err_str is None else 'failed', 'error': err_str, 'time_s': time_s,
+                 'timestamp': time.time(), 'fingerprint': None, 'metrics': {}}
+        if prop is not None:
+            entry['fingerprint'] = prop.design_fingerprint
+            op_dict = prop.xrotor_op_dict if prop.xrotor_op_dict is not None else {}
+            entry['metrics'] = {k: op_dict.get(k) for k in JOURNAL_METRICS}
+        return entry
+
+    def _fidelity_rank(self, vorform: str):
+        # position of a vortex formulation in VORFORM_FIDELITY, None meaning the base design's
+        vorform = self.base_vorform if vorform is None else vorform.lower()
+        return VORFORM_FIDELITY.index(vorform) if vorform in VORFORM_FIDELITY else 0
+
+    def _name_vorform(self, name: str):
+        # candidates designed with another vorform than the base design's have it appended to their name
+        tokens = name.split('_')
+        return tokens[3] if len(tokens) > 3 else self.base_vorform
+
     @property
     def var2base(self):
         return self.var2.replace('design_', '')
@@ -69,15 +244,30 @@ class DutyCycleDesignOptimization:
 
     def add_duty_cycle_point(self, velocity: float = None, thrust: float = None, duration_percent: float = None,
                              duration_sec: float = None):
+        if velocity is None or thrust is None:
+            raise Error('Duty cycle points need both a "velocity" and a "thrust"')
+        if duration_percent is None and duration_sec is None:
+            raise Error('Duty cycle points need either a "duration_percent" or a "duration_sec"')
         point = DutyCyclePoint(velocity=velocity, thrust=thrust, duration_percent=duration_percent, duration_sec=duration_sec)
         self.duty_cycle_points.append(point)
 
     def create_prop_grid(self, vels: list = None, cl_consts: list = None, advs: list = None, rpms: list = None,
-                         append: bool = True):
+                         append: bool = True, workers: int = 4, cascade: list = None, verbose: bool = True):
+        """
+        :param cascade: multi-fidelity policy, list of (vorform, top_k) stages (see settings.DEFAULT_FIDELITY_CASCADE):
+            the grid is designed with the first stage's vorform, then promote_candidates() re-designs the best ones
+            with the higher fidelity ones.  Defaults to designing everything with the base design's vorform.
+        """
+        if cascade is not None:
+            cascade = validate_fidelity_cascade(cascade)
         if not append:
             # delete the optimization folder and its contents and remake it
             if os.path.exists(self.save_dir):
                 shutil.rmtree(self.save_dir)
+            self.propellers, self.failed = CandidatePropellers(max_loaded=self.propellers.max_loaded), {}
+            self.failed_promotions = {}
+            if self.pareto is not None:
+                self.pareto = ParetoFront(objectives=self.pareto.objectives)
 
         if not os.path.exists(self.save_dir):
             os.mkdir(self.save_dir)
@@ -116,55 +306,162 @@ class DutyCycleDesignOptimization:
             base_val2 = getattr(self.base_prop, sweep_var2)  # either adv or rpm
             var2_sweep_vals = [v * base_val2 for v in [0.7, 0.85, 1.0, 1.15, 1.3]]
 
-        # run the sweeps
-        total_cnt = len(vel_sweep_vals) * len(cl_sweep_vals) * len(var2_sweep_vals)
-        cnt = 0
-        for v, vel in enumerate(vel_sweep_vals):
-            for i, cl in enumerate(cl_sweep_vals):
-                for k, val2 in enumerate(var2_sweep_vals):
-                    cnt += 1
-                    Info('Creating propeller # {} / {}'.format(cnt, total_cnt))
-                    opt_name = 'vel-{:.2f}_cl-{:.2f}_{}-{:.3f}'.format(vel, cl, self.var2.replace('design_', ''), val2)
-                    adv_rpm_kwarg = {self.var2: val2}
-                    try:
-                        prop = create_propeller(name=opt_name,
-                                             nblades=self.base_prop.nblades,
-                                             radius=self.base_prop.radius,
-                                             hub_radius=self.base_prop.hub_radius,
-                                             hub_wake_disp_br=self.base_prop.hub_wake_disp_br,
-                                             design_speed_mps=vel,
-                                             design_cl={'const': cl},
-                                             design_atmo_props=self.base_prop.design_atmo_props,
-                                             design_vorform=self.base_prop.design_vorform,
-                                             station_params=self.base_prop.station_params,
-                                             **adv_rpm_kwarg,
-                                             design_thrust=self.base_prop.design_thrust,
-                                             design_power=self.base_prop.design_power,
-                                             n_radial=self.base_prop.n_radial,
-                                             verbose=False,
-                                             show_station_fit_plots=False,
-                                             plot_after=False)
-                        shutil.move(prop.save_folder, self.save_dir)
-                        vel = float('{:.2f}'.format(vel))
-                        cl = float('{:.2f}'.format(cl))
-                        val2 = float('{:.3f}'.format(val2))
-                        self.propellers[(vel, cl, val2)] = prop
-                    except Error:
-                        vel = float('{:.2f}'.format(vel))
-                        cl = float('{:.2f}'.format(cl))
-                        val2 = float('{:.3f}'.format(val2))
-                        Warning('XROTOR did not converge for vel-{}_cl-{}_{}-{}'.format(vel, cl, self.var2base, val2))
-                        hanging_folder = os.path.join(get_prop_db(), opt_name)
-                        if os.path.exists(hanging_folder):
-                            shutil.rmtree(hanging_folder)
+        # gather up the grid of designs, then create them in parallel
+        vorform = None if cascade is None else cascade[0][0]
+        specs = [self._design_spec(vel=vel, cl=cl, val2=val2, vorform=vorform) for vel in vel_sweep_vals
+                 for cl in cl_sweep_vals for val2 in var2_sweep_vals]
+        self._create_designs(specs=specs, workers=workers, verbose=verbose)
+        if cascade is not None:
+            self.promote_candidates(cascade=cascade, workers=workers, verbose=verbose)
+
+    @property
+    def doe_state_fpath(self):
+        return os.path.join(self.save_dir, 'doe_sampler.json')
+
+    def create_prop_samples(self, n_samples: int, method: str = 'sobol', vel_bounds: tuple = None,
+                            cl_bounds: tuple = None, adv_bounds: tuple = None, rpm_bounds: tuple = None, seed: int = 0,
+                            workers: int = 4, cascade: list = None, verbose: bool = True):
+        """
+        Space-filling alternative to create_prop_grid(): draws n_samples designs over the (vel, CL, adv or rpm) bounds
+        and streams them into the parallel creation as the workers free up.  The sampler settings and number of
+        samples drawn are kept in doe_state_fpath, so calling again with the same settings continues the sequence
+        (a Sobol sequence is simply fast-forwarded, a Latin hypercube adds another independent hypercube of
+        n_samples) and designs that already exist are never recomputed.
+
+        :param method: "sobol" (scrambled Sobol sequence, best kept to powers of 2 samples) or "lhs" (Latin hypercube)
+        :param seed: scrambling / permutation seed of the sequence
+        :param cascade: multi-fidelity policy, see create_prop_grid()
+        :return: (list of created keys, list of failed keys) of the samples
+        """
+        if method not in ['sobol', 'lhs']:
+            raise Error('"method" must be either "sobol" or "lhs"')
+        if cascade is not None:
+            cascade = validate_fidelity_cascade(cascade)
+        if not os.path.exists(self.save_dir):
+            os.mkdir(self.save_dir)
+
+        lo, hi = self._design_bounds(vel_bounds=vel_bounds, cl_bounds=cl_bounds, adv_bounds=adv_bounds,
+                                     rpm_bounds=rpm_bounds)
+        state = {'method': method, 'seed': seed, 'var2': self.var2, 'lower': lo.tolist(), 'upper': hi.tolist(),
+                 'n_drawn': 0}
+        if os.path.exists(self.doe_state_fpath):
+            with open(self.doe_state_fpath, 'r') as f:
+                old_state = json.load(f)
+            if all([old_state[k] == state[k] for k in state if k != 'n_drawn']):
+                state['n_drawn'] = old_state['n_drawn']
+            elif verbose:
+                Warning('Sampler settings differ from the ones in "{}", starting a new sequence'
+                        .format(self.doe_state_fpath))
+
+        if method == 'sobol':
+            sampler = qmc.Sobol(d=3, scramble=True, seed=seed)
+            if state['n_drawn'] > 0:
+                sampler.fast_forward(state['n_drawn'])
+        else:
+            sampler = qmc.LatinHypercube(d=3, seed=np.random.default_rng([seed, state['n_drawn']]))
+        units = sampler.random(n_samples)
+
+        def iter_specs():
+            for u in units:
+                spec = self._design_spec(*(lo + u * (hi - lo)), vorform=None if cascade is None else cascade[0][0])
+                if self._spec_key(spec) not in self.propellers:
+                    yield spec
+
+        if verbose:
+            Info('Creating samples # {} - {} of the "{}" sequence...'
+                 .format(state['n_drawn'] + 1, state['n_drawn'] + n_samples, method))
+        created, failed = self._create_designs(specs=iter_specs(), workers=workers, verbose=verbose)
+
+        # only advance the sequence once the whole batch is done, an interrupted batch is redrawn next time
+        state['n_drawn'] += n_samples
+        with open(self.doe_state_fpath, 'w') as f:
+            json.dump(state, f, indent=1)
+        if cascade is not None:
+            self.promote_candidates(cascade=cascade, workers=workers, verbose=verbose)
+        return created, failed
+
+    def _design_spec(self, vel: float, cl: float, val2: float, vorform: str = None):
+        # create_propeller() kwargs of one candidate, the base design with the design variables (and vorform) swapped in
+        opt_name = 'vel-{:.2f}_cl-{:.2f}_{}-{:.3f}'.format(vel, cl, self.var2base, val2)
+        vorform = self.base_vorform if vorform is None else vorform.lower()
+        if vorform != self.base_vorform:
+            opt_name += '_{}'.format(vorform)
+        return {'name': opt_name,
+                'nblades': self.base_prop.nblades,
+                'radius': self.base_prop.radius,
+                'hub_radius': self.base_prop.hub_radius,
+                'hub_wake_disp_br': self.base_prop.hub_wake_disp_br,
+                'design_speed_mps': vel,
+                'design_cl': {'const': cl},
+                'design_atmo_props': self.base_prop.design_atmo_props,
+                'design_vorform': vorform,
+                'station_params': self.base_prop.station_params,
+                self.var2: val2,
+                'design_thrust': self.base_prop.design_thrust,
+                'design_power': self.base_prop.design_power,
+                'n_radial': self.base_prop.n_radial}
+
+    @staticmethod
+    def _spec_key(spec: dict):
+        # the (vel, cl, val2) key of self.propellers, rounded the same way as the candidate names
+        vel, cl, val2 = [float(s.split('-', 1)[1]) for s in spec['name'].split('_')[:3]]
+        return vel, cl, val2
+
+    def _create_designs(self, specs, workers: int = 4, verbose: bool = True, retry_failed: bool = False):
+        """
+        Creates the candidate designs in parallel and adds the successful ones to self.propellers, "specs" may be any
+        iterable (e.g. a generator), it is streamed into funcs.iter_create_propellers().  Candidates that already
+        exist at the same or a higher fidelity (vorform) or that are known to fail (unless retry_failed) are skipped,
+        and every result is added to the journal.
+
+        :return: (list of created keys, list of failed keys)
+        """
+        journal = self.journal
+        for entry in self._journal_backfill:
+            journal.append(entry)
+        self._journal_backfill = []
+        start_times = {}
+
+        def iter_todo():
+            for spec in specs:
+                key, rank = self._spec_key(spec), self._fidelity_rank(spec['design_vorform'])
+                known_failed = key in self.failed or (key, self._name_vorform(spec['name'])) in self.failed_promotions
+                if (key in self.propellers and self._fidelity_rank(self.propellers.vorform(key)) >= rank) or \
+                        (known_failed and not retry_failed) or spec['name'] in start_times:
+                    continue
+                start_times[spec['name']] = time.time()  # specs are only pulled as they're submitted
+                yield spec
+
+        created, failed = [], []
+        for name, prop, err_str in iter_create_propellers(specs=iter_todo(), workers=workers, save_dir=self.save_dir):
+            key = self._spec_key({'name': name})
+            if err_str is None:
+                self.propellers[key] = prop
+                self.failed.pop(key, None)
+                self.failed_promotions.pop((key, self._name_vorform(name)), None)
+                created.append(key)
+                if self.pareto is not None and self.pareto.add(key, self.candidate_metrics(key, self.pareto.objectives)):
+                    if verbose:
+                        Info('{} joined the Pareto front ({} designs)'.format(name, len(self.pareto)), indent_level=1)
+            else:
+                Warning('XROTOR did not converge for {}\n{}'.format(name, err_str))
+                if key in self.propellers:  # keeps its lower fidelity design
+                    self.failed_promotions[key, self._name_vorform(name)] = err_str
+                else:
+                    self.failed[key] = err_str
+                failed.append(key)
+            journal.append(self._journal_entry(key=key, name=name, prop=prop, err_str=err_str,
+                                               time_s=time.time() - start_times[name]))
+        if verbose:
+            Info('Created {} / {} propellers'.format(len(created), len(created) + len(failed)))
+        return created, failed
 
     def thrust_eff(self, vel_val, cl_val, val2_val):
-        prop = self.propellers[vel_val, cl_val, val2_val]
-        return prop.xrotor_op_dict['thrust(N)'] / prop.xrotor_op_dict['power(W)']
+        key = (vel_val, cl_val, val2_val)
+        return self.propellers.metric(key, 'thrust(N)') / self.propellers.metric(key, 'power(W)')
 
     def efficiency(self, vel_val, cl_val, val2_val):
-        prop = self.propellers[vel_val, cl_val, val2_val]
-        return prop.xrotor_op_dict['Efficiency']
+        return self.propellers.metric((vel_val, cl_val, val2_val), 'Efficiency')
 
     def var1_val(self, vel_val, cl_val, val2_val):
         prop = self.propellers[vel_val, cl_val, val2_val]
@@ -174,12 +471,375 @@ class DutyCycleDesignOptimization:
         prop = self.propellers[vel_val, cl_val, val2_val]
         return getattr(prop, self.var2)
 
-    def plot_results(self, normalized: bool = True):
+    @property
+    def duty_cycle_weights(self):
+        """
+        Duration of each duty cycle point, in seconds if every point has a duration_sec (energies are then in J),
+        otherwise as fractions of the cycle from duration_percent (energies are then cycle-averaged powers in W).
+        """
+        if len(self.duty_cycle_points) == 0:
+            raise Error('No duty cycle points have been added, use add_duty_cycle_point()')
+        if all([pt.duration_sec is not None for pt in self.duty_cycle_points]):
+            return np.array([pt.duration_sec for pt in self.duty_cycle_points], dtype=float)
+        if all([pt.duration_percent is not None for pt in self.duty_cycle_points]):
+            return np.array([pt.duration_percent for pt in self.duty_cycle_points], dtype=float) / 100
+        raise Error('Duty cycle points must all be given either as "duration_sec" or as "duration_percent"')
+
+    def _duty_cycle_cache_key(self, key: tuple):
+        fingerprint = self.propellers.fingerprint(key)
+        design_key = fingerprint if fingerprint is not None else self.propellers.folder(key)
+        return design_key, tuple([(pt.velocity, pt.thrust, pt.duration_percent, pt.duration_sec)
+                                  for pt in self.duty_cycle_points])
+
+    def evaluate_duty_cycle(self, keys: list = None):
+        """
+        Evaluates the power each candidate propeller needs at every duty cycle (velocity, thrust) point with the fast
+        solver (funcs.trim_operating_points(), the un-cached candidates in batches of self.propellers.max_loaded) and
+        the energy the cycle takes, weighting each point by its duration.
+
+        :param keys: (vel, cl, val2) keys of self.propellers to evaluate, defaults to all of them
+        :return: dict of {key: {'rpm': np.array, 'power(W)': np.array, 'Efficiency': np.array, 'energy': float}},
+            energy is NaN if any duty cycle point could not be reached
+        """
+        keys = list(self.propellers) if keys is None else keys
+        weights = self.duty_cycle_weights
+        todo = [key for key in keys if self._duty_cycle_cache_key(key) not in self._duty_cycle_cache]
+
+        outputs = ['rpm', 'power(W)', 'Efficiency']
+        batch_size = max(self.propellers.max_loaded, 1)
+        for start in range(0, len(todo), batch_size):
+            batch = todo[start:start + batch_size]
+            res = trim_operating_points(props=[self.propellers[key] for key in batch],
+                                        velo_vals=[pt.velocity for pt in self.duty_cycle_points],
+                                        thrust_vals=[pt.thrust for pt in self.duty_cycle_points], outputs=outputs)
+            for key, vals in zip(batch, res):
+                result = {output: vals[:, i] for i, output in enumerate(outputs)}
+                result['energy'] = float(np.sum(result['power(W)'] * weights))
+                self._duty_cycle_cache[self._duty_cycle_cache_key(key)] = result
+
+        return {key: self._duty_cycle_cache[self._duty_cycle_cache_key(key)] for key in keys}
+
+    def energy(self, vel_val, cl_val, val2_val):
+        return self.evaluate_duty_cycle(keys=[(vel_val, cl_val, val2_val)])[vel_val, cl_val, val2_val]['energy']
+
+    def find_min_energy_design(self, verbose: bool = True, vorform: str = None):
+        """
+        :param vorform: only consider the candidates designed with this vortex formulation, defaults to all of them
+        :return: (key, Propeller, energy) of the candidate that uses the least energy across the duty cycle
+        """
+        keys = None
+        if vorform is not None:
+            keys = [key for key in self.propellers if self.propellers.vorform(key) == vorform.lower()]
+        results = self.evaluate_duty_cycle(keys=keys)
+        feasible = {key: res['energy'] for key, res in results.items() if np.isfinite(res['energy'])}
+        if len(feasible) == 0:
+            raise Error('None of the {} candidate propellers can meet every duty cycle point'.format(len(results)))
+        best = min(feasible, key=feasible.get)
+        if verbose:
+            Info('Minimum energy design of {} / {} feasible candidates: vel-{}_cl-{}_{}-{} (energy = {:.4g})'
+                 .format(len(feasible), len(results), *best[:2], self.var2base, best[2], feasible[best]))
+        return best, self.propellers[best], feasible[best]
+
+    def optimize(self, vels: list = None, cl_consts: list = None, advs: list = None, rpms: list = None,
+                 workers: int = 4, cascade: list = None, verbose: bool = True):
+        """
+        Creates (or adds to) the grid of candidate designs, see create_prop_grid(), and returns the one that minimizes
+        the duty cycle energy, see find_min_energy_design().
+
+        :param cascade: multi-fidelity policy, see create_prop_grid(), the answer is then picked among the candidates
+            of its last (highest fidelity) stage
+        """
+        _ = self.duty_cycle_weights  # check the duty cycle before spending time on XROTOR designs
+        if cascade is not None:
+            cascade = validate_fidelity_cascade(cascade)
+        self.create_prop_grid(vels=vels, cl_consts=cl_consts, advs=advs, rpms=rpms, append=True, workers=workers,
+                              cascade=cascade, verbose=verbose)
+        return self.find_min_energy_design(verbose=verbose, vorform=None if cascade is None else cascade[-1][0])
+
+    def promote_candidates(self, cascade: list, objective: str = None, keys: list = None, workers: int = 4,
+                           verbose: bool = True):
+        """
+        Multi-fidelity screening: ranks the candidates by the objective and re-designs the top_k of them with each
+        higher fidelity stage of the cascade in turn (each stage ranking the ones promoted by the stage before it).
+        The first stage's top_k is ignored, it's the fidelity the candidates were screened with.  A promoted design
+        replaces the lower fidelity one in self.propellers (and its metrics), candidates that fail a promotion keep
+        their lower fidelity design and drop out of the later stages.
+
+        :param cascade: list of (vorform, top_k) stages, see settings.DEFAULT_FIDELITY_CASCADE
+        :param objective: "energy" (duty cycle, minimized) or "efficiency" (design point, maximized), defaults to
+            "energy" if any duty cycle points were added
+        :param keys: candidates to screen, defaults to all of them
+        :return: dict of {vorform: list of the keys promoted to it}
+        """
+        cascade = validate_fidelity_cascade(cascade)
+        if objective is None:
+            objective = 'energy' if len(self.duty_cycle_points) > 0 else 'efficiency'
+        if objective not in ['energy', 'efficiency']:
+            raise Error('"objective" must be either "energy" or "efficiency"')
+
+        def ranked(pool: list):
+            # best first, by each candidate's current (highest fidelity) results, infeasible ones dropped
+            if objective == 'energy':
+                vals = {key: res['energy'] for key, res in self.evaluate_duty_cycle(keys=pool).items()}
+            else:
+                vals = {key: -self.efficiency(*key) for key in pool}
+            return sorted([key for key in pool if np.isfinite(vals[key])], key=vals.get)
+
+        pool = list(self.propellers) if keys is None else [key for key in keys if key in self.propellers]
+        promoted = {}
+        for vorform, top_k in cascade[1:]:
+            pool = ranked(pool)[:top_k]
+            specs = []
+            for key in pool:
+                # the screened design's own (unrounded) variables, under the same key
+                prop = self.propellers[key]
+                vals = [prop.design_speed_mps, prop.design_cl.get('const'), getattr(prop, self.var2)]
+                spec = self._design_spec(*[k if v is None else v for v, k in zip(vals, key)], vorform=vorform)
+                spec['name'] = self._design_spec(*key, vorform=vorform)['name']
+                specs.append(spec)
+            if verbose:
+                Info('Promoting the best {} / {} candidates to "{}"'.format(len(pool), len(self.propellers), vorform))
+            self._create_designs(specs=specs, workers=workers, verbose=verbose)
+            pool = [key for key in pool if self.propellers.vorform(key) == vorform]
+            promoted[vorform] = pool
+        return promoted
+
+    @property
+    def required_thrust(self):
+        # thrust the candidates' margins are measured against, the highest duty cycle thrust or else the base design's
+        if len(self.duty_cycle_points) > 0:
+            return max([pt.thrust for pt in self.duty_cycle_points])
+        return self.base_prop.xrotor_op_dict['thrust(N)']
+
+    def candidate_metrics(self, key: tuple, names: list):
+        """
+        :param names: metric names, see PARETO_METRICS, or any scalar XROTOR design point output
+        :return: dict of {name: value} of the candidate "key", "energy" is NaN if it can't fly the duty cycle
+        """
+        metrics = {}
+        for name in names:
+            if name == 'energy':
+                val = self.evaluate_duty_cycle(keys=[key])[key]['energy']
+            elif name == 'tip_mach':
+                val = self.propellers.metric(key, name, func=lambda prop: calc_tip_mach(
+                    rpm=prop.xrotor_op_dict['rpm'], radius=prop.radius, velo=prop.xrotor_op_dict['speed(m/s)'],
+                    vsound=prop.xrotor_op_dict['Vsound(m/s)']))
+            elif name == 'thrust_margin':
+                val = self.propellers.metric(key, 'thrust(N)') / self.required_thrust - 1
+            elif name == 'blade_mass_proxy':
+                val = self.propellers.metric(key, name, func=lambda prop: calc_blade_mass_proxy(
+                    r_R=prop.blade_data['r/R'], c_R=prop.blade_data['CH'], radius=prop.radius,
+                    nblades=prop.nblades))
+            else:
+                val = self.propellers.metric(key, name)
+            metrics[name] = float(val)
+        return metrics
+
+    def pareto_front(self, objectives=('Efficiency', 'tip_mach'), verbose: bool = True):
+        """
+        Multi-objective alternative to find_min_energy_design(): the set of candidates that no other candidate beats
+        in every one of the objectives.  The front is kept on self.pareto, and from then on every design that
+        _create_designs() finishes (create_prop_grid(), create_prop_samples(), ...) is added to it as it finishes.
+
+        :param objectives: metric names (see PARETO_METRICS for their default senses), or a dict of
+            {metric name: "max" or "min"}
+        :return: ParetoFront
+        """
+        if not isinstance(objectives, dict):
+            unknown = [name for name in objectives if name not in PARETO_METRICS]
+            if len(unknown) > 0:
+                raise Error('Give the objectives as a dict of {{name: "max" or "min"}} to use metrics without a '
+                            'default sense ({})'.format(unknown))
+            objectives = {name: PARETO_METRICS[name] for name in objectives}
+        if 'energy' in objectives:
+            self.evaluate_duty_cycle()  # solved in batches up front
+
+        self.pareto = ParetoFront(objectives=objectives)
+        self.pareto.update({key: self.candidate_metrics(key, objectives) for key in self.propellers})
+        if verbose:
+            Info('Pareto front of {} candidates over {}: {} designs'
+                 .format(len(self.propellers), list(objectives), len(self.pareto)))
+        return self.pareto
+
+    def plot_pareto_front(self, x_param: str = None, y_param: str = None, fig=None):
+        """
+        Plots every candidate in two of the Pareto front objectives, with the front designs highlighted.
+
+        :param x_param: defaults to the first objective of self.pareto
+        :param y_param: defaults to the second objective of self.pareto
+        """
+        if self.pareto is None:
+            raise Error('No Pareto front yet, use pareto_front()')
+        objectives = list(self.pareto.objectives)
+        x_param = objectives[0] if x_param is None else x_param
+        y_param = objectives[1 % len(objectives)] if y_param is None else y_param
+        for param in [x_param, y_param]:
+            if param not in self.pareto.objectives:
+                raise Error('"{}" is not one of the Pareto front objectives ({})'.format(param, objectives))
+
+        if fig is None:
+            fig = plt.figure(figsize=[10, 8])
+            ax = fig.add_subplot(111)
+        else:
+            ax = fig.axes[0]
+
+        ax.grid(True)
+        ax.set_title('{} Pareto Front ({} / {} designs)'.format(self.base_prop.name, len(self.pareto),
+                                                                len(self.pareto.values)))
+        ax.set_xlabel('{} ({})'.format(x_param, self.pareto.objectives[x_param]))
+        ax.set_ylabel('{} ({})'.format(y_param, self.pareto.objectives[y_param]))
+
+        all_vals = list(self.pareto.values.values())
+        ax.plot([v[x_param] for v in all_vals], [v[y_param] for v in all_vals], 'o', color='silver',
+                label='candidates')
+        front_vals = sorted(self.pareto.front.values(), key=lambda v: v[x_param])
+        ax.plot([v[x_param] for v in front_vals], [v[y_param] for v in front_vals], 'o', color='tab:red',
+                label='Pareto front')
+        ax.legend(loc='best')
+        return fig
+
+    def _design_bounds(self, vel_bounds: tuple = None, cl_bounds: tuple = None, adv_bounds: tuple = None,
+                       rpm_bounds: tuple = None):
+        # (lower, upper) arrays of the (vel, cl, val2) design variables, defaulting to 0.7 - 1.3x the base design
+        if adv_bounds is not None and rpm_bounds is not None:
+            raise Error('Cannot give both "adv_bounds" and "rpm_bounds"')
+        if adv_bounds is not None:
+            self.var2 = 'design_adv'
+        elif rpm_bounds is not None:
+            self.var2 = 'design_rpm'
+        elif self.var2 is None:
+            self.var2 = 'design_adv' if self.base_prop.design_adv is not None else 'design_rpm'
+        val2_bounds = adv_bounds if adv_bounds is not None else rpm_bounds
+
+        base_cl_val = self.base_prop.design_cl
+        if cl_bounds is None and 'const' not in base_cl_val:
+            raise Error('Optimizations only currently implemented for "const" cl')
+        bounds = []
+        for bnds, base_val in zip([vel_bounds, cl_bounds, val2_bounds],
+                                  [self.base_prop.design_speed_mps, base_cl_val.get('const'),
+                                   getattr(self.base_prop, self.var2)]):
+            if bnds is None:
+                if base_val is None:
+                    raise Error('Base propeller has no "{}" to default the search bounds from'.format(self.var2))
+                bnds = (0.7 * base_val, 1.3 * base_val)
+            bounds.append(bnds)
+        lo, hi = np.array(bounds, dtype=float).T
+        return lo, hi
+
+    def surrogate_search(self, objective: str = None, vel_bounds: tuple = None, cl_bounds: tuple = None,
+                         adv_bounds: tuple = None, rpm_bounds: tuple = None, n_init: int = 8, batch_size: int = 4,
+                         max_evals: int = 40, tol: float = 1e-3, patience: int = 2, n_pool: int = 2048,
+                         seed: int = None, workers: int = 4, verbose: bool = True):
+        """
+        Sequential surrogate-based search over the same design variables as create_prop_grid() (vel, CL and adv or
+        rpm).  After a Latin hypercube of n_init designs, a Gaussian-process model of the objective proposes batches
+        of batch_size designs by expected improvement (each one conditioned on the model's prediction of the ones
+        before it), which are created in parallel.  Candidates already in self.propellers are reused.
+
+        :param objective: "energy" (duty cycle, minimized) or "efficiency" (design point, maximized), defaults to
+            "energy" if any duty cycle points were added
+        :param max_evals: maximum number of create_propeller() calls
+        :param tol: the search has converged when the best expected improvement is below tol * |best objective| and
+            the best objective has improved by less than that, for patience batches in a row
+        :return: (key, Propeller, objective value) of the best candidate
+        """
+        if objective is None:
+            objective = 'energy' if len(self.duty_cycle_points) > 0 else 'efficiency'
+        if objective not in ['energy', 'efficiency']:
+            raise Error('"objective" must be either "energy" or "efficiency"')
+        if objective == 'energy':
+            _ = self.duty_cycle_weights  # check the duty cycle before spending time on XROTOR designs
+        if not os.path.exists(self.save_dir):
+            os.mkdir(self.save_dir)
+
+        lo, hi = self._design_bounds(vel_bounds=vel_bounds, cl_bounds=cl_bounds, adv_bounds=adv_bounds,
+                                     rpm_bounds=rpm_bounds)
+        rng = np.random.default_rng(seed)
+        sign = 1.0 if objective == 'energy' else -1.0  # always minimizing
+        samples = {}  # key -> minimized objective, NaN for designs that failed or can't fly the duty cycle
+
+        def evaluate(keys: list):
+            vals = self.evaluate_duty_cycle(keys=keys) if objective == 'energy' else None
+            for key in keys:
+                samples[key] = vals[key]['energy'] if objective == 'energy' else -self.efficiency(*key)
+
+        def create(units: np.ndarray):
+            specs = {}
+            for u in units:
+                spec = self._design_spec(*(lo + u * (hi - lo)))
+                key = self._spec_key(spec)
+                if key in self.failed:  # known to fail from an earlier run
+                    samples[key] = np.nan
+                elif key not in samples and key not in self.propellers:
+                    specs[spec['name']] = spec
+            created, failed = self._create_designs(specs=list(specs.values()), workers=workers, verbose=False)
+            evaluate(keys=created)
+            samples.update({key: np.nan for key in failed})
+            return len(specs)
+
+        # start from any existing candidates inside of the bounds, then a Latin hypercube
+        in_bounds = lambda key: np.all((np.array(key) >= lo) & (np.array(key) <= hi))
+        evaluate(keys=[key for key in self.propellers if in_bounds(key)])
+        samples.update({key: np.nan for key in self.failed if in_bounds(key)})
+        n_evals = create(qmc.LatinHypercube(d=3, seed=rng).random(max(n_init - len(samples), 0)))
+
+        stalls = 0
+        while n_evals < max_evals and stalls < patience:
+            keys = list(samples)
+            x = (np.array(keys) - lo) / (hi - lo)
+            y = np.array([samples[key] for key in keys])
+            ok = np.isfinite(y)
+            if not np.any(ok):
+                raise Error('None of the {} candidate propellers could be evaluated'.format(len(keys)))
+            y_best = np.min(y[ok])
+            y = np.where(ok, y, np.max(y[ok]))  # failed designs count as the worst one, steering away from them
+
+            # batch of proposals, each conditioned on the model's mean at the previous ones ("kriging believer")
+            pool = rng.random((n_pool, 3))
+            batch, max_ei = [], None
+            for _ in range(min(batch_size, max_evals - n_evals)):
+                gp = GaussianProcessSurrogate(x=x, y=y)
+                ei = gp.expected_improvement(pool, y_best=y_best)
+                j = int(np.argmax(ei))
+                max_ei = ei[j] if max_ei is None else max_ei
+                batch.append(pool[j])
+                x, y = np.vstack([x, pool[j]]), np.append(y, gp.predict(pool[j])[0])
+                pool = np.delete(pool, j, axis=0)
+
+            n_new = create(np.array(batch))
+            n_evals += n_new
+            y_new = np.nanmin(np.array(list(samples.values()), dtype=float))
+            converged = max_ei < tol * abs(y_best) and y_best - y_new < tol * abs(y_best)
+            stalls = stalls + 1 if converged or n_new == 0 else 0
+            if verbose:
+                Info('Surrogate search: {} / {} designs created, best {} = {:.5g}'
+                     .format(n_evals, max_evals, objective, sign * y_new), indent_level=1)
+
+        feasible = {key: val for key, val in samples.items() if np.isfinite(val)}
+        if len(feasible) == 0:
+            raise Error('None of the {} candidate propellers could be evaluated'.format(len(samples)))
+        best = min(feasible, key=feasible.get)
+        if verbose:
+            Info('Best of {} candidates ({} created): vel-{}_cl-{}_{}-{} ({} = {:.5g})'
+                 .format(len(samples), n_evals, *best[:2], self.var2base, best[2], objective, sign * feasible[best]))
+        return best, self.propellers[best], sign * feasible[best]
+
+    def plot_results(self, normalized: bool = True, z_param: str = 'Efficiency'):
+        """
+        :param z_param: either "Efficiency" (design point) or "energy" (duty cycle, normalized by the largest one)
+        """
+        if z_param not in ['Efficiency', 'energy']:
+            raise Error('"z_param" must be either "Efficiency" or "energy"')
+        z_func = self.efficiency if z_param == 'Efficiency' else self.energy
+        z_max = 1.0
+        if z_param == 'energy':
+            z_max = np.nanmax([res['energy'] for res in self.evaluate_duty_cycle().values()])
+
         pg.mkQApp()
         view = gl.GLViewWidget()
         axis = Custom3DAxis(parent=view, color=(1.0, 1.0, 1.0, 0.6))
         axis.setSize(x=1.0, y=1.0, z=1.0)
-        axis.add_labels(xlbl='CL', ylbl=self.var2, zlbl='Efficiency')
+        axis.add_labels(xlbl='CL', ylbl=self.var2, zlbl=z_param)
         axis.add_tick_values(xticks=[0, 0.5, 1.0], yticks=[0, 0.5, 1.0], zticks=[0, 0.5, 1.0])
         view.addItem(axis)
         view.setCameraPosition(distance=3)
@@ -214,7 +874,7 @@ class DutyCycleDesignOptimization:
             for c, cl in enumerate(self.unique_cls):
                 for v, val in enumerate(self.unique_var2s):
                     if (vel, cl, val) in self.propellers:
-                        effs[c, v] = self.efficiency(vel_val=vel, cl_val=cl, val2_val=val)
+                        effs[c, v] = np.nan_to_num(z_func(vel_val=vel, cl_val=cl, val2_val=val) / z_max)
                     else:
                         effs[c, v] = 0  # np.nan
 
@@ -230,6 +890,268 @@ class DutyCycleDesignOptimization:
             view.addItem(itm)
 
 
+class GaussianProcessSurrogate:
+    """Gaussian-process regression model (squared exponential kernel, length scale picked by maximum marginal
+    likelihood) of an objective over the unit hypercube, used to propose candidates in surrogate_search()"""
+    def __init__(self, x: np.ndarray, y: np.ndarray, noise: float = 1e-6,
+                 length_scales: tuple = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5)):
+        self.x = np.atleast_2d(np.asarray(x, dtype=float))
+        y = np.asarray(y, dtype=float)
+        self.y_mean, self.y_std = np.mean(y), max(np.std(y), 1e-12)
+        self.y = (y - self.y_mean) / self.y_std
+        self.noise = noise
+
+        best = None
+        for ls in length_scales:
+            try:
+                chol = cho_factor(self._kernel(self.x, self.x, ls) + noise * np.eye(len(self.x)), lower=True)
+            except np.linalg.LinAlgError:
+                continue
+            alpha = cho_solve(chol, self.y)
+            log_lik = -0.5 * self.y @ alpha - np.sum(np.log(np.diag(chol[0])))
+            if best is None or log_lik > best[0]:
+                best = (log_lik, ls, chol, alpha)
+        if best is None:
+            raise Error('Could not fit the surrogate model, the samples may be duplicated')
+        _, self.length_scale, self._chol, self._alpha = best
+
+    @staticmethod
+    def _kernel(xa: np.ndarray, xb: np.ndarray, length_scale: float):
+        sq_dist = np.sum((xa[:, None, :] - xb[None, :, :]) ** 2, axis=-1)
+        return np.exp(-0.5 * sq_dist / length_scale ** 2)
+
+    def predict(self, x: np.ndarray):
+        """
+        :return: (mean, std) of the model at each row of x, in the units of the objective
+        """
+        k = self._kernel(np.atleast_2d(x), self.x, self.length_scale)
+        mean = k @ self._alpha
+        var = np.maximum(1.0 - np.sum(k * cho_solve(self._chol, k.T).T, axis=1), 1e-16)
+        return self.y_mean + self.y_std * mean, self.y_std * np.sqrt(var)
+
+    def expected_improvement(self, x: np.ndarray, y_best: float):
+        """
+        :return: expected improvement (minimization) over y_best at each row of x
+        """
+        mean, std = self.predict(x)
+        z = (y_best - mean) / std
+        return (y_best - mean) * norm.cdf(z) + std * norm.pdf(z)
+
+
+def non_dominated_indices(costs: np.ndarray):
+    """
+    Non-dominated sort (Kung et al.) of points sorted lexicographically by their objectives.  For 2 objectives it's a
+    single sweep keeping the running minimum of the second objective, O(N log N) overall.  For more objectives it
+    divides and conquers, and each merge compares the front of the top half with the front of the bottom half, so
+    it's quadratic in the size of the front in the worst case.
+
+    :param costs: (n_points, n_objectives) array, all objectives minimized
+    :return: sorted array of the row indices of the points no other point dominates (duplicates are all kept)
+    """
+    costs = np.asarray(costs, dtype=float)
+    if len(costs) == 0:
+        return np.array([], dtype=int)
+    order = np.lexsort(costs.T[::-1])
+
+    if costs.shape[1] == 2:
+        # every point before p has a first objective <= p's, so p is dominated by a point with a smaller second
+        # objective, or by an equal one that isn't p's duplicate
+        keep = []
+        best = None  # (second objective, first objective) of the first point reaching the running minimum
+        for i in order:
+            c0, c1 = costs[i]
+            if best is None or c1 < best[0]:
+                best = (c1, c0)
+                keep.append(i)
+            elif c1 == best[0] and c0 == best[1]:
+                keep.append(i)
+        return np.sort(np.array(keep, dtype=int))
+
+    def front(idx):
+        # idx is sorted lexicographically, so no point can be dominated by one after it
+        if len(idx) == 1:
+            return idx
+        top, bottom = front(idx[:len(idx) // 2]), front(idx[len(idx) // 2:])
+        t, b = costs[top][:, None, :], costs[bottom][None, :, :]
+        dominated = np.any(np.all(t <= b, axis=2) & np.any(t < b, axis=2), axis=0)
+        return np.concatenate([top, bottom[~dominated]])
+
+    return np.sort(front(order))
+
+
+class ParetoFront:
+    """Non-dominated set of candidates over several objectives, built in bulk with non_dominated_indices() and then
+    kept up to date one candidate at a time (a new candidate is only compared against the current front, a candidate
+    whose values change re-sorts all of them, since it may no longer dominate the ones it pushed off of the front)"""
+    def __init__(self, objectives: dict):
+        """
+        :param objectives: {metric name: "max" or "min"}
+        """
+        for name, sense in objectives.items():
+            if sense not in ['max', 'min']:
+                raise Error('Objective "{}" must be either "max" or "min", not "{}"'.format(name, sense))
+        self.objectives = dict(objectives)
+        self._signs = np.array([-1.0 if sense == 'max' else 1.0 for sense in self.objectives.values()])
+        self.values = {}  # key -> {metric: value} of every candidate added, on the front or not
+        self._keys = []  # keys of the front, rows of self._costs
+        self._costs = np.empty((0, len(self.objectives)))
+
+    def _cost(self, values: dict):
+        return self._signs * np.array([values[name] for name in self.objectives], dtype=float)
+
+    def add(self, key, values: dict):
+        """
+        :param values: {metric: value} of the candidate, candidates with any non-finite value never join the front
+        :return: True if the candidate joined the front (possibly pushing others off of it)
+        """
+        if key in self.values:
+            self.values[key] = values
+            self._sort(list(self.values))
+            return key in self._keys
+
+        self.values[key] = values
+        cost = self._cost(values)
+        if not np.all(np.isfinite(cost)):
+            return False
+        if np.any(np.all(self._costs <= cost, axis=1) & np.any(self._costs < cost, axis=1)):
+            return False
+        keep = ~(np.all(cost <= self._costs, axis=1) & np.any(cost < self._costs, axis=1))
+        self._keys = [k for k, kept in zip(self._keys, keep) if kept] + [key]
+        self._costs = np.vstack([self._costs[keep], cost])
+        return True
+
+    def update(self, items: dict):
+        """
+        Adds many candidates at once, {key: {metric: value}}, with a single non-dominated sort.
+        """
+        readded = any([key in self.values for key in items])
+        self.values.update(items)
+        self._sort(list(self.values) if readded else self._keys + list(items))
+
+    def _sort(self, keys: list):
+        # the front becomes the non-dominated ones of keys
+        costs = np.array([self._cost(self.values[key]) for key in keys]).reshape(-1, len(self.objectives))
+        finite = np.all(np.isfinite(costs), axis=1)
+        keys, costs = [key for key, ok in zip(keys, finite) if ok], costs[finite]
+        idx = non_dominated_indices(costs)
+        self._keys, self._costs = [keys[i] for i in idx], costs[idx]
+
+    @property
+    def front(self):
+        """
+        :return: {key: {metric: value}} of the candidates on the front
+        """
+        return {key: self.values[key] for key in self._keys}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+
+class OptimizationJournal:
+    """Append-only JSON-lines record of every candidate an optimization has attempted (inputs, vorform, status,
+    metrics, timing), written as each design finishes so an interrupted study can be resumed without rescanning its
+    folders"""
+    def __init__(self, fpath: str):
+        self.fpath = fpath
+
+    def load(self):
+        """
+        :return: dict of {(key, vorform): latest entry} (later entries of the same key and vorform supersede earlier
+            ones, vorform is None for entries that don't record it)
+        """
+        entries = {}
+        if not os.path.exists(self.fpath):
+            return entries
+        with open(self.fpath, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:  # a line cut short by a crash mid-write
+                    continue
+                entries[tuple(entry['key']), entry.get('vorform')] = entry
+        return entries
+
+    def append(self, entry: dict):
+        with open(self.fpath, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class CandidatePropellers(MutableMapping):
+    """{key: Propeller} mapping of the optimization candidates that keeps a compact table of each candidate's folder,
+    fingerprint, vorform and scalar results (JOURNAL_METRICS), and only holds up to max_loaded full Propeller objects at a time
+    (least recently used ones are dropped and re-loaded from their folder when accessed again)"""
+    def __init__(self, max_loaded: int = 32):
+        self.max_loaded = max_loaded
+        self._rows = {}  # key -> {'folder': str, 'fingerprint': str, 'vorform': str, **metrics}
+        self._loaded = OrderedDict()
+
+    def add_folder(self, key: tuple, folder: str, fingerprint: str = None, metrics: dict = None, vorform: str = None):
+        self._rows[key] = {'folder': folder, 'fingerprint': fingerprint, 'vorform': vorform,
+                           **(metrics if metrics is not None else {})}
+        self._loaded.pop(key, None)
+
+    def folder(self, key: tuple):
+        return self._rows[key]['folder']
+
+    def fingerprint(self, key: tuple):
+        return self._rows[key]['fingerprint']
+
+    def vorform(self, key: tuple):
+        # the vortex formulation (fidelity) the candidate was designed with
+        return self._rows[key]['vorform']
+
+    def metric(self, key: tuple, name: str, func=None):
+        """
+        :param func: func(Propeller) that computes the result, defaults to looking it up in the XROTOR design point
+            output
+        :return: the scalar result "name" of a candidate, from the table if it's there, else computed from the
+            Propeller (and then added to the table)
+        """
+        row = self._rows[key]
+        if row.get(name) is None:
+            prop = self[key]
+            row[name] = prop.xrotor_op_dict[name] if func is None else func(prop)
+        return row[name]
+
+    def __getitem__(self, key):
+        if key in self._loaded:
+            self._loaded.move_to_end(key)
+            return self._loaded[key]
+        prop = Propeller(self._rows[key]['folder'], verbose=False)
+        self._remember(key, prop)
+        return prop
+
+    def _remember(self, key: tuple, prop: Propeller):
+        self._loaded[key] = prop
+        while len(self._loaded) > max(self.max_loaded, 1):
+            self._loaded.popitem(last=False)
+
+    def __setitem__(self, key, prop):
+        op_dict = prop.xrotor_op_dict if prop.xrotor_op_dict is not None else {}
+        self.add_folder(key, folder=prop.save_folder, fingerprint=prop.design_fingerprint,
+                        metrics={k: op_dict.get(k) for k in JOURNAL_METRICS},
+                        vorform=(prop.design_vorform or 'pot').lower())
+        self._remember(key, prop)
+
+    def __delitem__(self, key):
+        del self._rows[key]
+        self._loaded.pop(key, None)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+
 class DutyCyclePoint:
     def __init__(self, velocity: float = None, thrust: float = None, duration_percent: float = None, duration_sec: float = None):
         self.velocity = velocity
@@ -7,7 +7,7 @@ from propeller_design_tools.propeller import Propeller
 try:
     from PyQt5 import QtWidgets, QtCore
     from propeller_design_tools.helper_ui_subclasses import PDT_Label, PDT_GroupBox, PDT_ComboBox, PDT_PushButton, \
-        PDT_CheckBox
+        PDT_CheckBox, PDT_SpinBox
     from propeller_design_tools.helper_ui_classes import SingleAxCanvas, PropellerCreationPanelCanvas, \
         CheckColumnWidget, AxesComboBoxWidget, RangeLineEditWidget, Capturing
 except:
@@ -147,7 +147,6 @@ class PropellerSweepSelectPropWidget(QtWidgets.QWidget):
         self.selectedPropChanged.emit()
 
     def plot_prop_wvel(self):
-        self.wvel_3d_view.clear()
         total = self.vel_vec_widg.tot_vel_chk.isChecked()
         axial = self.vel_vec_widg.ax_vel_chk.isChecked()
         tang = self.vel_vec_widg.tan_vel_chk.isChecked()
@@ -217,6 +216,9 @@ class PropellerSweepAddDataWidget(QtWidgets.QWidget):
                                                                    default_strs=['0.1', '1.0', '0.1'],
                                                                    spin_double_science='double')
         opts_lay.addRow(PDT_Label('Sweep Values:', font_size=12), sweep_vals_rle)
+        self.workers_sb = workers_sb = PDT_SpinBox(font_size=12, width=80, box_range=[1, 32], box_single_step=1,
+                                                   default_str='1')
+        opts_lay.addRow(PDT_Label('XROTOR Runs At Once:', font_size=12), workers_sb)
         lay.addLayout(opts_lay)
 
         self.add_btn = add_btn = PDT_PushButton('Sweep (overwrites)', font_size=12, width=150)
@@ -234,6 +236,7 @@ class PropellerSweepAddDataWidget(QtWidgets.QWidget):
         min_val, max_val, val_step = self.sweep_vals_rle.get_start_stop_step()
         vals = list(np.arange(min_val, max_val, val_step))
         vor = self.vorform_cb.currentText()
+        workers = self.workers_sb.value()
 
         if self.prop is None:
             msgbox = QtWidgets.QMessageBox()
@@ -243,7 +246,7 @@ class PropellerSweepAddDataWidget(QtWidgets.QWidget):
         self.prop.clear_sweep_data()
         self.thread = QtCore.QThread()
         self.prop_sweep_worker = PropellerSweepWorker(prop=self.prop, velos=velos, param2sweep=param, sweep_vals=vals,
-                                                      vorform=vor)
+                                                      vorform=vor, workers=workers)
         self.prop_sweep_worker.moveToThread(self.thread)
         self.thread.started.connect(self.prop_sweep_worker.run)
         self.prop_sweep_worker.finished.connect(self.thread.quit)
@@ -251,6 +254,7 @@ class PropellerSweepAddDataWidget(QtWidgets.QWidget):
         self.prop_sweep_worker.finished.connect(self.on_sweep_worker_finish)
         self.thread.finished.connect(self.thread.deleteLater)
         self.prop_sweep_worker.progress.connect(self.update_sweep_worker_progress)
+        self.prop_sweep_worker.pointFinished.connect(self.main_win.prop_sweep_widg.update_plot_widg)
 
         self.main_win.prop_sweep_widg.exist_data_widg.setEnabled(False)
         self.main_win.prop_sweep_widg.metric_plot_widget.setEnabled(False)
@@ -360,17 +364,30 @@ class PropellerSweepMetricPlotWidget(QtWidgets.QWidget):
 class PropellerSweepWorker(QtCore.QObject):
 
     progress = QtCore.pyqtSignal(object, object)
+    pointFinished = QtCore.pyqtSignal()
     finished = QtCore.pyqtSignal()
 
-    def __init__(self, prop: Propeller, velos: list, param2sweep: str, sweep_vals: list, vorform: str):
+    def __init__(self, prop: Propeller, velos: list, param2sweep: str, sweep_vals: list, vorform: str,
+                 workers: int = 1):
         super(PropellerSweepWorker, self).__init__()
         self.prop = prop
         self.velos = velos
         self.param2sweep = param2sweep
         self.sweep_vals = sweep_vals
         self.vorform = vorform
+        self.workers = workers
 
     def run(self):
-        self.prop.analyze_sweep(velo_vals=self.velos, sweep_param=self.param2sweep, sweep_vals=self.sweep_vals,
-                                verbose=True, xrotor_verbose=False, vorform=self.vorform, prog_signal=self.progress)
+        total_pnts = len(self.velos) * len(self.sweep_vals)
+        self.progress.emit(0, ['Analyzing "{}" across a sweep of {} operating points'.format(self.prop.name,
+                                                                                              total_pnts)])
+        for count, (velo, val, oper_output, err_str) in enumerate(self.prop.iter_sweep(
+                velo_vals=self.velos, sweep_param=self.param2sweep, sweep_vals=self.sweep_vals, xrotor_verbose=False,
+                vorform=self.vorform, workers=self.workers), start=1):
+            self.progress.emit(count / total_pnts * 100, ['Analyzed sweep point # {} / {}'.format(count, total_pnts)])
+            if err_str is not None:
+                self.progress.emit(None, [err_str])
+            else:
+                self.pointFinished.emit()
+        self.progress.emit(0, ['Done!'])
         self.finished.emit()
@@ -47,10 +47,10 @@ class PropellerCreationWidget(QtWidgets.QWidget):
 
     def select_prop_cb_changed(self):
         self.plot3d_widg.enable_edit_chk.setChecked(False)
-        self.plot3d_widg.clear_plot()
         curr_txt = self.plot3d_widg.select_prop_cb.currentText()
         if curr_txt == 'None':
             self.prop = None
+            self.plot3d_widg.clear_plot()
             self.plot3d_widg.enable_edit_chk.setEnabled(False)
             self.control_widg.set_inputs_to_default()
             self.control_widg.set_enable(True)
@@ -241,6 +241,9 @@ class PropellerCreationControlWidget(QtWidgets.QWidget):
             return
 
         if os.path.exists(prop.bld_prof_folder):
+            # profiles are stored in a binary file, write out the text versions for viewing if they aren't there yet
+            if not any([f.endswith('.txt') for f in os.listdir(prop.bld_prof_folder)]):
+                prop.export_blade_profiles_txt()
             subprocess.Popen('explorer "{}"'.format(os.path.normpath(prop.bld_prof_folder)))
 
     def save_new_btn_clicked(self):
@@ -1,11 +1,13 @@
 import os
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from propeller_design_tools import funcs
 from propeller_design_tools.user_io import Info, Error, Warning
-from propeller_design_tools.settings import get_setting
+from propeller_design_tools.settings import get_setting, get_prop_db
 from propeller_design_tools.airfoil import Airfoil
 from propeller_design_tools.settings import VALID_OPER_PLOT_PARAMS
-from propeller_design_tools.custom_opengl_classes import Custom3DArrow
+from propeller_design_tools.custom_opengl_classes import Batched3DArrows
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 from mpl_toolkits import mplot3d
@@ -16,14 +18,28 @@ import pyqtgraph as pg
 import pyqtgraph.opengl as gl
 
 
+# styles of the 3D geometry plots, per category of Propeller.get_geometry_polylines()
+_GEO_LABELS = {'le': 'L.E.', 'te': 'T.E.', 'hub': 'Hub', 'input_stations': 'Input Stations',
+               'chords': 'XROTOR Stations', 'profiles': 'Interpolated Geom.'}
+_MPL_GEO_STYLES = {'le': {'c': 'k', 'lw': 2}, 'te': {'c': 'k', 'ls': '-.', 'lw': 2}, 'hub': {'c': 'gray', 'lw': 2},
+                   'input_stations': {'c': 'red', 'alpha': 0.7, 'lw': 1},
+                   'chords': {'c': 'rosybrown', 'lw': 1, 'ls': '--'},
+                   'profiles': {'c': 'maroon', 'lw': 1, 'alpha': 0.7}}
+_GL_GEO_STYLES = {'le': {'color': (0.5, 0.5, 0.5, 1.0)}, 'te': {'color': (0.5, 0.5, 0.5, 1.0)},
+                  'hub': {'color': (0.5, 0.5, 0.5, 1.0)},
+                  'input_stations': {'color': tuple(i / 255 for i in [5, 0, 163, 255])},
+                  'chords': {'color': tuple(i / 255 for i in [245, 66, 66, 255])},
+                  'profiles': {'color': tuple(i / 255 for i in [163, 0, 0, 200])}}
+
+
 class Propeller(object):
 
     creation_attrs = {'nblades': int, 'radius': float, 'hub_radius': float, 'hub_wake_disp_br': float,
                       'design_speed_mps': float, 'design_adv': float, 'design_rpm': float, 'design_thrust': float,
                       'design_power': float, 'design_cl': dict, 'design_atmo_props': dict, 'design_vorform': str,
                       'station_params': dict, 'station_polars': list, 'geo_params': dict}
-    saveload_attrs = {**creation_attrs, **{'name': str, 'meta_file': str, 'xrr_file': str, 'xrop_file': str,
-                                           'blade_data': dict, 'blade_xyz_profiles': dict}}
+    saveload_attrs = {**creation_attrs, **{'name': str, 'design_fingerprint': str, 'meta_file': str, 'xrr_file': str,
+                                           'xrop_file': str, 'blade_data': dict, 'blade_xyz_profiles': dict}}
 
     def __init__(self, name, verbose: bool = True, **kwargs):
         # name is always given, detect if it's a filepath
@@ -31,9 +47,11 @@ class Propeller(object):
         if os.path.exists(name):
             self.savepath, name = os.path.split(name)
         self.name = name.replace('.txt', '')
-        self.oper_data = None
-        self.wvel_data = None
-        self.stl_mesh = None
+        self.design_fingerprint = None
+
+        # backing attrs of the lazily-loaded data (see the properties below), None = not loaded yet
+        self._stations, self._xrotor_d, self._xrotor_op_dict, self._blade_xyz_profiles, self._oper_data, \
+        self._wvel_data, self._stl_mesh = [None] * 7
 
         # check if the prop db exists
         prop_db = get_setting('propeller_database')
@@ -61,14 +79,82 @@ class Propeller(object):
                 else:
                     raise Error('Unknown KWARG input "{}"'.format(key))
 
-        # attempt to load any oper sweep data and any wvel sweep data
-        self.oper_data = PropellerOperData(directory=self.oper_data_dir)
-        self.oper_data.load_oper_sweep_results(verbose=verbose)
-        self.wvel_data = PropellerWVelData(directory=self.wvel_data_dir)
-        self.wvel_data.load_wvel_sweep_results(verbose=verbose)
+    # ----- lazily-loaded data, each is read from file the first time it's accessed -----
+    @property
+    def stations(self):
+        if self._stations is None and os.path.exists(self.station_polar_folder):
+            self._stations = funcs.read_radial_stations(prop=self, plot_also=False, verbose=False)
+        return self._stations
+
+    @stations.setter
+    def stations(self, value):
+        self._stations = value
+
+    @property
+    def xrotor_d(self):
+        if self._xrotor_d is None and os.path.exists(self.xrr_file):
+            self._xrotor_d = self.read_xrotor_restart()
+        return self._xrotor_d
+
+    @xrotor_d.setter
+    def xrotor_d(self, value):
+        self._xrotor_d = value
+
+    @property
+    def xrotor_op_dict(self):
+        if self._xrotor_op_dict is None and os.path.exists(self.xrop_file):
+            self._xrotor_op_dict = funcs.read_xrotor_op_file(fpath=self.xrop_file)
+        return self._xrotor_op_dict
+
+    @xrotor_op_dict.setter
+    def xrotor_op_dict(self, value):
+        self._xrotor_op_dict = value
+
+    @property
+    def blade_xyz_profiles(self):
+        if self._blade_xyz_profiles is None and os.path.exists(self.bld_prof_folder):
+            self._blade_xyz_profiles = self.read_blade_profiles()
+        return self._blade_xyz_profiles
+
+    @blade_xyz_profiles.setter
+    def blade_xyz_profiles(self, value):
+        self._blade_xyz_profiles = value
+
+    @property
+    def oper_data(self):
+        if self._oper_data is None:
+            self._oper_data = PropellerOperData(directory=self.oper_data_dir)
+            self._oper_data.load_oper_sweep_results(verbose=False)
+        return self._oper_data
+
+    @oper_data.setter
+    def oper_data(self, value):
+        self._oper_data = value
 
-        # attempt to load any STL mesh data
-        self.load_stl_geometry(verbose=verbose)
+    @property
+    def wvel_data(self):
+        if self._wvel_data is None:
+            self._wvel_data = PropellerWVelData(directory=self.wvel_data_dir)
+            self._wvel_data.load_wvel_sweep_results(verbose=False)
+        return self._wvel_data
+
+    @wvel_data.setter
+    def wvel_data(self, value):
+        self._wvel_data = value
+
+    @property
+    def stl_mesh(self):
+        if self._stl_mesh is None and os.path.exists(self.stl_fpath):
+            self._stl_mesh = mesh.Mesh.from_file(self.stl_fpath)
+        return self._stl_mesh
+
+    @stl_mesh.setter
+    def stl_mesh(self, value):
+        self._stl_mesh = value
+
+    def clear_cached_data(self):
+        self._stations, self._xrotor_d, self._xrotor_op_dict, self._blade_xyz_profiles, self._oper_data, \
+        self._wvel_data, self._stl_mesh = [None] * 7
 
     @property
     def stl_fpath(self):
@@ -82,6 +168,10 @@ class Propeller(object):
     def bld_prof_folder(self):
         return os.path.join(self.save_folder, 'blade_profiles')
 
+    @property
+    def bld_prof_file(self):
+        return os.path.join(self.bld_prof_folder, 'blade_profiles.npy')
+
     @property
     def xrr_file(self):
         return os.path.join(self.save_folder, '{}.xrr'.format(self.name))
@@ -173,7 +263,7 @@ class Propeller(object):
         # blade profiles
         if not os.path.exists(self.bld_prof_folder):
             os.mkdir(self.bld_prof_folder)
-        for fname in [f for f in os.listdir(old_blade_profs_folder) if f.endswith('.txt')]:
+        for fname in [f for f in os.listdir(old_blade_profs_folder) if f.endswith('.txt') or f.endswith('.npy')]:
             fpath = os.path.join(old_blade_profs_folder, fname)
             copypath = os.path.join(self.bld_prof_folder, fname)
             shutil.copyfile(fpath, copypath)
@@ -282,37 +372,51 @@ class Propeller(object):
         return d
 
     def load_from_savefile(self, verbose):
-        # 1st set attrs from the PDT metafile
+        # only the PDT metafile is read here, the stations, XROTOR files, blade profiles, sweep data and STL mesh are
+        # read the first time they're accessed
         self.read_pdt_metafile()
         if verbose:
             Info(s='Successfully read meta-file (.meta)!', indent_level=1)
+        self.clear_cached_data()
 
-        # set the stations... why did I do it this way??
-        self.set_stations(plot_also=False, verbose=verbose, from_loadsave_file=True)
-        if verbose:
-            Info(s='Successfully read and set station polars!', indent_level=1)
-
-        # then read in the XROTOR restart file (in the xrotor_geometry_files)
-        self.xrotor_d = self.read_xrotor_restart()
-        if verbose:
-            Info(s='Successfully read XROTOR restart file (.xrr)!', indent_level=1)
+        return
 
-        # then read the operating point output file (in xrotor_op_files)
-        self.xrotor_op_dict = funcs.read_xrotor_op_file(fpath=self.xrop_file)
-        if verbose:
-            Info(s='Successfully read XROTOR operating-point file (.xrop)!', indent_level=1)
+    def read_blade_profiles(self):
+        # binary file is memory-mapped (n_profs x 3 x n_pts), older propellers only have the text files
+        if os.path.exists(self.bld_prof_file):
+            profiles = np.load(self.bld_prof_file, mmap_mode='r')
+            return {i: prof for i, prof in enumerate(profiles)}
 
-        # and finally read in the point cloud files
-        self.blade_xyz_profiles = {}
-        fnames = funcs.search_files(folder=self.bld_prof_folder)
+        profiles = {}
+        fnames = [f for f in funcs.search_files(folder=self.bld_prof_folder) if f.endswith('.txt')]
         for fname in fnames:
             prof_num = int(fname.replace('profile_', '').replace('.txt', ''))
-            xyz_prof = funcs.read_profile_xyz(fpath=os.path.join(self.bld_prof_folder, fname))
-            self.blade_xyz_profiles[prof_num] = xyz_prof
-        if verbose:
-            Info(s='Successfully read blade profiles!', indent_level=1)
-
-        return
+            profiles[prof_num] = funcs.read_profile_xyz(fpath=os.path.join(self.bld_prof_folder, fname))
+        return profiles
+
+    def save_blade_profiles(self, save_txt: bool = False):
+        """
+        Saves self.blade_xyz_profiles as a single binary array file (n_profs x 3 x n_pts, .npy format), and optionally
+        also as the individual "profile_#.txt" text files.
+        """
+        profiles = np.stack([self.blade_xyz_profiles[k] for k in sorted(self.blade_xyz_profiles)])
+        np.save(self.bld_prof_file, profiles)
+        if save_txt:
+            self.export_blade_profiles_txt()
+
+    def export_blade_profiles_txt(self, folder: str = None):
+        """
+        Writes each blade profile to a "profile_#.txt" text file (x, y, z columns), in the blade profiles folder by
+        default.
+        """
+        folder = self.bld_prof_folder if folder is None else folder
+        for key, val in self.blade_xyz_profiles.items():
+            savepath = os.path.join(folder, 'profile_{}.txt'.format(key))
+            xpts, ypts, zpts = val
+            with open(savepath, 'w') as f:
+                f.write('x, y, z\n')
+                for xp, yp, zp in zip(xpts, ypts, zpts):
+                    f.write('{:.6f}, {:.6f}, {:.6f}\n'.format(xp, yp, zp))
 
     def set_stations(self, plot_also: bool = True, verbose: bool = False, from_loadsave_file: bool = False):
         if not from_loadsave_file:
@@ -360,20 +464,29 @@ class Propeller(object):
                         val = ', '.join([str(v) for v in val])
                     f.write('{}: {}\n'.format(key, val))
 
+    def get_blade_geometry(self, rotate_degs=None, axis_shift: float = 0.25, npts: int = 50):
+        """
+        Computes the chordlines of every XROTOR station for every rotated blade copy in one pass, the L.E. and T.E.
+        points are the first and last points of each chordline.
+
+        :param rotate_degs: angle(s) of the blade copies, defaults to one copy per blade
+        :return: dict of arrays 'le', 'te' with shape (n_rot, n_stations, 3) and 'chordlines' with shape
+            (n_rot, n_stations, 3, npts)
+        """
+        if rotate_degs is None:
+            rotate_degs = 360 / self.xrotor_d['Nblds'] * np.arange(self.xrotor_d['Nblds'])
+        chordline_nondim = np.vstack([np.linspace(0, 1, npts), np.zeros(npts)])
+        chordlines = funcs.generate_3D_profile_points_batch(nondim_xy_coords=chordline_nondim,
+                                                            radii=self.radius * np.asarray(self.xrotor_d['r/R']),
+                                                            axis_shift=axis_shift,
+                                                            chord_lens=self.radius * np.asarray(self.xrotor_d['C/R']),
+                                                            beta_degs=self.xrotor_d['Beta0deg'],
+                                                            rotate_degs=rotate_degs)
+        return {'le': chordlines[:, :, :, 0], 'te': chordlines[:, :, :, -1], 'chordlines': chordlines}
+
     def get_blade_le_te(self, rotate_deg: float = 0.0, axis_shift: float = 0.25):
-        radii = self.radius * np.array(self.xrotor_d['r/R'])
-        chords = self.radius * np.array(self.xrotor_d['C/R'])
-        betas = np.array(self.xrotor_d['Beta0deg'])
-        le_pts = []
-        te_pts = []
-        for radius, chord, beta in zip(radii, chords, betas):
-            le_te_coords = np.array([[0.0, 1.0], [0.0, 0.0]])
-            xs, ys, zs = funcs.generate_3D_profile_points(nondim_xy_coords=le_te_coords, radius=radius,
-                                                            axis_shift=axis_shift, chord_len=chord, beta_deg=beta,
-                                                            skew_deg=rotate_deg)
-            le_pts.append([xs[0], ys[0], zs[0]])
-            te_pts.append([xs[1], ys[1], zs[1]])
-        return le_pts, te_pts
+        geo = self.get_blade_geometry(rotate_degs=rotate_deg, axis_shift=axis_shift, npts=2)
+        return geo['le'][0].tolist(), geo['te'][0].tolist()
 
     def get_blade_quarter_chords(self):  # for plotting of wvel vectors
         chordlines = self.get_blade_chordlines(rotate_deg=0)
@@ -385,22 +498,20 @@ class Propeller(object):
         return q_chord_pts
 
     def get_blade_chordlines(self, rotate_deg: float, axis_shift: float = 0.25, npts: int = 50):
-        radii = self.radius * np.array(self.xrotor_d['r/R'])
-        chords = self.radius * np.array(self.xrotor_d['C/R'])
-        betas = np.array(self.xrotor_d['Beta0deg'])
-        chordlines = []
-        for radius, chord, beta in zip(radii, chords, betas):
-            xs = np.linspace(0, 1, npts)
-            ys = np.zeros(len(xs))
-            chordline_nondim = np.vstack([xs, ys])
-            xs, ys, zs = funcs.generate_3D_profile_points(nondim_xy_coords=chordline_nondim, radius=radius,
-                                                   axis_shift=axis_shift, chord_len=chord, beta_deg=beta,
-                                                   skew_deg=rotate_deg)
-            coords = list(zip(xs, ys, zs))
-            chordlines.append(coords)
-        return chordlines
-
-    def interp_foil_profiles(self, n_prof_pts: int = None, n_profs: int = 50, tot_skew: float = 0.0):
+        geo = self.get_blade_geometry(rotate_degs=rotate_deg, axis_shift=axis_shift, npts=npts)
+        return [list(zip(xs, ys, zs)) for xs, ys, zs in geo['chordlines'][0]]
+
+    def interp_foil_profiles(self, n_prof_pts: int = None, n_profs: int = 50, tot_skew: float = 0.0,
+                             prof_tol: float = None, prof_spacing: str = 'cosine', rad_tol: float = None,
+                             save_txt: bool = False):
+        """
+        Builds the 3D blade profiles from the station airfoil and the blade_data chord / twist distributions.
+
+        :param n_prof_pts: points per profile (resampled airfoil), or prof_tol for a geometric tolerance instead
+        :param n_profs: number of profiles, uniformly spaced in r/R (or the max number of profiles if rad_tol is given)
+        :param rad_tol: if given, place the profiles adaptively so that the chord / twist between neighbouring
+            profiles stay within rad_tol (fraction of tip radius) of blade_data, see funcs.place_radial_sections()
+        """
 
         assert len(self.stations) > 0
 
@@ -411,32 +522,28 @@ class Propeller(object):
             Info('Blade "skew" is not implemented in XROTOR, and therefore not reflected in XROTOR results.\n'
                  '  > Skew effects are considered negligible for PDT purposes for small enough skew angles.')
 
-        # clear out the existing xyz profiles
+        # clear out the existing xyz profiles (releasing any memory-map of the old file first)
+        self.blade_xyz_profiles = None
         funcs.delete_files_from_folder(self.bld_prof_folder)
 
         station = self.stations[0]
         # nondim_coords = station.foil.get_coords(n_interp=n_prof_pts)
-        nondim_coords = station.foil.get_coords_closed_te(n_interp=n_prof_pts)
-
-        self.blade_xyz_profiles = {}
-        for i, roR in enumerate(np.linspace(self.blade_data['r/R'][0], self.blade_data['r/R'][-1], n_profs)):
-            chord = np.interp(x=roR, xp=self.blade_data['r/R'], fp=self.blade_data['CH']) * self.radius
-            beta = np.rad2deg(np.interp(x=roR, xp=self.blade_data['r/R'], fp=self.blade_data['BE']))
-            skew = tot_skew * roR
-            r = roR * self.radius
+        nondim_coords = station.foil.get_coords_closed_te(n_interp=n_prof_pts, tol=prof_tol, spacing=prof_spacing)
 
-            prof_xyz = funcs.generate_3D_profile_points(nondim_xy_coords=nondim_coords, radius=r, axis_shift=0.25,
-                                                        chord_len=chord, beta_deg=beta, skew_deg=skew)
-            self.blade_xyz_profiles[i] = prof_xyz
+        if rad_tol is None:
+            roRs = np.linspace(self.blade_data['r/R'][0], self.blade_data['r/R'][-1], n_profs)
+        else:
+            roRs = funcs.place_radial_sections(roR=self.blade_data['r/R'], ch=self.blade_data['CH'],
+                                               be=self.blade_data['BE'], tol=rad_tol, max_sections=n_profs)
+        chords = np.interp(x=roRs, xp=self.blade_data['r/R'], fp=self.blade_data['CH']) * self.radius
+        betas = np.rad2deg(np.interp(x=roRs, xp=self.blade_data['r/R'], fp=self.blade_data['BE']))
+        profs_xyz = funcs.generate_3D_profile_points_batch(nondim_xy_coords=nondim_coords, radii=roRs * self.radius,
+                                                           axis_shift=0.25, chord_lens=chords, beta_degs=betas,
+                                                           skew_degs=tot_skew * roRs)[0]
+        self.blade_xyz_profiles = {i: prof_xyz for i, prof_xyz in enumerate(profs_xyz)}
 
         # now save them all for loading later
-        for key, val in self.blade_xyz_profiles.items():
-            savepath = os.path.join(self.bld_prof_folder, 'profile_{}.txt'.format(key))
-            xpts, ypts, zpts = val
-            with open(savepath, 'w') as f:
-                f.write('x, y, z\n')
-                for xp, yp, zp in zip(xpts, ypts, zpts):
-                    f.write('{:.6f}, {:.6f}, {:.6f}\n'.format(xp, yp, zp))
+        self.save_blade_profiles(save_txt=save_txt)
 
     def get_xrotor_output_text(self):
         line_num = 0
@@ -491,89 +598,9 @@ class Propeller(object):
         ax3d.set_title(title_txt)
 
         def do_ax3d():
-            blades = np.arange(self.xrotor_d['Nblds'])
-            angles = 360 / self.xrotor_d['Nblds'] * blades
-
-            # plot le and te lines
-            if LE:
-                for ang in angles:
-                    le_pts, te_pts = self.get_blade_le_te(rotate_deg=ang)
-                    le_line, = ax3d.plot3D(xs=[pt[0] for pt in le_pts], ys=[pt[1] for pt in le_pts],
-                                           zs=[pt[2] for pt in le_pts], c='k', lw=2)
-            else:
-                le_line = None
-
-            if TE:
-                for ang in angles:
-                    le_pts, te_pts = self.get_blade_le_te(rotate_deg=ang)
-                    te_line, = ax3d.plot3D(xs=[pt[0] for pt in te_pts], ys=[pt[1] for pt in te_pts],
-                                           zs=[pt[2] for pt in te_pts], c='k', ls='-.', lw=2)
-            else:
-                te_line = None
-
-            # plot stations
-            if chords_betas:
-                for ang in angles:
-                    chordlines = self.get_blade_chordlines(rotate_deg=ang)
-                    for line in chordlines:
-                        xs, ys, zs = zip(*line)
-                        station_line, = ax3d.plot3D(xs=xs, ys=ys, zs=zs, c='rosybrown', lw=1, ls='--')
-            else:
-                station_line = None
-
-            # plot station_params
-            if input_stations:
-                radii = self.xrotor_d['r/R'] * self.radius
-                chords = self.xrotor_d['C/R'] * self.radius
-                betas = self.xrotor_d['Beta0deg'].copy()
-                for roR, foil_name in self.station_params.items():
-                    # station dimensionalized parameters
-                    r = roR * self.radius
-                    ch = np.interp(r, radii, chords)
-                    beta = np.interp(r, radii, betas)
-                    sk = self.geo_params['tot_skew'] * roR
-
-                    # load the foil, shift, flip, and dimensionalize coordinates
-                    foil = Airfoil(foil_name, verbose=False)
-                    xc, yc, zc = funcs.generate_3D_profile_points(nondim_xy_coords=foil.get_coords(), radius=r,
-                                                                  axis_shift=0.25, chord_len=ch, beta_deg=beta,
-                                                                  skew_deg=sk)
-                    foils_line, = ax3d.plot3D(xs=xc, ys=yc, zs=zc, c='red', alpha=0.7, lw=1)
-            else:
-                foils_line = None
-
-            # plot interpolated profiles
-            if interp_profiles:
-                for prof_num, prof_xyz in self.blade_xyz_profiles.items():
-                    xc, yc, zc = prof_xyz
-                    prof_line, = ax3d.plot3D(xs=xc, ys=yc, zs=zc, c='maroon', lw=1, alpha=0.7)
-            else:
-                prof_line = None
-
-            # plot hub
-            if hub:
-                hub_thickness = abs(max([pt[2] for pt in le_pts]) - min([pt[2] for pt in te_pts]))
-                theta = np.linspace(0, np.pi * 2, 50)
-                hub_x = np.cos(theta) * self.hub_radius
-                hub_y = np.sin(theta) * self.hub_radius
-                top_zs = np.ones(len(hub_x)) * hub_thickness / 2
-                bot_zs = -np.ones(len(hub_x)) * hub_thickness / 2
-                hub_line, = ax3d.plot3D(xs=hub_x, ys=hub_y, zs=top_zs, c='gray', lw=2)
-                hub_line, = ax3d.plot3D(xs=hub_x, ys=hub_y, zs=bot_zs, c='gray', lw=2)
-            else:
-                hub_line = None
-
-            # set square axes and finish up formatting stuff
-            lim = (-self.radius * 0.65, self.radius * 0.65)
-            ax3d.set_xlim(lim)
-            ax3d.set_ylim(lim)
-            ax3d.set_zlim(lim)
-            leg_handles = [le_line, te_line, hub_line, foils_line, station_line, prof_line]
-            leg_labels = ['L.E.', 'T.E.', 'Hub', 'Input Stations', 'XROTOR Stations', 'Interpolated Geom.']
-
-            leg_labels = [leg_labels[n] for n in range(len(leg_handles)) if leg_handles[n] is not None]
-            leg_handles = [leg_handles[n] for n in range(len(leg_handles)) if leg_handles[n] is not None]
-            ax3d.legend(leg_handles, leg_labels, loc='upper left', bbox_to_anchor=(1.05, 1.0))
+            lines = self.get_geometry_polylines(LE=LE, TE=TE, chords_betas=chords_betas, hub=hub,
+                                                input_stations=input_stations, interp_profiles=interp_profiles)
+            self.draw_mpl3d_geometry(ax3d=ax3d, lines=lines, leg_anchor=(1.05, 1.0))
 
         def do_txt_ax():
             txt_ax.text(x=0.0, y=0.5, s=self.get_xrotor_output_text(), ha='left', va='center', fontfamily='consolas')
@@ -635,41 +662,44 @@ class Propeller(object):
         title_txt = 'Propeller Geometry - {}'.format(self.name)
         ax3d.set_title(title_txt)
 
-        blades = np.arange(self.xrotor_d['Nblds'])
-        angles = 360 / self.xrotor_d['Nblds'] * blades
+        lines = self.get_geometry_polylines(LE=LE, TE=TE, chords_betas=chords_betas, hub=hub,
+                                            input_stations=input_stations, interp_profiles=interp_profiles)
+        self.draw_mpl3d_geometry(ax3d=ax3d, lines=lines, leg_anchor=leg_anchor)
 
-        # plot le and te lines
-        if LE:
-            for ang in angles:
-                le_pts, te_pts = self.get_blade_le_te(rotate_deg=ang)
-                le_line, = ax3d.plot3D(xs=[pt[0] for pt in le_pts], ys=[pt[1] for pt in le_pts],
-                                       zs=[pt[2] for pt in le_pts], c='k', lw=2)
-        else:
-            le_line = None
+        return fig
+
+    def get_geometry_polylines(self, LE: bool = True, TE: bool = True, chords_betas: bool = True, hub: bool = True,
+                               input_stations: bool = True, interp_profiles: bool = True):
+        """
+        Collects all the lines of the 3D geometry plots, for all blades.
 
+        :return: dict of {category: list of (n_pts, 3) arrays}, the categories being "le", "te", "hub",
+            "input_stations", "chords" and "profiles"
+        """
+        # all blades' le, te and chordlines in one go
+        blade_geo = self.get_blade_geometry()
+        lines = {}
+
+        if LE:
+            lines['le'] = list(blade_geo['le'])
         if TE:
-            for ang in angles:
-                le_pts, te_pts = self.get_blade_le_te(rotate_deg=ang)
-                te_line, = ax3d.plot3D(xs=[pt[0] for pt in te_pts], ys=[pt[1] for pt in te_pts],
-                                       zs=[pt[2] for pt in te_pts], c='k', ls='-.', lw=2)
-        else:
-            te_line = None
+            lines['te'] = list(blade_geo['te'])
 
-        # plot stations
-        if chords_betas:
-            for ang in angles:
-                chordlines = self.get_blade_chordlines(rotate_deg=ang)
-                for line in chordlines:
-                    xs, ys, zs = zip(*line)
-                    station_line, = ax3d.plot3D(xs=xs, ys=ys, zs=zs, c='rosybrown', lw=1, ls='--')
-        else:
-            station_line = None
+        if hub:
+            le_pts, te_pts = blade_geo['le'][-1], blade_geo['te'][-1]
+            hub_thickness = abs(np.max(le_pts[:, 2]) - np.min(te_pts[:, 2]))
+            theta = np.linspace(0, np.pi * 2, 50)
+            hub_x = np.cos(theta) * self.hub_radius
+            hub_y = np.sin(theta) * self.hub_radius
+            lines['hub'] = [np.column_stack([hub_x, hub_y, np.full(len(theta), z)])
+                            for z in [hub_thickness / 2, -hub_thickness / 2]]
 
-        # plot station_params
+        # station_params
         if input_stations:
             radii = self.xrotor_d['r/R'] * self.radius
             chords = self.xrotor_d['C/R'] * self.radius
             betas = self.xrotor_d['Beta0deg'].copy()
+            lines['input_stations'] = []
             for roR, foil_name in self.station_params.items():
                 # station dimensionalized parameters
                 r = roR * self.radius
@@ -679,47 +709,39 @@ class Propeller(object):
 
                 # load the foil, shift, flip, and dimensionalize coordinates
                 foil = Airfoil(foil_name, verbose=False)
-                xc, yc, zc = funcs.generate_3D_profile_points(nondim_xy_coords=foil.get_coords(), radius=r,
-                                                              axis_shift=0.25, chord_len=ch, beta_deg=beta,
-                                                              skew_deg=sk)
-                foils_line, = ax3d.plot3D(xs=xc, ys=yc, zs=zc, c='red', alpha=0.7, lw=1)
-        else:
-            foils_line = None
+                xyz = funcs.generate_3D_profile_points(nondim_xy_coords=foil.get_coords(), radius=r, axis_shift=0.25,
+                                                       chord_len=ch, beta_deg=beta, skew_deg=sk)
+                lines['input_stations'].append(xyz.T)
 
-        # plot interpolated profiles
-        if interp_profiles:
-            for prof_num, prof_xyz in self.blade_xyz_profiles.items():
-                xc, yc, zc = prof_xyz
-                prof_line, = ax3d.plot3D(xs=xc, ys=yc, zs=zc, c='maroon', lw=1, alpha=0.7)
-        else:
-            prof_line = None
+        if chords_betas:
+            lines['chords'] = [line.T for chordlines in blade_geo['chordlines'] for line in chordlines]
 
-        # plot hub
-        if hub:
-            hub_thickness = abs(max([pt[2] for pt in le_pts]) - min([pt[2] for pt in te_pts]))
-            theta = np.linspace(0, np.pi * 2, 50)
-            hub_x = np.cos(theta) * self.hub_radius
-            hub_y = np.sin(theta) * self.hub_radius
-            top_zs = np.ones(len(hub_x)) * hub_thickness / 2
-            bot_zs = -np.ones(len(hub_x)) * hub_thickness / 2
-            hub_line, = ax3d.plot3D(xs=hub_x, ys=hub_y, zs=top_zs, c='gray', lw=2)
-            hub_line, = ax3d.plot3D(xs=hub_x, ys=hub_y, zs=bot_zs, c='gray', lw=2)
-        else:
-            hub_line = None
+        if interp_profiles:
+            lines['profiles'] = [np.asarray(self.blade_xyz_profiles[k]).T for k in sorted(self.blade_xyz_profiles)]
+
+        return lines
+
+    def draw_mpl3d_geometry(self, ax3d, lines: dict, leg_anchor: tuple):
+        # one line artist per category (polylines separated by NaNs), updated in place if ax3d already has them
+        geo_lines = {cat: ln for cat, ln in getattr(ax3d, 'pdt_geo_lines', {}).items() if ln in ax3d.lines}
+        for cat in [cat for cat in geo_lines if cat not in lines]:
+            geo_lines.pop(cat).remove()
+        for cat, polylines in lines.items():
+            xs, ys, zs = funcs.join_polylines(polylines).T
+            if cat in geo_lines:
+                geo_lines[cat].set_data_3d(xs, ys, zs)
+            else:
+                geo_lines[cat], = ax3d.plot3D(xs, ys, zs, **_MPL_GEO_STYLES[cat])
+        ax3d.pdt_geo_lines = geo_lines
 
         # set square axes and finish up formatting stuff
         lim = (-self.radius * 0.65, self.radius * 0.65)
         ax3d.set_xlim(lim)
         ax3d.set_ylim(lim)
         ax3d.set_zlim(lim)
-        leg_handles = [le_line, te_line, hub_line, foils_line, station_line, prof_line]
-        leg_labels = ['L.E.', 'T.E.', 'Hub', 'Input Stations', 'XROTOR Stations', 'Interpolated Geom.']
-
-        leg_labels = [leg_labels[n] for n in range(len(leg_handles)) if leg_handles[n] is not None]
-        leg_handles = [leg_handles[n] for n in range(len(leg_handles)) if leg_handles[n] is not None]
-        ax3d.legend(leg_handles, leg_labels, loc='upper left', bbox_to_anchor=leg_anchor)
-
-        return fig
+        leg_cats = [cat for cat in _GEO_LABELS if cat in geo_lines]
+        ax3d.legend([geo_lines[cat] for cat in leg_cats], [_GEO_LABELS[cat] for cat in leg_cats], loc='upper left',
+                    bbox_to_anchor=leg_anchor)
 
     def plot_gl3d_geometry(self, LE: bool = True, TE: bool = True, chords_betas: bool = True, hub: bool = True,
                             input_stations: bool = True, interp_profiles: bool = True, view=None):
@@ -731,92 +753,72 @@ class Propeller(object):
         else:
             pass
 
-        blades = np.arange(self.xrotor_d['Nblds'])
-        angles = 360 / self.xrotor_d['Nblds'] * blades
-
-        # plot le and te lines
-        if LE:
-            for ang in angles:
-                le_pts, te_pts = self.get_blade_le_te(rotate_deg=ang)
-                le_line = gl.GLLinePlotItem(pos=le_pts, color=[0.5, 0.5, 0.5, 1.0], width=2, antialias=False,
-                                            mode='line_strip', glOptions='opaque')
-                view.addItem(le_line)
-
-        if TE:
-            for ang in angles:
-                le_pts, te_pts = self.get_blade_le_te(rotate_deg=ang)
-                te_line = gl.GLLinePlotItem(pos=te_pts, color=[0.5, 0.5, 0.5, 1.0], width=2, antialias=False,
-                                            mode='line_strip', glOptions='opaque')
-                view.addItem(te_line)
-
-        # plot stations
-        if chords_betas:
-            for ang in angles:
-                chordlines = self.get_blade_chordlines(rotate_deg=ang)
-                for line in chordlines:
-                    station_line = gl.GLLinePlotItem(pos=line, color=[i / 255 for i in [245, 66, 66, 255]],
-                                                     width=2, antialias=False, mode='line_strip', glOptions='opaque')
-                    view.addItem(station_line)
-
-        # plot station_params
-        if input_stations:
-            radii = self.xrotor_d['r/R'] * self.radius
-            chords = self.xrotor_d['C/R'] * self.radius
-            betas = self.xrotor_d['Beta0deg'].copy()
-            for roR, foil_name in self.station_params.items():
-                # station dimensionalized parameters
-                r = roR * self.radius
-                ch = np.interp(r, radii, chords)
-                beta = np.interp(r, radii, betas)
-                sk = self.geo_params['tot_skew'] * roR
-
-                # load the foil, shift, flip, and dimensionalize coordinates
-                foil = Airfoil(foil_name, verbose=False)
-                xc, yc, zc = funcs.generate_3D_profile_points(nondim_xy_coords=foil.get_coords(), radius=r,
-                                                              axis_shift=0.25, chord_len=ch, beta_deg=beta,
-                                                              skew_deg=sk)
-                coords = list(zip(xc, yc, zc))
-                foils_line = gl.GLLinePlotItem(pos=coords, color=[i / 255 for i in [5, 0, 163, 255]], width=2, antialias=False,
-                                               mode='line_strip', glOptions='opaque')
-                view.addItem(foils_line)
-
-        # plot interpolated profiles
-        if interp_profiles:
-            for prof_num, prof_xyz in self.blade_xyz_profiles.items():
-                xc, yc, zc = prof_xyz
-                coords = list(zip(xc, yc, zc))
-                prof_line = gl.GLLinePlotItem(pos=coords, color=[i / 255 for i in [163, 0, 0, 200]], width=2,
-                                              antialias=False, mode='line_strip', glOptions='opaque')
-                view.addItem(prof_line)
-
-        # plot hub
-        if hub:
-            hub_thickness = abs(max([pt[2] for pt in le_pts]) - min([pt[2] for pt in te_pts]))
-            theta = np.linspace(0, np.pi * 2, 50)
-            hub_x = np.cos(theta) * self.hub_radius
-            hub_y = np.sin(theta) * self.hub_radius
-            top_zs = np.ones(len(hub_x)) * hub_thickness / 2
-            bot_zs = -np.ones(len(hub_x)) * hub_thickness / 2
-            hub_line = gl.GLLinePlotItem(pos=list(zip(hub_x, hub_y, top_zs)), color=[0.5, 0.5, 0.5, 1.0], width=2,
-                                         antialias=False, mode='line_strip', glOptions='opaque')
-            view.addItem(hub_line)
-            hub_line_bot = gl.GLLinePlotItem(pos=list(zip(hub_x, hub_y, bot_zs)), color=[0.5, 0.5, 0.5, 1.0], width=2,
-                                                          antialias=False, mode='line_strip', glOptions='opaque')
-            view.addItem(hub_line_bot)
+        # one line item per category (all segments in one vertex buffer), updated in place if view already has them
+        lines = self.get_geometry_polylines(LE=LE, TE=TE, chords_betas=chords_betas, hub=hub,
+                                            input_stations=input_stations, interp_profiles=interp_profiles)
+        geo_items = {cat: item for cat, item in getattr(view, 'pdt_geo_items', {}).items() if item in view.items}
+        for cat in [cat for cat in geo_items if cat not in lines and cat != 'grid']:
+            view.removeItem(geo_items.pop(cat))
+        for cat, polylines in lines.items():
+            pos = funcs.polylines_to_segments(polylines)
+            if cat in geo_items:
+                geo_items[cat].setData(pos=pos)
+            else:
+                geo_items[cat] = gl.GLLinePlotItem(pos=pos, width=2, antialias=False, mode='lines', glOptions='opaque',
+                                                   **_GL_GEO_STYLES[cat])
+                view.addItem(geo_items[cat])
 
         # finish up formatting stuff
         lim = self.radius * 2.5
         view.setCameraPosition(distance=lim, azimuth=-90)
-        zgrid = gl.GLGridItem()
-        zgrid.setSize(2, 2, 2)
-        zgrid.setSpacing(.2, .2, .2)
-        zgrid.translate(0, 0, -0.5)
-        view.addItem(zgrid)
+        if 'grid' not in geo_items:
+            geo_items['grid'] = zgrid = gl.GLGridItem()
+            zgrid.setSize(2, 2, 2)
+            zgrid.setSpacing(.2, .2, .2)
+            zgrid.translate(0, 0, -0.5)
+            view.addItem(zgrid)
+        view.pdt_geo_items = geo_items
 
         return view
 
+    def get_wvel_arrows(self, total: bool = True, axial: bool = False, tangential: bool = False, plot_every: int = 3,
+                        wvel: dict = None):
+        """
+        Induced velocity vectors at the blade quarter-chord points (every plot_every-th XROTOR station).
+
+        :param wvel: dict with "r/R", "VA", "VT" and "VD" arrays, defaults to the design point (blade_data), or e.g. one
+            of wvel_data.datapoints for another operating point (interpolated onto the XROTOR stations if needed)
+        :return: (roots, tips, colors) arrays, see Batched3DArrows.set_data()
+        """
+        wvel = self.blade_data if wvel is None else wvel
+        q_chord_pts = np.array(self.get_blade_quarter_chords())
+        for key in ['r/R', 'VA', 'VT', 'VD']:
+            if key not in wvel:
+                raise Error('Velocity data is missing "{}" (has: {})'.format(key, ', '.join(wvel)))
+
+        def station_vals(key):
+            vals = np.asarray(wvel[key], dtype=float)
+            if len(vals) != len(q_chord_pts):
+                vals = np.interp(self.xrotor_d['r/R'], wvel['r/R'], vals)
+            return vals[::plot_every]
+
+        pts = q_chord_pts[::plot_every]
+        va, vt, vd = station_vals('VA'), station_vals('VT'), station_vals('VD')
+        zeros = np.zeros(len(pts))
+        comps = [(total, np.column_stack([-vd, vt, -va]), (0, 0, 1, 1)),
+                 (axial, np.column_stack([zeros, zeros, -va]), (.05, .65, .13, 1)),
+                 (tangential, np.column_stack([zeros, vt, zeros]), (.92, .84, .2, 1))]
+        comps = [(vecs, color) for show, vecs, color in comps if show]
+        if len(comps) == 0:
+            return np.zeros((0, 3)), np.zeros((0, 3)), np.zeros((0, 4))
+
+        roots = np.vstack([pts] * len(comps))
+        tips = roots + np.vstack([vecs for vecs, _ in comps])
+        colors = np.vstack([np.tile(color, (len(pts), 1)) for _, color in comps])
+        return roots, tips, colors
+
     def plot_gl3d_wvel_data(self, total: bool = True, axial: bool = False, tangential: bool = False, view=None,
-                            plot_every: int = 3):
+                            plot_every: int = 3, wvel: dict = None):
         if view is None:
             pg.mkQApp()
             self.gl_wvel_view = view = gl.GLViewWidget()
@@ -825,97 +827,62 @@ class Propeller(object):
         else:
             pass
 
-        blades = np.arange(self.xrotor_d['Nblds'])
-        angles = 360 / self.xrotor_d['Nblds'] * blades
-
         self.gl3d_wvel_view = view = self.plot_gl3d_geometry(view=view)
 
-        # plot vel vectors
-        q_chord_pts = self.get_blade_quarter_chords()
-        assert len(self.blade_data['r/R']) == len(q_chord_pts)
-        for i, pt in enumerate(q_chord_pts):
-            if i % plot_every == 0:
-                va = self.blade_data['VA'][i]
-                vt = self.blade_data['VT'][i]
-                vd = self.blade_data['VD'][i]
-                if total:
-                    vector_root = pt
-                    vector_tip = pt[0] - vd, pt[1] + vt, pt[2] - va
-                    vector = Custom3DArrow(view=view, tip_root=[vector_tip, vector_root], width=3)
-                if axial:
-                    vector_root = pt
-                    vector_tip = pt[0], pt[1], pt[2] - va
-                    vector = Custom3DArrow(view=view, tip_root=[vector_tip, vector_root], width=3, color=(.05, .65, .13, 1))
-                if tangential:
-                    vector_root = pt
-                    vector_tip = pt[0], pt[1] + vt, pt[2]
-                    vector = Custom3DArrow(view=view, tip_root=[vector_tip, vector_root], width=3, color=(.92, .84, .2, 1))
+        # plot vel vectors, all arrows in 2 GL items that are updated in place if view already has them
+        arrows = getattr(view, 'pdt_wvel_arrows', None)
+        if arrows is None or any(item not in view.items for item in arrows.items):
+            if arrows is not None:
+                for item in [item for item in arrows.items if item in view.items]:
+                    view.removeItem(item)
+            view.pdt_wvel_arrows = arrows = Batched3DArrows(view=view, width=3)
+        arrows.set_data(*self.get_wvel_arrows(total=total, axial=axial, tangential=tangential, plot_every=plot_every,
+                                              wvel=wvel))
 
         return view
 
     def generate_stl_geometry(self, plot_after: bool = True, verbose: bool = True):
-        n_prof = len(self.blade_xyz_profiles)
-        n_pts = np.max(np.shape(self.blade_xyz_profiles[0]))
-        n_main_surf = (n_prof - 1) * 2 * (n_pts - 1)
-        n_root = n_pts - 3
-        n_tip = n_pts - 3
-        n_tri = n_main_surf + n_root + n_tip
-
-        mdata = np.zeros(n_tri, dtype=mesh.Mesh.dtype)
-
-        tri_idx = 0
-
-        # root profile
-        vectors = funcs.compute_profile_trimesh(profile_coords=self.blade_xyz_profiles[0])  # outwards
-        # vectors = funcs.compute_profile_trimesh(profile_coords=self.blade_xyz_profiles[0], reverse_order=True)  # inwards
-        for vec in vectors:
-            mdata['vectors'][tri_idx] = np.array(vec)
-            tri_idx += 1
-
-        # tip profile
-        vectors = funcs.compute_profile_trimesh(profile_coords=self.blade_xyz_profiles[n_prof - 1], reverse_order=True)    # outwards
-        # vectors = funcs.compute_profile_trimesh(profile_coords=self.blade_xyz_profiles[n_prof - 1])    # inwards
-        for vec in vectors:
-            mdata['vectors'][tri_idx] = np.array(vec)
-            tri_idx += 1
-
-        # iterate over the profiles
-        for k in range(n_prof - 1):
-            xyz_prof = self.blade_xyz_profiles[k]
-            nxt_prof = self.blade_xyz_profiles[k + 1]
-
-            # inter-profile surfaces
-            for i in range(n_pts - 1):  # right hand rule to get normal direction correct
-                a = xyz_prof[:, i]  # a is a point-coordinate in (x, y, z) format
-                b = nxt_prof[:, i]  # same for b-f
-                c = nxt_prof[:, i + 1]
-                d = a.copy()
-                e = c.copy()
-                f = xyz_prof[:, i + 1]
-
-                # outwards
-                mdata['vectors'][tri_idx] = np.array([a, b, c])      # populate the array of triangle vectors
-                mdata['vectors'][tri_idx + 1] = np.array([d, e, f])  # going in order, 2 triangles per iteration
-
-                # inwards
-                # mdata['vectors'][tri_idx] = np.array([c, b, a])      # populate the array of triangle vectors
-                # mdata['vectors'][tri_idx + 1] = np.array([f, e, d])  # going in order, 2 triangles per iteration
-
-                tri_idx += 2
-
-        m = mesh.Mesh(mdata)
-
-        if os.path.exists(self.stl_fpath):
-            os.remove(self.stl_fpath)
-        m.save(filename=self.stl_fpath)
+        profiles = np.stack([self.blade_xyz_profiles[k] for k in sorted(self.blade_xyz_profiles)])
+        records = funcs.build_stl_records(funcs.compute_blade_trimesh(profiles=profiles))
+        funcs.write_binary_stl(fpath=self.stl_fpath, records=records, header=self.name)
 
-        self.stl_mesh = mesh.Mesh.from_file(self.stl_fpath)
+        self.stl_mesh = mesh.Mesh(records, calculate_normals=False, name=self.name)
         if verbose:
-            Info('Saved STL file and reloaded into propeller object: "{}"'.format(self.stl_fpath))
+            Info('Saved STL file: "{}"'.format(self.stl_fpath))
 
         if plot_after:
             self.plot_stl_mesh()
 
+    def generate_rotor_mesh(self, fpath: str = None, hub: bool = True, verbose: bool = True):
+        """
+        Writes the full rotor (nblades rotated copies of the blade, plus a hub cylinder of hub_radius) to a mesh file,
+        streamed one blade at a time.  The format follows the file extension: ".ply" / ".obj" (indexed, shared
+        vertices) or ".stl".
+
+        :param fpath: defaults to "<name>_rotor.ply" in the propeller folder
+        :return: fpath
+        """
+        if fpath is None:
+            fpath = os.path.join(self.save_folder, '{}_rotor.ply'.format(self.name))
+
+        profiles = np.stack([self.blade_xyz_profiles[k] for k in sorted(self.blade_xyz_profiles)])
+        blade_verts, blade_faces = funcs.dedupe_mesh_vertices(funcs.compute_blade_trimesh(profiles=profiles))
+
+        hub_verts, hub_faces = None, None
+        if hub:
+            hub_thickness = np.ptp(profiles[0][2])
+            hub_verts, hub_faces = funcs.compute_hub_mesh(hub_radius=self.hub_radius, thickness=hub_thickness)
+
+        def iter_parts():
+            return funcs.iter_rotor_mesh_parts(blade_verts=blade_verts, blade_faces=blade_faces,
+                                               nblades=self.nblades, hub_verts=hub_verts, hub_faces=hub_faces)
+        n_verts, n_faces = funcs.write_mesh_file(fpath=fpath, iter_parts=iter_parts,
+                                                 header='{} rotor'.format(self.name))
+        if verbose:
+            Info('Saved rotor mesh ({} vertices, {} triangles): "{}"'.format(n_verts, n_faces, fpath))
+
+        return fpath
+
     def load_stl_geometry(self, verbose: bool = True):
         if os.path.exists(self.stl_fpath):
             self.stl_mesh = mesh.Mesh.from_file(self.stl_fpath)
@@ -958,49 +925,198 @@ class Propeller(object):
         funcs.run_xrotor_oper(xrr_file=self.xrr_file, vorform=self.design_vorform, adva=adva, rpm=rpm, thrust=thrust,
                               torque=torque, power=power, velo=velo, xrotor_verbose=xrotor_verbose)
 
-    def analyze_sweep(self, velo_vals: list, sweep_param: str, sweep_vals: list, verbose: bool = True,
-                      xrotor_verbose: bool = False, vorform: str = None, prog_signal=None):
+    def iter_sweep(self, velo_vals: list, sweep_param: str, sweep_vals: list, xrotor_verbose: bool = False,
+                   vorform: str = None, workers: int = 1, points: list = None):
+        """
+        Generator version of analyze_sweep(), yields (velo_val, sweep_val, oper_dict, err_str) as each operating point
+        finishes (in completion order when workers > 1), and adds each successful point to self.oper_data and
+        self.wvel_data as it comes in.  Stopping the iteration early (break / close()) cancels the remaining points.
+
+        :param workers: number of XROTOR runs to have going at once, each in its own scratch folder
+        :param points: list of (velo_val, sweep_val) to run instead of the full velo_vals x sweep_vals grid
+        """
         if sweep_param not in ['adva', 'rpm', 'thrust', 'power', 'torque']:
             raise Error('"sweep_param" must be one of ("adva", "rpm", "thrust", "power", "torque")')
 
         vorform = self.design_vorform if vorform is None else vorform
+        if points is None:
+            points = [(velo_val, val) for velo_val in velo_vals for val in sweep_vals]
+
+        def run_point(velo_val, val):
+            workdir = tempfile.mkdtemp(dir=get_prop_db()) if workers > 1 else None
+            try:
+                return funcs.run_xrotor_oper(xrr_file=self.xrr_file, vorform=vorform, velo=velo_val, verbose=False,
+                                             xrotor_verbose=xrotor_verbose, workdir=workdir, **{sweep_param: val})
+            finally:
+                if workdir is not None:
+                    shutil.rmtree(workdir, ignore_errors=True)
+
+        def point_result(velo_val, val, run):
+            try:
+                oper_output, wvel_output = run()
+            except Error as e:
+                err_str = 'Failed to get XROTOR oper results for vel={}, {}={}\n{}'.format(velo_val, sweep_param, val, e)
+                return velo_val, val, None, err_str
+
+            # same keys as the saved file names, new dicts each time so readers in other threads never see them change
+            key = self._oper_key(oper_output)
+            self.oper_data.datapoints = {**self.oper_data.datapoints, key: oper_output}
+            self.wvel_data.datapoints = {**self.wvel_data.datapoints, key: wvel_output}
+            return velo_val, val, oper_output, None
+
+        if workers <= 1:
+            for velo_val, val in points:
+                yield point_result(velo_val, val, lambda: run_point(velo_val, val))
+            return
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {executor.submit(run_point, velo_val, val): (velo_val, val) for velo_val, val in points}
+        try:
+            for fut in as_completed(futures):
+                velo_val, val = futures[fut]
+                yield point_result(velo_val, val, fut.result)
+        finally:
+            for fut in futures:
+                fut.cancel()
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def _oper_key(oper_output: dict):
+        # (speed, rpm) key of a sweep point in oper_data / wvel_data, rounded the same as its saved file names
+        return (float('{:.0f}'.format(100 * oper_output['speed(m/s)'])) / 100,
+                float('{:.0f}'.format(oper_output['rpm'])))
+
+    def _remove_sweep_point(self, key: tuple):
+        # drops one (speed, rpm) sweep point from oper_data / wvel_data and deletes its files
+        self.oper_data.datapoints = {k: v for k, v in self.oper_data.datapoints.items() if k != key}
+        self.wvel_data.datapoints = {k: v for k, v in self.wvel_data.datapoints.items() if k != key}
+        fname = 'velo_{:.0f}_rpm_{:.0f}'.format(100 * key[0], key[1])
+        for fpath in [os.path.join(self.oper_data_dir, fname + '.oper'), os.path.join(self.wvel_data_dir, fname + '.wvel')]:
+            if os.path.exists(fpath):
+                os.remove(fpath)
 
-        total_pnts = len(velo_vals) * len(sweep_vals)
+    def analyze_sweep(self, velo_vals: list, sweep_param: str, sweep_vals: list, verbose: bool = True,
+                      xrotor_verbose: bool = False, vorform: str = None, prog_signal=None, workers: int = 1,
+                      cascade: list = None, cascade_param: str = 'Efficiency', adaptive: bool = False,
+                      tol: float = 0.02, max_points: int = None, max_depth: int = 4,
+                      refine_params: tuple = ('Efficiency', 'thrust(N)', 'power(W)')):
+        """
+        :param cascade: multi-fidelity policy instead of a single vorform, list of (vorform, top_k) stages (see
+            funcs.validate_fidelity_cascade() and settings.DEFAULT_FIDELITY_CASCADE): every point is run with the
+            first stage's vorform, then the top_k of those by cascade_param are re-run with the next one, and so on.
+            Each re-run replaces the lower fidelity result of that point, the vorform each saved point was solved with
+            is in its output header, see funcs.xrotor_op_vorform().
+        :param cascade_param: oper output the points are ranked by (largest first) to promote them
+        :param adaptive: treat velo_vals x sweep_vals (at least 3 of each to refine in both directions) as a coarse
+            grid and keep bisecting the intervals where any of refine_params curves by more than tol (relative to its
+            range) or peaks, see funcs.sweep_refinement_points(), until none do or max_points have been run
+        :param max_points: budget of XROTOR runs of the adaptive sweep (cascade re-runs not included), defaults to 4x
+            the coarse grid
+        :param max_depth: the intervals of the coarse grid are bisected at most this many times
+        """
+        points = [(velo_val, val) for velo_val in velo_vals for val in sweep_vals]
+        if cascade is None:
+            stages = [(vorform, None)]
+        else:
+            if vorform is not None:
+                raise Error('Cannot give both "vorform" and "cascade" into analyze_sweep()')
+            stages = funcs.validate_fidelity_cascade(cascade)
+        if adaptive:
+            max_points = 4 * len(points) if max_points is None else max(max_points, len(points))
+            min_spacing = tuple([np.ptp(vals) / 2 ** max_depth if len(vals) > 1 else np.inf
+                                 for vals in [velo_vals, sweep_vals]])
+
+        def runs_left(n_points: int, i: int):
+            # runs of stage i on n_points and of the stages after it, at most
+            return n_points + sum([min(top_k, n_points) for _, top_k in stages[i + 1:]])
+
+        # an estimate until the refinement stops / the points that made it through each stage are known, then rescaled
+        total_pnts = runs_left(max_points if adaptive else len(points), 0)
         if verbose:
-            info_str = 'Analyzing "{}" across a sweep of {} operating points'.format(self.name, total_pnts)
+            info_str = 'Analyzing "{}" across a sweep of {} operating points'.format(self.name, len(points))
+            if adaptive:
+                info_str += ' (refined adaptively up to {})'.format(max_points)
+            if len(stages) > 1:
+                info_str += ' ({} runs across {})'.format(total_pnts, ' -> '.join([vf for vf, _ in stages]))
             if prog_signal is not None:
                 prog_signal.emit(0, [info_str])
             else:
                 Info(info_str)
+
+        results = {}  # point -> (stage index, oper output) of its highest fidelity result so far
         count = 0
-        for velo_val in velo_vals:
-            for v, val in enumerate(sweep_vals):
+
+        def run_points(stage_points: list, i: int, stage_vorform: str):
+            nonlocal count
+            for velo_val, val, oper_output, err_str in self.iter_sweep(
+                    velo_vals=velo_vals, sweep_param=sweep_param, sweep_vals=sweep_vals, xrotor_verbose=xrotor_verbose,
+                    vorform=stage_vorform, workers=workers, points=stage_points):
                 count += 1
                 if verbose:
-                    info_str = 'Analyzing sweep point # {} / {}'.format(count, total_pnts)
+                    info_str = 'Analyzed sweep point # {} / {}'.format(count, total_pnts)
                     if prog_signal is not None:
                         prog_signal.emit(count / total_pnts * 100, [info_str])
                     else:
                         Info(info_str)
-                try:
-                    funcs.run_xrotor_oper(xrr_file=self.xrr_file, vorform=vorform, velo=velo_val, verbose=False,
-                                          xrotor_verbose=xrotor_verbose, **{sweep_param: val})
-                except Error as e:
-                    warn_str = 'Failed to get XROTOR oper results for vel={}, {}={}\n{}'.format(velo_val, sweep_param, val, e)
+                if err_str is not None:
                     if prog_signal is not None:
-                        prog_signal.emit(None, [warn_str])
+                        prog_signal.emit(None, [err_str])
                     else:
-                        Warning(warn_str)
-                        pass
+                        Warning(err_str)
+                    continue
+
+                old = results.get((velo_val, val))
+                if old is not None and self._oper_key(old[1]) != self._oper_key(oper_output):
+                    self._remove_sweep_point(self._oper_key(old[1]))  # e.g. a thrust point trimmed to another rpm
+                results[velo_val, val] = (i, oper_output)
+
+        for i, (stage_vorform, top_k) in enumerate(stages):
+            if i > 0:  # promote the best of the points that made it through the previous stage
+                ranked = sorted([pt for pt in points if pt in results and results[pt][0] == i - 1],
+                                key=lambda pt: -results[pt][1].get(cascade_param, -np.inf))
+                points = ranked[:top_k]
+                total_pnts = count + runs_left(len(points), i)
+
+            run_points(stage_points=points, i=i, stage_vorform=stage_vorform)
+            while adaptive and i == 0 and len(points) < max_points:
+                sweep_results = {pt: results[pt][1] if pt in results else None for pt in points}
+                new_points = funcs.sweep_refinement_points(results=sweep_results, params=refine_params, tol=tol,
+                                                           min_spacing=min_spacing, peak_param=cascade_param)
+                new_points = new_points[:max_points - len(points)]
+                if len(new_points) == 0:
+                    break
+                run_points(stage_points=new_points, i=i, stage_vorform=stage_vorform)
+                points = points + new_points
+            if adaptive and i == 0:
+                total_pnts = count + runs_left(len(points), i) - len(points)
+                if verbose and prog_signal is not None and count == total_pnts:  # no cascade runs left
+                    prog_signal.emit(100., None)
 
-        self.oper_data.load_oper_sweep_results()
-        self.wvel_data.load_wvel_sweep_results()
         if verbose:
             if prog_signal is not None:
                 prog_signal.emit(0, 'Done!')
             else:
                 Info('Done!')
 
+    def analyze_operating_map(self, velo_vals: list, rpm_vals: list, outputs: list = None):
+        """
+        Fast (no XROTOR runs) evaluation of this propeller at each of the (velo, rpm) pairs, see
+        funcs.analyze_operating_map().
+
+        :return: np.array of shape (n_points, n_outputs), outputs ordered as settings.FAST_OPER_OUTPUTS by default
+        """
+        return funcs.analyze_operating_map(props=[self], velo_vals=velo_vals, rpm_vals=rpm_vals, outputs=outputs)[0]
+
+    @staticmethod
+    def analyze_operating_maps(props: list, velo_vals: list, rpm_vals: list, outputs: list = None):
+        """
+        Fast (no XROTOR runs) evaluation of many propellers at the same (velo, rpm) pairs in one batched computation,
+        see funcs.analyze_operating_map().
+
+        :return: np.array of shape (n_props, n_points, n_outputs)
+        """
+        return funcs.analyze_operating_map(props=props, velo_vals=velo_vals, rpm_vals=rpm_vals, outputs=outputs)
+
     def clear_sweep_data(self):
         if os.path.exists(self.oper_data_dir):
             shutil.rmtree(self.oper_data_dir)
@@ -1008,6 +1124,7 @@ class Propeller(object):
         if os.path.exists(self.wvel_data_dir):
             shutil.rmtree(self.wvel_data_dir)
             Info('Removed {} and its contents'.format(self.wvel_data_dir))
+        self._oper_data, self._wvel_data = None, None  # sweeps merge into these, so they'd keep the removed points
 
 
 class PropellerOperData:
@@ -0,0 +1,150 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import matplotlib
+import matplotlib.pyplot as plt
+from propeller_design_tools.airfoil import Airfoil
+from propeller_design_tools.propeller import Propeller
+from propeller_design_tools.settings import get_prop_db
+from propeller_design_tools.user_io import Info, Error, Warning
+
+
+# columns of the report summary table -> (source, key), source being a Propeller attr or the XROTOR design point output
+REPORT_SUMMARY_COLUMNS = {'name': ('prop', 'name'), 'nblades': ('prop', 'nblades'), 'radius(m)': ('prop', 'radius'),
+                          'hub_radius(m)': ('prop', 'hub_radius'), 'speed(m/s)': ('xrotor', 'speed(m/s)'),
+                          'rpm': ('xrotor', 'rpm'), 'adv. ratio': ('xrotor', 'adv. ratio'),
+                          'thrust(N)': ('xrotor', 'thrust(N)'), 'power(W)': ('xrotor', 'power(W)'),
+                          'torque(N-m)': ('xrotor', 'torque(N-m)'), 'Efficiency': ('xrotor', 'Efficiency'),
+                          'Eff ideal': ('xrotor', 'Eff ideal'), 'Ct': ('xrotor', 'Ct'), 'Cp': ('xrotor', 'Cp'),
+                          'disk_loading(N/m^2)': ('prop', 'disk_loading'), 'n_oper_points': ('prop', 'n_oper_points')}
+
+# sweep result plots of the report, (y_param, family_param) vs speed
+REPORT_OPER_PLOTS = [('Efficiency', 'rpm'), ('thrust(N)', 'rpm'), ('power(W)', 'rpm')]
+
+
+def _use_headless_backend():
+    # renders without any display / GUI toolkit (process pool initializer, and the in-process path)
+    matplotlib.use('Agg', force=True)
+
+
+def _save_close(fig, out_dir: str, name: str, formats: tuple, dpi: int):
+    try:
+        fpaths = []
+        for fmt in formats:
+            fpath = os.path.join(out_dir, '{}.{}'.format(name, fmt))
+            fig.savefig(fpath, dpi=dpi)
+            fpaths.append(fpath)
+        return fpaths
+    finally:
+        plt.close(fig)
+
+
+def render_design_report(prop: str, out_dir: str, formats: tuple = ('png', 'svg'), dpi: int = 100,
+                         verbose: bool = False):
+    """
+    Renders the report panels of one propeller into out_dir/<name>/ (design point panel, geometry, station fits, foil
+    polars and sweep results if there are any), closing every figure as soon as it's saved.
+
+    :param prop: propeller name, folder path or Propeller object
+    :return: dict summary row (see REPORT_SUMMARY_COLUMNS), with the list of written files under "files"
+    """
+    if not isinstance(prop, Propeller):
+        prop = Propeller(prop, verbose=verbose)
+    prop_dir = os.path.join(out_dir, prop.name)
+    os.makedirs(prop_dir, exist_ok=True)
+
+    files = []
+    files += _save_close(prop.plot_design_point_panel(), prop_dir, 'design_point', formats, dpi)
+    files += _save_close(prop.plot_mpl3d_geometry(), prop_dir, 'geometry', formats, dpi)
+    for i, station in enumerate(prop.stations):
+        files += _save_close(station.plot_xrotor_fit_params(), prop_dir, 'station_{}_fit'.format(i + 1), formats, dpi)
+
+    for foil_name in sorted(set(prop.station_params.values())):
+        foil = Airfoil(foil_name, verbose=verbose)
+        if len(foil.polar_data) > 0:
+            fig, _ = foil.plot_polar_data(x_param='alpha', y_param='CL')
+            files += _save_close(fig, prop_dir, 'polars_{}'.format(os.path.splitext(foil_name)[0]), formats, dpi)
+
+    oper_data = prop.oper_data
+    n_oper_points = 0 if oper_data is None else len(oper_data)
+    if n_oper_points > 0:
+        for y_param, family_param in REPORT_OPER_PLOTS:
+            fig = oper_data.plot(x_param='speed(m/s)', y_param=y_param, family_param=family_param)
+            fname = 'sweep_{}'.format(y_param.split('(')[0].lower())
+            files += _save_close(fig, prop_dir, fname, formats, dpi)
+
+    row = {}
+    for col, (source, key) in REPORT_SUMMARY_COLUMNS.items():
+        if source == 'xrotor':
+            row[col] = prop.xrotor_op_dict.get(key)
+        elif key == 'n_oper_points':
+            row[col] = n_oper_points
+        else:
+            row[col] = getattr(prop, key)
+    row['files'] = files
+
+    prop.clear_cached_data()
+    return row
+
+
+def _render_design_report_worker(prop: str, out_dir: str, formats: tuple, dpi: int):
+    # runs in a pool process, errors are returned as text so one bad design doesn't stop the batch
+    try:
+        return render_design_report(prop=prop, out_dir=out_dir, formats=formats, dpi=dpi), None
+    except Exception as e:
+        return None, str(e) if isinstance(e, Error) else '{}: {}'.format(type(e).__name__, e)
+
+
+def render_design_reports(props: list = None, out_dir: str = None, formats: tuple = ('png', 'svg'), dpi: int = 100,
+                          workers: int = 4, verbose: bool = True):
+    """
+    Renders a design report bundle for many propellers, headless (Agg backend) and in a pool of processes, plus a
+    "summary.csv" table of all the designs in out_dir.
+
+    :param props: propeller names or folder paths, defaults to every propeller in the database
+    :param out_dir: defaults to "reports" in the propeller database
+    :param workers: number of processes, <= 1 renders in this process (switching it to the Agg backend for the
+        duration, which closes any open pyplot figures)
+    :return: (list of summary rows, dict of {prop: error text} for the ones that failed)
+    """
+    if props is None:
+        props = [d for d in os.listdir(get_prop_db()) if os.path.isdir(os.path.join(get_prop_db(), d)) and
+                 os.path.exists(os.path.join(get_prop_db(), d, '{}.meta'.format(d)))]
+    if out_dir is None:
+        out_dir = os.path.join(get_prop_db(), 'reports')
+    os.makedirs(out_dir, exist_ok=True)
+
+    results, failures = {}, {}
+    if workers <= 1:
+        backend = matplotlib.get_backend()
+        _use_headless_backend()
+        try:
+            for prop in props:
+                results[prop] = _render_design_report_worker(prop, out_dir, formats, dpi)
+        finally:
+            matplotlib.use(backend, force=True)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_use_headless_backend) as pool:
+            futs = {pool.submit(_render_design_report_worker, prop, out_dir, formats, dpi): prop for prop in props}
+            for fut in as_completed(futs):
+                results[futs[fut]] = fut.result()
+
+    rows = []
+    for prop in props:  # keep the input order in the table
+        row, err = results[prop]
+        if err is not None:
+            failures[prop] = err
+            Warning('Report for "{}" failed: {}'.format(prop, err.strip()))
+        else:
+            rows.append(row)
+
+    summary_fpath = os.path.join(out_dir, 'summary.csv')
+    with open(summary_fpath, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(REPORT_SUMMARY_COLUMNS), extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+    if verbose:
+        Info('Rendered {} / {} design reports to "{}"'.format(len(rows), len(props), out_dir))
+
+    return rows, failures
@@ -6,6 +6,12 @@ import pkg_resources
 
 VALID_OPER_PLOT_PARAMS = ['adv. ratio', 'J', 'speed(m/s)', 'rpm', 'thrust(N)', 'power(W)', 'torque(N-m)', 'Efficiency',
                           'Eff induced', 'Eff ideal', 'Pvisc(W)', 'Ct', 'Tc', 'Cp', 'Pc', 'Sigma']
+FAST_OPER_OUTPUTS = ['speed(m/s)', 'rpm', 'adv. ratio', 'J', 'thrust(N)', 'power(W)', 'torque(N-m)', 'Efficiency', 'Ct',
+                     'Cp', 'Tc', 'Pc']
+# XROTOR vortex formulations, cheapest / lowest fidelity first
+VORFORM_FIDELITY = ['pot', 'grad', 'vrtx']
+# default multi-fidelity evaluation policy, (vorform, number of the best results promoted to it), None = all of them
+DEFAULT_FIDELITY_CASCADE = [('pot', None), ('grad', 8), ('vrtx', 2)]
 
 
 def set_airfoil_database(path: str):
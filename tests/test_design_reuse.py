@@ -0,0 +1,22 @@
+import os
+import propeller_design_tools as pdt
+from propeller_design_tools import funcs
+
+
+def test_clone_propeller_copies_files(tmp_path):
+    src = os.path.join(os.path.dirname(pdt.__file__), 'prop_database', 'MyPropeller')
+    prop = funcs.clone_propeller(src_folder=src, name='Clone', dest_dir=str(tmp_path))
+    assert prop.name == 'Clone'
+    for dirpath, _, fnames in os.walk(tmp_path / 'Clone'):
+        for fname in fnames:
+            assert os.stat(os.path.join(dirpath, fname)).st_nlink == 1
+
+
+def test_find_design_by_fingerprint_sees_edited_meta_files(tmp_path):
+    os.makedirs(tmp_path / 'a')
+    meta = tmp_path / 'a' / 'a.meta'
+    meta.write_text('name: a\ndesign_fingerprint: abc\n')
+    assert funcs.find_design_by_fingerprint('abc', folders=[str(tmp_path)]) == str(tmp_path / 'a')
+    meta.write_text('name: a\ndesign_fingerprint: abcd\n')  # same folder, the folder's mtime doesn't change
+    assert funcs.find_design_by_fingerprint('abc', folders=[str(tmp_path)]) is None
+    assert funcs.find_design_by_fingerprint('abcd', folders=[str(tmp_path)]) == str(tmp_path / 'a')
@@ -0,0 +1,65 @@
+import os
+import numpy as np
+import pytest
+import propeller_design_tools as pdt
+
+
+SAMPLE_PROPS = ['MyPropeller', 'MyPropeller2', 'MyPropeller3']
+
+
+def load_sample_prop(name: str):
+    return pdt.Propeller(os.path.join(os.path.dirname(pdt.__file__), 'prop_database', name), verbose=False)
+
+
+@pytest.mark.parametrize('name', SAMPLE_PROPS)
+def test_operating_map_matches_xrotor_design_point(name):
+    prop = load_sample_prop(name)
+    op = prop.xrotor_op_dict
+    thrust, power = prop.analyze_operating_map(velo_vals=[op['speed(m/s)']], rpm_vals=[op['rpm']],
+                                               outputs=['thrust(N)', 'power(W)'])[0]
+    assert thrust == pytest.approx(op['thrust(N)'], rel=0.03)
+    assert power == pytest.approx(op['power(W)'], rel=0.03)
+
+
+@pytest.mark.parametrize('name', SAMPLE_PROPS)
+def test_operating_map_static_and_low_speed(name):
+    # stalled root stations at low speed must not turn the whole operating point into NaN
+    prop = load_sample_prop(name)
+    op = prop.xrotor_op_dict
+    velos = [0.0, 0.1 * op['speed(m/s)'], 0.2 * op['speed(m/s)'], op['speed(m/s)']]
+    res = prop.analyze_operating_map(velo_vals=velos, rpm_vals=[op['rpm']] * len(velos),
+                                     outputs=['thrust(N)', 'power(W)', 'Efficiency'])
+    assert np.all(np.isfinite(res))
+    assert np.all(res[:, :2] > 0)
+    assert res[0, 2] == 0
+    assert np.all(np.diff(res[:, 0]) < 0)  # thrust drops off with speed at a fixed rpm
+
+
+@pytest.mark.parametrize('name', SAMPLE_PROPS)
+def test_trim_operating_points_reaches_low_thrusts(name):
+    prop = load_sample_prop(name)
+    op = prop.xrotor_op_dict
+    thrusts = np.array([0.1, 0.2, 0.3, 1.0, 1.5]) * op['thrust(N)']
+    velos = [op['speed(m/s)']] * len(thrusts)
+    res = pdt.trim_operating_points(props=[prop], velo_vals=velos, thrust_vals=thrusts,
+                                    outputs=['thrust(N)', 'rpm'])[0]
+    assert np.all(np.abs(res[:, 0] - thrusts) / thrusts < 1e-3)
+    assert np.all(np.diff(res[:, 1]) > 0)  # more thrust at the same speed takes more rpm
+
+
+def test_deep_stall_is_flagged():
+    # the root of MyPropeller is deeply stalled statically: no real solution there, which has to be flagged / skipped
+    stalled, attached = load_sample_prop('MyPropeller'), load_sample_prop('MyPropeller2')
+    for prop, converged in [(stalled, 0.0), (attached, 1.0)]:
+        op = prop.xrotor_op_dict
+        res = prop.analyze_operating_map(velo_vals=[0.0, op['speed(m/s)']], rpm_vals=[op['rpm']] * 2,
+                                         outputs=['thrust(N)', 'converged'])
+        assert np.all(np.isfinite(res))
+        assert list(res[:, 1]) == [converged, 1.0]
+
+        trimmed = pdt.trim_operating_points(props=[prop], velo_vals=[0.0], thrust_vals=[0.5 * op['thrust(N)']],
+                                            outputs=['thrust(N)'])[0, 0, 0]
+        assert np.isnan(trimmed) if converged == 0 else np.isfinite(trimmed)
+
+        op_map = pdt.compute_operating_maps(props=[prop], velo_vals=[0.0], rpm_factors=[1.0])
+        assert np.isnan(op_map['thrust(N)'][0, 0, 0]) if converged == 0 else np.isfinite(op_map['thrust(N)'][0, 0, 0])
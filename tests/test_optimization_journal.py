@@ -0,0 +1,21 @@
+import os
+import shutil
+import propeller_design_tools as pdt
+from propeller_design_tools import funcs
+
+
+def test_loading_a_legacy_optimization_writes_nothing(tmp_path):
+    src = os.path.join(os.path.dirname(pdt.__file__), 'prop_database', 'MyPropeller')
+    shutil.copytree(src, tmp_path / 'MyPropeller', ignore=shutil.ignore_patterns('optimization'))
+    base = pdt.Propeller(str(tmp_path / 'MyPropeller'), verbose=False)
+    opt_dir = tmp_path / 'MyPropeller' / 'optimization'
+    os.mkdir(opt_dir)
+    funcs.clone_propeller(src_folder=src, name='vel-25.00_cl-0.50_rpm-5500.000', dest_dir=str(opt_dir))
+
+    opt = pdt.DutyCycleDesignOptimization(base, verbose=False)
+    assert len(opt.propellers) == 1
+    assert opt.journal is opt.journal
+    assert not os.path.exists(opt.journal.fpath)
+
+    opt._create_designs(specs=[], verbose=False)  # the scanned results get journaled once designs are created
+    assert list(opt.journal.load()) == [((25.0, 0.5, 5500.0), opt.base_vorform)]
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from propeller_design_tools.optimizations import ParetoFront, non_dominated_indices
+
+
+def brute_force_front(costs):
+    return [i for i, c in enumerate(costs) if not any(np.all(o <= c) and np.any(o < c) for o in costs)]
+
+
+@pytest.mark.parametrize('n_obj', [2, 3])
+def test_non_dominated_indices_matches_brute_force(n_obj):
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        costs = rng.integers(0, 6, size=(rng.integers(1, 40), n_obj)).astype(float)  # lots of ties and duplicates
+        assert list(non_dominated_indices(costs)) == brute_force_front(costs)
+
+
+def test_pareto_front_readd_replaces_values():
+    front = ParetoFront({'a': 'min', 'b': 'min'})
+    front.add('A', {'a': 0, 'b': 0})
+    front.add('B', {'a': 1, 'b': 1})
+    assert not front.add('A', {'a': 5, 'b': 5})
+    assert list(front.front) == ['B']
+
+    front = ParetoFront({'a': 'min', 'b': 'min'})
+    front.update({'A': {'a': 0, 'b': 0}, 'B': {'a': 1, 'b': 1}})
+    front.update({'A': {'a': 5, 'b': 5}})
+    assert list(front.front) == ['B']
+
+
+def test_pareto_front_matches_brute_force():
+    rng = np.random.default_rng(1)
+    front = ParetoFront({'eff': 'max', 'mass': 'min'})
+    for _ in range(200):
+        key = int(rng.integers(0, 30))  # keys are re-added with new values every so often
+        front.add(key, {'eff': float(rng.integers(0, 8)), 'mass': float(rng.integers(0, 8))})
+        keys = list(front.values)
+        costs = np.array([[-front.values[k]['eff'], front.values[k]['mass']] for k in keys])
+        assert sorted(front.front) == sorted(keys[i] for i in brute_force_front(costs))
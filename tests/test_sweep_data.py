@@ -0,0 +1,22 @@
+import os
+import shutil
+import propeller_design_tools as pdt
+from propeller_design_tools import funcs
+
+
+def fake_run_xrotor_oper(xrr_file, vorform, velo=None, rpm=None, **kwargs):
+    return {'speed(m/s)': velo, 'rpm': rpm, 'Efficiency': 0.5}, {}
+
+
+def test_clear_sweep_data_drops_old_points(tmp_path, monkeypatch):
+    src = os.path.join(os.path.dirname(pdt.__file__), 'prop_database', 'MyPropeller')
+    shutil.copytree(src, tmp_path / 'MyPropeller', ignore=shutil.ignore_patterns('oper_data', 'wvel_data'))
+    prop = pdt.Propeller(str(tmp_path / 'MyPropeller'), verbose=False)
+    monkeypatch.setattr(funcs, 'run_xrotor_oper', fake_run_xrotor_oper)
+
+    prop.analyze_sweep(velo_vals=[10, 20], sweep_param='rpm', sweep_vals=[1000, 1500, 2000], verbose=False)
+    assert len(prop.oper_data) == 6
+    prop.clear_sweep_data()
+    prop.analyze_sweep(velo_vals=[15], sweep_param='rpm', sweep_vals=[1200, 1700], verbose=False)
+    assert len(prop.oper_data) == 2
+    assert len(prop.wvel_data.datapoints) == 2
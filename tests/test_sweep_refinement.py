@@ -0,0 +1,29 @@
+import numpy as np
+from propeller_design_tools.funcs import sweep_refinement_points
+
+
+def refine(func, sweep_vals, tol, min_spacing, max_iters=50):
+    results = {(10.0, x): {'Efficiency': func(x)} for x in sweep_vals}
+    for _ in range(max_iters):
+        new_points = sweep_refinement_points(results=results, params=['Efficiency'], tol=tol,
+                                             min_spacing=(np.inf, min_spacing))
+        if len(new_points) == 0:
+            return np.array(sorted([x for _, x in results]))
+        results.update({pt: {'Efficiency': func(pt[1])} for pt in new_points})
+    raise AssertionError('refinement did not stop')
+
+
+def test_refinement_stops_at_min_spacing_around_a_peak():
+    peak = 1730.
+    xs = refine(lambda x: 1 - ((x - peak) / 800) ** 2, np.linspace(1000, 2600, 5), tol=0.05, min_spacing=25.)
+    spacing = np.diff(xs)
+    assert np.all(spacing >= 25.)
+    assert spacing.min() < 50.  # split all the way down to min_spacing...
+    near = np.argsort(np.abs(xs - peak))[:2]
+    assert np.abs(np.diff(xs[near]))[0] == spacing.min()  # ...at the peak
+    assert min(spacing[0], spacing[-1]) >= 4 * spacing.min()  # but only to tol away from it
+
+
+def test_no_refinement_of_a_straight_line():
+    xs = np.linspace(1000, 2600, 5)
+    assert np.array_equal(refine(lambda x: 2 * x - 100, xs, tol=0.02, min_spacing=25.), xs)